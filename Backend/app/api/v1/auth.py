@@ -171,9 +171,9 @@ async def refresh_token(request: RefreshTokenRequest, req: Request, db: Session
             detail="Invalid token type"
         )
     
-    # Extract JTI and check if already used (one-time use)
+    # Extract JTI, check if already used and mark it used (one-time use)
     jti = payload.get("jti")
-    if jti and session_service.is_refresh_token_used(jti):
+    if jti and session_service.check_and_mark_refresh_used(jti):
         # Token reuse detected - possible security breach
         # Invalidate all user tokens
         user_id = payload.get("sub")
@@ -185,6 +185,20 @@ async def refresh_token(request: RefreshTokenRequest, req: Request, db: Session
             detail="Refresh token has already been used. All sessions have been terminated for security."
         )
     
+    try:
+        return _issue_rotated_tokens(payload, req, db)
+    except HTTPException:
+        raise
+    except Exception:
+        # A server error after the token was marked used: release the marker so
+        # the client's retry is not mistaken for token reuse (which revokes all sessions)
+        if jti:
+            session_service.clear_refresh_token_used(jti)
+        raise
+
+
+def _issue_rotated_tokens(payload: dict, req: Request, db: Session) -> dict:
+    """Validate the refresh token's user and issue a rotated token pair with a new session"""
     user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(
@@ -207,10 +221,6 @@ async def refresh_token(request: RefreshTokenRequest, req: Request, db: Session
             detail="Token has been invalidated. Please login again."
         )
     
-    # Mark old refresh token as used
-    if jti:
-        session_service.mark_refresh_token_used(jti)
-    
     # Generate new JTIs
     new_access_jti = str(uuid.uuid4())
     new_refresh_jti = str(uuid.uuid4())
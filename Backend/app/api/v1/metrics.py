@@ -281,7 +281,8 @@ async def list_employee_metrics(
                 productivity_data = productivity_service.calculate_employee_score(
                     user_id=m.user_id,
                     start_date=m.metric_date,
-                    end_date=m.metric_date
+                    end_date=m.metric_date,
+                    include_weekly_breakdown=False
                 )
                 if "error" not in productivity_data:
                     item["productivityScore"] = productivity_data.get("productivityPercent")
@@ -387,7 +388,8 @@ async def get_employee_metrics_summary(
                 productivity_data = productivity_service.calculate_employee_score(
                     user_id=user_id,
                     start_date=m.metric_date,
-                    end_date=m.metric_date
+                    end_date=m.metric_date,
+                    include_weekly_breakdown=False
                 )
                 if "error" not in productivity_data:
                     metric_data["productivityScore"] = productivity_data.get("productivityPercent")
@@ -87,6 +87,32 @@ async def get_employee_monthly_productivity(
     return result
 
 
+@router.get("/monthly")
+async def get_org_monthly_productivity(
+    year: int = Query(..., description="Year"),
+    month: int = Query(..., ge=1, le=12, description="Month (1-12)"),
+    org_id: Optional[int] = Query(None, description="Filter by organization"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin_or_higher)
+):
+    """
+    Get monthly productivity for all employees of an organization.
+    Aggregates scores across all teams for the entire month, per employee.
+    """
+    # Non-superadmins only see their own org
+    if current_user.user_role != 'superadmin':  # type: ignore
+        org_id = current_user.org_id  # type: ignore
+    
+    service = ProductivityService(db)
+    result = service.get_monthly_productivity_bulk(
+        org_id=org_id,
+        year=year,
+        month=month
+    )
+    
+    return {"items": result, "total": len(result)}
+
+
 @router.get("/team/{team_id}")
 async def get_team_productivity(
     team_id: int,
@@ -127,6 +153,7 @@ async def get_productivity_leaderboard(
     org_id: Optional[int] = Query(None, description="Filter by organization"),
     team_id: Optional[int] = Query(None, description="Filter by team"),
     limit: int = Query(10, ge=1, le=100, description="Number of top performers"),
+    offset: int = Query(0, ge=0, description="Number of top performers to skip"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin_or_higher)
 ):
@@ -143,7 +170,8 @@ async def get_productivity_leaderboard(
         team_id=team_id,
         start_date=start_date,
         end_date=end_date,
-        limit=limit
+        limit=limit,
+        offset=offset
     )
     
     return {"items": result, "total": len(result)}
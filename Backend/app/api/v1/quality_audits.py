@@ -74,8 +74,6 @@ def create_quality_audit(
             current_user_id=current_user.id
         )
         
-        # Eager load relationships for response
-        db.refresh(audit)
         response_data = QualityAuditResponse.model_validate(audit)
         response_data.examiner_name = examiner.user_name
         response_data.team_name = team.name
@@ -141,8 +139,8 @@ def list_quality_audits(
     # Build response with examiner and team names
     list_items = []
     for audit in items:
-        examiner = db.query(User).filter(User.id == audit.examiner_id).first()
-        team = db.query(Team).filter(Team.id == audit.team_id).first()
+        examiner = audit.examiner
+        team = audit.team
         
         list_items.append(QualityAuditListItem(
             id=audit.id,
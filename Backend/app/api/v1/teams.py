@@ -18,6 +18,7 @@ from app.models.user_team import UserTeam
 from app.models.team_fa_name import TeamFAName
 from app.schemas.team import TeamCreate, TeamUpdate
 from app.services.cache_service import cache
+from app.services.productivity_service import invalidate_team_cache as invalidate_productivity_team_cache
 from app.services.audit_service import AuditService
 from app.models.audit_log import AuditEntityType, AuditAction
 
@@ -68,9 +69,9 @@ def serialize_team(team: Team) -> dict:
         "isActive": team.is_active,
         "dailyTarget": team.daily_target,
         "monthlyTarget": team.monthly_target,
-        "singleSeatScore": float(team.single_seat_score) if team.single_seat_score else 1.0,
-        "step1Score": float(team.step1_score) if team.step1_score else 0.5,
-        "step2Score": float(team.step2_score) if team.step2_score else 0.5,
+        "singleSeatScore": team.single_seat_score or 1.0,
+        "step1Score": team.step1_score or 0.5,
+        "step2Score": team.step2_score or 0.5,
         "createdAt": team.created_at.isoformat() if team.created_at else None,
         "modifiedAt": team.modified_at.isoformat() if team.modified_at else None,
         "states": [serialize_team_state(s) for s in team.states] if team.states else [],
@@ -172,7 +173,9 @@ async def list_teams(
     }
     
     # Cache the result
-    cache.set(cache_key, result, cache.TTL_USER_LIST)
+    cache.set(cache_key, result, cache.TTL_USER_LIST, cache.index_keys(
+        cache.PREFIX_TEAMS, f"org:{cache_org_id}" if cache_org_id else None
+    ))
     
     return result
 
@@ -474,6 +477,7 @@ async def update_team(
     
     # Invalidate teams cache for the organization
     cache.invalidate_team_cache(team.org_id)
+    invalidate_productivity_team_cache(team_id)
     
     return serialize_team(team)
 
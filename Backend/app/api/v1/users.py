@@ -83,11 +83,12 @@ async def list_users(
         )
     
     # Build cache key based on user role and filters
+    cache_org_id = org_id if current_user.user_role == ROLE_SUPERADMIN else current_user.org_id
     cache_key = cache._build_key(
         cache.PREFIX_USERS,
         "list",
         f"role:{current_user.user_role}",
-        f"org:{current_user.org_id if current_user.user_role != ROLE_SUPERADMIN else org_id}",
+        f"org:{cache_org_id}",
         f"team:{team_id}" if team_id else None,
         f"filter_role:{role}" if role else None,
         f"active:{is_active}" if is_active is not None else None,
@@ -165,7 +166,9 @@ async def list_users(
     }
     
     # Cache the result
-    cache.set(cache_key, result, cache.TTL_USER_LIST)
+    cache.set(cache_key, result, cache.TTL_USER_LIST, cache.index_keys(
+        cache.PREFIX_USERS, f"org:{cache_org_id}" if cache_org_id else None
+    ))
     
     return result
 
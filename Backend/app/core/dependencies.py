@@ -4,6 +4,7 @@ Authentication and authorization dependencies for FastAPI routes
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional, Any
 from app.core.security import decode_token
@@ -218,26 +219,21 @@ def get_user_teams(user: User, db: Session) -> List[int]:
     
     # Superadmin has access to all teams
     if user.user_role == ROLE_SUPERADMIN:
-        teams = db.query(Team.id).all()
-        return [t.id for t in teams]
+        return list(db.scalars(select(Team.id)))
     
     # Admin has access to all teams in their organization
     if user.user_role == ROLE_ADMIN:
-        teams = db.query(Team.id).filter(Team.org_id == user.org_id).all()
-        return [t.id for t in teams]
+        return list(db.scalars(select(Team.id).where(Team.org_id == user.org_id)))
     
     # Team lead has access to teams they lead (where team_lead_id = user.id)
     if user.user_role == ROLE_TEAM_LEAD:
-        teams = db.query(Team.id).filter(
+        return list(db.scalars(select(Team.id).where(
             Team.team_lead_id == user.id,
             Team.is_active == True
-        ).all()
-        return [t.id for t in teams]
+        )))
     
     # Employees have access to teams they're members of
-    memberships = db.query(UserTeam.team_id).filter(
+    return list(db.scalars(select(UserTeam.team_id).where(
         UserTeam.user_id == user.id,
         UserTeam.is_active == True
-    ).all()
-    
-    return [m.team_id for m in memberships]
+    )))
@@ -21,7 +21,9 @@ from app.models.order_history import OrderHistory
 # Performance metrics
 from app.models.metrics import (
     EmployeePerformanceMetrics,
-    TeamPerformanceMetrics
+    TeamPerformanceMetrics,
+    EmployeeDailyOrderStats,
+    EmployeeWeeklyScore
 )
 
 # Quality audits
@@ -64,6 +66,8 @@ __all__ = [
     # Performance metrics
     "EmployeePerformanceMetrics",
     "TeamPerformanceMetrics",
+    "EmployeeDailyOrderStats",
+    "EmployeeWeeklyScore",
     # Quality audits
     "QualityAudit",
     # Password reset
@@ -119,3 +119,74 @@ class TeamPerformanceMetrics(Base):
         Index('idx_team_metrics_calc_status', 'calculation_status'),
         Index('idx_team_metrics_deleted', 'deleted_at'),
     )
+
+
+class EmployeeDailyOrderStats(Base):
+    """
+    Per-day order completion summary for an employee within a team
+    
+    Maintained on write from Order changes (see order_stats_service) so daily
+    metrics read a handful of summary rows instead of scanning orders.
+    """
+    __tablename__ = "employee_daily_order_stats"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    org_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    metric_date = Column(Date, nullable=False)  # Date the step was completed
+    
+    # Completion counts
+    step1_completed = Column(Integer, nullable=False, default=0)
+    step2_completed = Column(Integer, nullable=False, default=0)
+    single_seat_completed = Column(Integer, nullable=False, default=0)  # Counted on step 2 completion
+    
+    # Durations (in minutes) of completions that have a start time
+    step1_timed_count = Column(Integer, nullable=False, default=0)
+    step1_minutes = Column(Integer, nullable=False, default=0)
+    step2_timed_count = Column(Integer, nullable=False, default=0)
+    step2_minutes = Column(Integer, nullable=False, default=0)
+    
+    modified_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Indexes
+    __table_args__ = (
+        Index('unique_emp_daily_order_stats', 'user_id', 'team_id', 'metric_date', unique=True),
+        Index('idx_emp_daily_order_stats_team_date', 'team_id', 'metric_date'),
+        Index('idx_emp_daily_order_stats_date', 'metric_date'),
+    )
+
+
+class EmployeeWeeklyScore(Base):
+    """
+    Per-week (Sunday-Saturday, by entry_date) productivity summary for an
+    employee within a team
+    
+    Maintained on write from Order and Team changes (see weekly_score_service)
+    so productivity reads sum whole weeks instead of scanning orders.
+    """
+    __tablename__ = "employee_weekly_scores"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    week_start_date = Column(Date, nullable=False)  # Sunday of the entry_date week
+    
+    # Completion counts
+    step1_only = Column(Integer, nullable=False, default=0)
+    step2_only = Column(Integer, nullable=False, default=0)
+    single_seat = Column(Integer, nullable=False, default=0)
+    
+    # Sum of the per-order credit (team multipliers), per completion kind and overall
+    step1_only_score = Column(Numeric(12, 2, asdecimal=False), nullable=False, default=0)
+    step2_only_score = Column(Numeric(12, 2, asdecimal=False), nullable=False, default=0)
+    single_seat_score = Column(Numeric(12, 2, asdecimal=False), nullable=False, default=0)
+    total_score = Column(Numeric(12, 2, asdecimal=False), nullable=False, default=0)
+    
+    modified_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Indexes
+    __table_args__ = (
+        Index('unique_emp_weekly_score', 'user_id', 'team_id', 'week_start_date', unique=True),
+        Index('idx_emp_weekly_score_team_week', 'team_id', 'week_start_date'),
+    )
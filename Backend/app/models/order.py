@@ -2,8 +2,8 @@
 Order Model
 Core order tracking with step-based workflow
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Index, CheckConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, Numeric, String, Boolean, DateTime, Date, ForeignKey, Index, CheckConstraint, text
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 from app.database import Base
 
@@ -19,9 +19,12 @@ class Order(Base):
     """
     __tablename__ = "orders"
     
+    # Columns read by the summary-table listeners use active_history so an
+    # update always sees the committed value, even when it was expired
+    
     id = Column(Integer, primary_key=True, autoincrement=True)
     file_number = Column(String(100), nullable=False)  # Unique with product_type
-    entry_date = Column(Date, nullable=False)  # Order entry date
+    entry_date = column_property(Column(Date, nullable=False), active_history=True)  # Order entry date
     
     # Reference table foreign keys
     transaction_type_id = Column(Integer, ForeignKey("transaction_types.id"), nullable=False)
@@ -35,20 +38,26 @@ class Order(Base):
     
     # Product and Team
     product_type = Column(String(100), nullable=False)  # Filtered by team_products
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
-    org_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    team_id = column_property(Column(Integer, ForeignKey("teams.id"), nullable=False), active_history=True)
+    org_id = column_property(Column(Integer, ForeignKey("organizations.id"), nullable=False), active_history=True)
     
     # Step 1 User (First Half)
-    step1_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    step1_user_id = column_property(Column(Integer, ForeignKey("users.id"), nullable=True), active_history=True)
     step1_fa_name_id = Column(Integer, ForeignKey("fa_names.id", ondelete="SET NULL"), nullable=True)
-    step1_start_time = Column(DateTime, nullable=True)
-    step1_end_time = Column(DateTime, nullable=True)
+    step1_start_time = column_property(Column(DateTime, nullable=True), active_history=True)
+    step1_end_time = column_property(Column(DateTime, nullable=True), active_history=True)
     
     # Step 2 User (Second Half) - For Single Seat: same as step1_user_id
-    step2_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    step2_user_id = column_property(Column(Integer, ForeignKey("users.id"), nullable=True), active_history=True)
     step2_fa_name_id = Column(Integer, ForeignKey("fa_names.id", ondelete="SET NULL"), nullable=True)
-    step2_start_time = Column(DateTime, nullable=True)
-    step2_end_time = Column(DateTime, nullable=True)
+    step2_start_time = column_property(Column(DateTime, nullable=True), active_history=True)
+    step2_end_time = column_property(Column(DateTime, nullable=True), active_history=True)
+    
+    # Productivity credit, maintained on write (see order_score_service)
+    # 0=no step user, 1=step 1 user only, 2=step 2 user only, 3=single seat, 4=split between two users
+    completion_type = Column(SmallInteger, nullable=False, default=0, server_default="0")
+    step1_score_value = column_property(Column(Numeric(4, 2, asdecimal=False), nullable=False, default=0, server_default="0"), active_history=True)  # Credit to step1_user_id
+    step2_score_value = column_property(Column(Numeric(4, 2, asdecimal=False), nullable=False, default=0, server_default="0"), active_history=True)  # Credit to step2_user_id
     
     # Billing
     billing_status = Column(String(20), default='pending')  # pending or done
@@ -56,7 +65,7 @@ class Order(Base):
     # Audit
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     modified_by = Column(Integer, ForeignKey("users.id"), nullable=True)
-    deleted_at = Column(DateTime, nullable=True)  # Soft delete timestamp
+    deleted_at = column_property(Column(DateTime, nullable=True), active_history=True)  # Soft delete timestamp
     deleted_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.now)
     modified_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -85,6 +94,14 @@ class Order(Base):
     # Order history (audit trail)
     history = relationship("OrderHistory", back_populates="order", cascade="all, delete-orphan")
     
+    @classmethod
+    def not_deleted(cls):
+        """
+        Filter criterion for live (not soft-deleted) orders
+        Matches the WHERE clause of the partial *_live indexes
+        """
+        return cls.deleted_at.is_(None)
+    
     # Indexes
     __table_args__ = (
         Index('idx_orders_file_product_team', 'file_number', 'product_type', 'team_id', unique=True),
@@ -99,7 +116,20 @@ class Order(Base):
         Index('idx_orders_billing_status', 'billing_status'),
         Index('idx_orders_step1_user_status', 'step1_user_id', 'order_status_id'),
         Index('idx_orders_step2_user_status', 'step2_user_id', 'order_status_id'),
-        Index('idx_orders_team_status_date', 'team_id', 'order_status_id', 'entry_date'),
+        # Partial indexes over live (not soft-deleted) orders for metrics scans
+        Index('idx_orders_step1_user_end_live', 'step1_user_id', 'step1_end_time',
+              postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_orders_step2_user_end_live', 'step2_user_id', 'step2_end_time',
+              postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_orders_team_entry_status_live', 'team_id', 'entry_date', 'order_status_id',
+              postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_orders_team_date_completion', 'team_id', 'entry_date', 'completion_type'),
+        Index('idx_orders_step1_team_date_live', 'step1_user_id', 'team_id', 'entry_date',
+              postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_orders_step2_team_date_live', 'step2_user_id', 'team_id', 'entry_date',
+              postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_orders_team_date_users_live', 'team_id', 'entry_date', 'step1_user_id', 'step2_user_id',
+              postgresql_where=text('deleted_at IS NULL')),
         Index('idx_orders_deleted', 'deleted_at'),
         # Constraints
         CheckConstraint('step1_end_time IS NULL OR step1_end_time >= step1_start_time', name='chk_step1_end_after_start'),
@@ -2,12 +2,26 @@
 Quality Audit Model
 Tracks file review quality metrics for examiners
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Numeric, CheckConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Numeric, CheckConstraint, Computed, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 
+def quality_ratio_sql(errors: str, total: str) -> str:
+    """
+    SQL for 1 - (errors / total), kept between 0 and 1 (0 when nothing was reviewed)
+    Error-free and all-error audits are answered without the numeric division;
+    storing into NUMERIC(5, 4) rounds the rest half up to 4 decimal places
+    """
+    return (
+        f"CASE WHEN {total} <= 0 THEN 0 "
+        f"WHEN {errors} = 0 THEN 1 "
+        f"WHEN {errors} >= {total} THEN 0 "
+        f"ELSE 1 - {errors}::numeric / ({total}) END"
+    )
+
+
 class QualityAudit(Base):
     """
     Quality Audit model for tracking file review errors and quality metrics
@@ -46,12 +60,25 @@ class QualityAudit(Base):
     
     # Calculated Fields (stored for reporting efficiency)
     total_files_reviewed = Column(Integer, nullable=False)  # Retrieved from orders DB
-    ofe_count = Column(Integer, nullable=False)  # No. of Files Reviewed * OFE
+    ofe_count = Column(Integer, Computed("total_files_reviewed * ofe", persisted=True), nullable=False)  # No. of Files Reviewed * OFE
     
     # Quality Percentages (stored as decimal, displayed as percentage)
-    fb_quality = Column(Numeric(5, 4), nullable=False)  # 0.0000 to 1.0000 (0% to 100%)
-    ofe_quality = Column(Numeric(5, 4), nullable=False)
-    cce_quality = Column(Numeric(5, 4), nullable=False)
+    # Generated by the database from the counts above, never written by the application
+    fb_quality = Column(  # 0.0000 to 1.0000 (0% to 100%)
+        Numeric(5, 4),
+        Computed(quality_ratio_sql("files_with_error", "total_files_reviewed"), persisted=True),
+        nullable=False
+    )
+    ofe_quality = Column(
+        Numeric(5, 4),
+        Computed(quality_ratio_sql("total_errors", "total_files_reviewed * ofe"), persisted=True),
+        nullable=False
+    )
+    cce_quality = Column(
+        Numeric(5, 4),
+        Computed(quality_ratio_sql("files_with_cce_error", "total_files_reviewed"), persisted=True),
+        nullable=False
+    )
     
     # Audit Period
     audit_date = Column(Date, nullable=False)  # Date of the audit/review
@@ -75,6 +102,10 @@ class QualityAudit(Base):
         CheckConstraint('fb_quality >= 0 AND fb_quality <= 1', name='check_fb_quality_range'),
         CheckConstraint('ofe_quality >= 0 AND ofe_quality <= 1', name='check_ofe_quality_range'),
         CheckConstraint('cce_quality >= 0 AND cce_quality <= 1', name='check_cce_quality_range'),
+        # Live audits in list order (newest first), so list pages are read without a sort
+        Index('idx_quality_audits_org_team_date_live', 'org_id', 'team_id', text('audit_date DESC'),
+              postgresql_include=['examiner_id'],
+              postgresql_where=text('deleted_at IS NULL')),
     )
     
     # Relationships
@@ -21,9 +21,12 @@ class Team(Base):
     # Productivity settings - configurable per team
     daily_target = Column(Integer, nullable=False, default=10)  # Daily target orders per employee
     monthly_target = Column(Integer, nullable=True, default=None)  # Monthly target for entire team (set by admin)
-    single_seat_score = Column(Numeric(4, 2), nullable=False, default=1.0)  # Score for Single Seat completion
-    step1_score = Column(Numeric(4, 2), nullable=False, default=0.5)  # Score for Step 1 only completion
-    step2_score = Column(Numeric(4, 2), nullable=False, default=0.5)  # Score for Step 2 only completion
+    single_seat_score = Column(Numeric(4, 2, asdecimal=False), nullable=False, default=1.0)  # Score for Single Seat completion
+    step1_score = Column(Numeric(4, 2, asdecimal=False), nullable=False, default=0.5)  # Score for Step 1 only completion
+    step2_score = Column(Numeric(4, 2, asdecimal=False), nullable=False, default=0.5)  # Score for Step 2 only completion
+    
+    # Active user_teams memberships, maintained on membership writes (see team_stats_service)
+    active_employee_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     created_at = Column(DateTime, default=datetime.utcnow)
     modified_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -3,7 +3,7 @@ User Team Membership Model
 Junction table for many-to-many relationship between users and teams
 """
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 from app.database import Base
 
@@ -14,11 +14,11 @@ class UserTeam(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    team_id = column_property(Column(Integer, ForeignKey("teams.id"), nullable=False), active_history=True)
     role = Column(String(50), default="member")  # member (leadership tracked in users.user_role)
     joined_at = Column(DateTime, default=datetime.utcnow)  # When user joined the team
     left_at = Column(DateTime, nullable=True)  # When user left (NULL if still member)
-    is_active = Column(Boolean, default=True)  # Active membership
+    is_active = column_property(Column(Boolean, default=True), active_history=True)  # Active membership (read by team_stats_service)
     created_at = Column(DateTime, default=datetime.utcnow)
     modified_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -4,6 +4,14 @@ Business logic layer for the ODS application
 """
 from app.services.order_service import OrderService
 from app.services.metrics_service import MetricsService
+# Registers the Order listeners that maintain employee_daily_order_stats
+from app.services import order_stats_service
+# Registers the UserTeam listeners that maintain Team.active_employee_count
+from app.services import team_stats_service
+# Registers the Order/Team listeners that maintain the per-order productivity credit
+from app.services import order_score_service
+# Registers the Order/Team listeners that maintain employee_weekly_scores
+from app.services import weekly_score_service
 
 __all__ = [
     "OrderService",
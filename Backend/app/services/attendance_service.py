@@ -5,7 +5,7 @@ Business logic for manual attendance marking by team leads
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from fastapi import HTTPException
 from calendar import monthrange
 
@@ -290,60 +290,83 @@ class AttendanceService:
         end_date: date
     ) -> AttendanceSummary:
         """Get attendance summary for an employee"""
-        # Get user
-        user = self.db.query(User).filter(User.id == user_id).first()
-        
+        return self.get_employees_attendance_summary([user_id], start_date, end_date)[user_id]
+    
+    def get_employees_attendance_summary(
+        self,
+        user_ids: List[int],
+        start_date: date,
+        end_date: date
+    ) -> Dict[int, AttendanceSummary]:
+        """Get attendance summaries for many employees sharing a date range (one count query)"""
         # Only count days up to today (don't count future days)
         today = date.today()
         effective_end_date = min(end_date, today)
         
-        if not user:
-            # Return empty summary instead of raising exception when called internally
-            working_days_calc = (effective_end_date - start_date).days + 1 if effective_end_date >= start_date else 0
-            return AttendanceSummary(
-                userId=user_id,
-                userName="Unknown",
-                employeeId="Unknown",
-                startDate=start_date,
-                endDate=end_date,
-                workingDays=working_days_calc,
-                daysPresent=0,
-                daysAbsent=working_days_calc,
-                daysLeave=0,
-                attendancePercent=0.0
-            )
-        
         # Calculate working days (only up to today, don't include future days)
         working_days = (effective_end_date - start_date).days + 1 if effective_end_date >= start_date else 0
         
-        # Query attendance records (only up to today)
-        records = self.db.query(AttendanceRecord).filter(
-            AttendanceRecord.user_id == user_id,
-            AttendanceRecord.date >= start_date,
-            AttendanceRecord.date <= effective_end_date
-        ).all()
+        users = {
+            u.id: u for u in self.db.query(User).filter(User.id.in_(user_ids)).all()
+        } if user_ids else {}
         
-        # Count by status
-        days_present = sum(1 for r in records if r.status == 'present')
-        days_leave = sum(1 for r in records if r.status == 'leave')
-        # Default to absent for unmarked days (only past/today, not future)
-        days_absent = working_days - days_present - days_leave
+        # Count attendance records by status (only up to today)
+        status_counts: Dict[int, Dict[str, int]] = {}
+        if users:
+            rows = self.db.query(
+                AttendanceRecord.user_id,
+                AttendanceRecord.status,
+                func.count(AttendanceRecord.id)
+            ).filter(
+                AttendanceRecord.user_id.in_(list(users)),
+                AttendanceRecord.date >= start_date,
+                AttendanceRecord.date <= effective_end_date
+            ).group_by(AttendanceRecord.user_id, AttendanceRecord.status).all()
+            for user_id, status, count in rows:
+                status_counts.setdefault(user_id, {})[status] = count
         
-        # Calculate percentage (present days / total days)
-        attendance_percent = (days_present / working_days * 100) if working_days > 0 else 0.0
+        summaries: Dict[int, AttendanceSummary] = {}
+        for user_id in user_ids:
+            user = users.get(user_id)
+            if not user:
+                # Return empty summary instead of raising exception when called internally
+                summaries[user_id] = AttendanceSummary(
+                    userId=user_id,
+                    userName="Unknown",
+                    employeeId="Unknown",
+                    startDate=start_date,
+                    endDate=end_date,
+                    workingDays=working_days,
+                    daysPresent=0,
+                    daysAbsent=working_days,
+                    daysLeave=0,
+                    attendancePercent=0.0
+                )
+                continue
+            
+            counts = status_counts.get(user_id, {})
+            days_present = counts.get('present', 0)
+            days_leave = counts.get('leave', 0)
+            # Default to absent for unmarked days (only past/today, not future)
+            days_absent = working_days - days_present - days_leave
+            
+            # Calculate percentage (present days / total days)
+            attendance_percent = (days_present / working_days * 100) if working_days > 0 else 0.0
+            
+            summaries[user_id] = AttendanceSummary(
+                userId=user_id,
+                userName=user.user_name,
+                employeeId=user.employee_id,
+                startDate=start_date,
+                endDate=end_date,
+                workingDays=working_days,
+                daysPresent=days_present,
+                daysAbsent=days_absent,
+                daysLeave=days_leave,
+                attendancePercent=round(attendance_percent, 2)
+            )
         
-        return AttendanceSummary(
-            userId=user_id,
-            userName=user.user_name,
-            employeeId=user.employee_id,
-            startDate=start_date,
-            endDate=end_date,
-            workingDays=working_days,
-            daysPresent=days_present,
-            daysAbsent=days_absent,
-            daysLeave=days_leave,
-            attendancePercent=round(attendance_percent, 2)
-        )
+        return summaries
     
     def get_team_attendance_report(
         self,
@@ -358,7 +381,9 @@ class AttendanceService:
             raise HTTPException(status_code=404, detail="Team not found")
         
         # Get all active team members
-        memberships = self.db.query(UserTeam).filter(
+        memberships = self.db.query(UserTeam).options(
+            joinedload(UserTeam.user)
+        ).filter(
             UserTeam.team_id == team_id,
             UserTeam.is_active == True
         ).all()
@@ -368,20 +393,20 @@ class AttendanceService:
         effective_end_date = min(end_date, today)
         working_days = (effective_end_date - start_date).days + 1 if effective_end_date >= start_date else 0
         
-        # Get attendance summary for each employee
+        # Get attendance summary for each employee (one count query for the team)
         employees = []
         team_present = 0
         team_absent = 0
         team_leave = 0
         
-        for membership in memberships:
-            user = membership.user
-            if not user or not user.is_active:
-                continue
-            
-            summary = self.get_employee_attendance_summary(
-                user.id, start_date, end_date
-            )
+        active_user_ids = [
+            membership.user.id for membership in memberships
+            if membership.user and membership.user.is_active
+        ]
+        summaries = self.get_employees_attendance_summary(active_user_ids, start_date, end_date)
+        
+        for user_id in active_user_ids:
+            summary = summaries[user_id]
             employees.append(summary)
             
             team_present += summary.days_present
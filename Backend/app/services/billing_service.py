@@ -3,7 +3,7 @@ Billing Service - New Version
 Business logic for billing reports and calculations
 Billing is done organization-wide grouped by product types with shortened team names
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, joinedload
 from sqlalchemy import func
 from datetime import datetime, date
 from typing import Optional, List, Dict
@@ -24,11 +24,14 @@ from fastapi import HTTPException
 
 try:
     import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
     EXCEL_AVAILABLE = True
 except ImportError:
     EXCEL_AVAILABLE = False
 
+# Number of orders updated per statement when finalizing a billing report
+FINALIZE_BATCH_SIZE = 5000
+
 
 def get_team_short_name(team_name: str) -> str:
     """
@@ -64,6 +67,52 @@ def format_product_type(team_name: str, product_type: str) -> str:
     return f"{short_name} {product_clean}"
 
 
+def _billing_totals_subquery(db: Session):
+    """Per-report sum of detail file counts, for joining onto report queries"""
+    return db.query(
+        BillingDetail.report_id.label('report_id'),
+        func.sum(BillingDetail.total_count).label('total_files')
+    ).group_by(BillingDetail.report_id).subquery()
+
+
+def register_billing_styles(wb) -> None:
+    """
+    Register the named cell styles used by the billing Excel export
+    Cells reference these by name so openpyxl writes each style only once
+    """
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    center_align = Alignment(horizontal='center', vertical='center')
+    total_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
+    
+    wb.add_named_style(NamedStyle(
+        name="billing_header",
+        fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        font=Font(bold=True, color="FFFFFF", size=12),
+        alignment=center_align,
+        border=border
+    ))
+    wb.add_named_style(NamedStyle(name="billing_data", border=border))
+    wb.add_named_style(NamedStyle(name="billing_data_count", border=border, alignment=center_align))
+    wb.add_named_style(NamedStyle(
+        name="billing_total",
+        fill=total_fill,
+        font=Font(bold=True),
+        border=border
+    ))
+    wb.add_named_style(NamedStyle(
+        name="billing_total_count",
+        fill=total_fill,
+        font=Font(bold=True),
+        alignment=center_align,
+        border=border
+    ))
+
+
 def get_billing_reports(
     db: Session,
     org_id: int,
@@ -74,7 +123,17 @@ def get_billing_reports(
     """
     Get billing reports with filters (no team filtering - all reports are org-wide)
     """
-    query = db.query(BillingReport).filter(
+    totals_subq = _billing_totals_subquery(db)
+    query = db.query(
+        BillingReport,
+        func.coalesce(totals_subq.c.total_files, 0)
+    ).outerjoin(
+        totals_subq, BillingReport.id == totals_subq.c.report_id
+    ).options(
+        selectinload(BillingReport.details),
+        joinedload(BillingReport.created_by_user),
+        joinedload(BillingReport.finalized_by_user)
+    ).filter(
         BillingReport.org_id == org_id,
         BillingReport.team_id.is_(None)  # All new reports are org-wide
     )
@@ -86,14 +145,14 @@ def get_billing_reports(
     if status:
         query = query.filter(BillingReport.status == status)
     
-    reports = query.order_by(
+    rows = query.order_by(
         BillingReport.billing_year.desc(),
         BillingReport.billing_month.desc()
     ).all()
     
     # Convert to response models with details
     result = []
-    for report in reports:
+    for report, total_files in rows:
         details = [
             BillingDetailResponse(
                 id=d.id,
@@ -107,8 +166,6 @@ def get_billing_reports(
             for d in report.details
         ]
         
-        total_files = sum(d.total_count for d in report.details)
-        
         response = BillingReportResponse(
             id=report.id,
             orgId=report.org_id,
@@ -317,7 +374,6 @@ def create_billing_report(
         db.add(detail)
     
     db.commit()
-    db.refresh(report)
     
     # Return response
     return get_billing_report_by_id(db, report.id)
@@ -325,11 +381,23 @@ def create_billing_report(
 
 def get_billing_report_by_id(db: Session, report_id: int) -> BillingReportResponse:
     """Get a single billing report by ID"""
-    report = db.query(BillingReport).filter(BillingReport.id == report_id).first()
-    
-    if not report:
+    totals_subq = _billing_totals_subquery(db)
+    row = db.query(
+        BillingReport,
+        func.coalesce(totals_subq.c.total_files, 0)
+    ).outerjoin(
+        totals_subq, BillingReport.id == totals_subq.c.report_id
+    ).options(
+        selectinload(BillingReport.details),
+        joinedload(BillingReport.created_by_user),
+        joinedload(BillingReport.finalized_by_user)
+    ).filter(BillingReport.id == report_id).populate_existing().first()
+    
+    if not row:
         raise HTTPException(status_code=404, detail="Billing report not found")
     
+    report, total_files = row
+    
     details = [
         BillingDetailResponse(
             id=d.id,
@@ -343,8 +411,6 @@ def get_billing_report_by_id(db: Session, report_id: int) -> BillingReportRespon
         for d in report.details
     ]
     
-    total_files = sum(d.total_count for d in report.details)
-    
     return BillingReportResponse(
         id=report.id,
         orgId=report.org_id,
@@ -390,18 +456,32 @@ def finalize_billing_report(
     else:
         end_date = date(report.billing_year, report.billing_month + 1, 1)
     
-    # Update all pending orders for this organization and period to 'done'
-    updated_count = db.query(Order).filter(
-        Order.org_id == report.org_id,
-        Order.billing_status == 'pending',
-        Order.entry_date >= start_date,
-        Order.entry_date < end_date,
-        Order.deleted_at.is_(None)
-    ).update({
-        Order.billing_status: 'done',
-        Order.modified_at: datetime.now(),
-        Order.modified_by: current_user_id
-    }, synchronize_session=False)
+    # Collect the ids of all pending orders for this organization and period
+    order_ids = [
+        row.id for row in db.query(Order.id).filter(
+            Order.org_id == report.org_id,
+            Order.billing_status == 'pending',
+            Order.entry_date >= start_date,
+            Order.entry_date < end_date,
+            Order.deleted_at.is_(None)
+        ).order_by(Order.id).yield_per(FINALIZE_BATCH_SIZE)
+    ]
+    
+    # Mark them as 'done' in primary-key chunks so each UPDATE only touches
+    # a bounded set of rows instead of the whole billing period at once
+    modified_at = datetime.now()
+    updated_count = 0
+    for i in range(0, len(order_ids), FINALIZE_BATCH_SIZE):
+        chunk = order_ids[i:i + FINALIZE_BATCH_SIZE]
+        updated_count += db.query(Order).filter(
+            Order.id.in_(chunk),
+            Order.billing_status == 'pending'
+        ).update({
+            Order.billing_status: 'done',
+            Order.modified_at: modified_at,
+            Order.modified_by: current_user_id
+        }, synchronize_session=False)
+        db.flush()
     
     # Update report status
     report.status = 'finalized'
@@ -410,7 +490,6 @@ def finalize_billing_report(
     report.modified_at = datetime.now()
     
     db.commit()
-    db.refresh(report)
     
     return get_billing_report_by_id(db, report.id)
 
@@ -455,16 +534,8 @@ def export_billing_report_to_excel(db: Session, report_id: int) -> BytesIO:
     ws = wb.active
     ws.title = "Billing Report"
     
-    # Define styles
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    center_align = Alignment(horizontal='center', vertical='center')
+    # Register shared cell styles once for this workbook
+    register_billing_styles(wb)
     
     # Header row for data table - Start at row 1 (removed report info section)
     header_row = 1
@@ -473,10 +544,7 @@ def export_billing_report_to_excel(db: Session, report_id: int) -> BytesIO:
     for col_num, header in enumerate(headers, 1):
         cell = ws.cell(row=header_row, column=col_num)
         cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_align
-        cell.border = border
+        cell.style = "billing_header"
     
     # Group details by team (extract team from product_type)
     # Product types are formatted as "WA Full Search", "FL Update", etc.
@@ -555,37 +623,29 @@ def export_billing_report_to_excel(db: Session, report_id: int) -> BytesIO:
         # Write each product for this team
         for idx, product_data in enumerate(products):
             # Team name only on first row
-            if idx == 0:
-                ws.cell(row=current_row, column=1).value = team_full_name
-            else:
-                ws.cell(row=current_row, column=1).value = ""
+            team_cell = ws.cell(row=current_row, column=1)
+            team_cell.value = team_full_name if idx == 0 else ""
+            team_cell.style = "billing_data"
             
-            ws.cell(row=current_row, column=2).value = product_data['product']
-            ws.cell(row=current_row, column=3).value = product_data['count']
+            product_cell = ws.cell(row=current_row, column=2)
+            product_cell.value = product_data['product']
+            product_cell.style = "billing_data"
             
-            # Apply borders and alignment
-            for col in range(1, 4):
-                cell = ws.cell(row=current_row, column=col)
-                cell.border = border
-                if col == 3:  # Total column
-                    cell.alignment = center_align
+            count_cell = ws.cell(row=current_row, column=3)  # Total column
+            count_cell.value = product_data['count']
+            count_cell.style = "billing_data_count"
             
             total_files += product_data['count']
             current_row += 1
     
     # Total row
-    ws.cell(row=current_row, column=1).value = "GRAND TOTAL"
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).value = total_files
-    
-    # Apply styling to total row
-    for col in range(1, 3):
-        cell = ws.cell(row=current_row, column=col)
-        cell.fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
-        cell.font = Font(bold=True)
-        cell.border = border
-        if col == 2:
-            cell.alignment = center_align
+    total_label_cell = ws.cell(row=current_row, column=1)
+    total_label_cell.value = "GRAND TOTAL"
+    total_label_cell.style = "billing_total"
+    
+    total_value_cell = ws.cell(row=current_row, column=2)
+    total_value_cell.value = total_files
+    total_value_cell.style = "billing_total_count"
     
     # Adjust column widths
     ws.column_dimensions['A'].width = 20  # Team Name
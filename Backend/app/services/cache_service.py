@@ -3,8 +3,9 @@ Redis Caching Service
 Provides caching utilities for the ODS application
 """
 import json
+import time
 import redis
-from typing import Any, Optional, Callable, TypeVar
+from typing import Any, Optional, Callable, List, Sequence, TypeVar
 from functools import wraps
 import logging
 from app.core.config import settings
@@ -25,6 +26,10 @@ class CacheService:
     TTL_DASHBOARD = 60 * 5      # 5 minutes for dashboard stats
     TTL_USER_LIST = 60 * 5      # 5 minutes for user/team lists
     
+    # Application namespace in front of every key, so the Redis instance can
+    # be shared with other services and bulk-cleared with SCAN MATCH empperf:*
+    PREFIX_APP = "empperf"
+    
     # Cache key prefixes
     PREFIX_REFERENCE = "ref"
     PREFIX_DASHBOARD = "dash"
@@ -33,8 +38,18 @@ class CacheService:
     PREFIX_TEAMS = "teams"
     PREFIX_ORGS = "orgs"
     
+    # Prefix of the Redis sets tracking which keys to delete on invalidation
+    PREFIX_INDEX = "idx"
+    
+    # Seconds to bypass Redis after a connection failure before retrying
+    RETRY_INTERVAL = 30
+    
+    # Keys requested per SCAN step and deleted per DEL when deleting by pattern
+    SCAN_BATCH_SIZE = 500
+    
     _instance: Optional['CacheService'] = None
     _redis_client: Optional[redis.Redis] = None
+    _disabled_until: float = 0.0
     
     def __new__(cls):
         if cls._instance is None:
@@ -65,22 +80,41 @@ class CacheService:
             logger.warning(f"Redis error: {e}. Caching disabled.")
             self._redis_client = None
     
+    @property
+    def is_disabled(self) -> bool:
+        """Check if Redis is being bypassed after a recent connection failure"""
+        return time.monotonic() < self._disabled_until
+    
+    def _disable(self):
+        """Bypass Redis until the retry interval has elapsed"""
+        self._disabled_until = time.monotonic() + self.RETRY_INTERVAL
+    
     @property
     def is_connected(self) -> bool:
         """Check if Redis is connected"""
-        if self._redis_client is None:
+        if self._redis_client is None or self.is_disabled:
             return False
         try:
             self._redis_client.ping()
             return True
         except Exception:
+            self._disable()
             return False
     
     def _build_key(self, prefix: str, *args) -> str:
-        """Build a cache key from prefix and arguments"""
-        parts = [prefix] + [str(arg) for arg in args if arg is not None]
+        """Build a cache key from prefix and arguments, under the app namespace"""
+        parts = [self.PREFIX_APP, prefix] + [str(arg) for arg in args if arg is not None]
         return ":".join(parts)
     
+    def index_keys(self, prefix: str, *scopes: Optional[str]) -> List[str]:
+        """
+        Get the index sets a key is tracked in: the prefix-wide set plus one
+        per given scope (e.g. "org:5"); None scopes are skipped
+        """
+        return [self._build_key(self.PREFIX_INDEX, prefix)] + [
+            self._build_key(self.PREFIX_INDEX, prefix, scope) for scope in scopes if scope
+        ]
+    
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         if not self.is_connected:
@@ -90,18 +124,38 @@ class CacheService:
             if value:
                 return json.loads(value)
             return None
+        except redis.ConnectionError as e:
+            logger.warning(f"Cache get error for key {key}: {e}")
+            self._disable()
+            return None
         except Exception as e:
             logger.warning(f"Cache get error for key {key}: {e}")
             return None
     
-    def set(self, key: str, value: Any, ttl: int = TTL_SHORT) -> bool:
-        """Set value in cache with TTL"""
+    def set(self, key: str, value: Any, ttl: int = TTL_SHORT, index_keys: Sequence[str] = ()) -> bool:
+        """
+        Set value in cache with TTL
+        The key is also added to each index set so invalidation can delete it
+        directly; an index set expires with the latest key written to it
+        """
         if not self.is_connected:
             return False
         try:
             serialized = json.dumps(value, default=str)
-            self._redis_client.setex(key, ttl, serialized)
+            if not index_keys:
+                self._redis_client.setex(key, ttl, serialized)
+                return True
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.setex(key, ttl, serialized)
+            for index_key in index_keys:
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, ttl)
+            pipe.execute()
             return True
+        except redis.ConnectionError as e:
+            logger.warning(f"Cache set error for key {key}: {e}")
+            self._disable()
+            return False
         except Exception as e:
             logger.warning(f"Cache set error for key {key}: {e}")
             return False
@@ -118,57 +172,93 @@ class CacheService:
             return False
     
     def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching a pattern"""
+        """
+        Delete all keys matching a pattern
+        Iterates with SCAN instead of KEYS so Redis is never blocked on a full
+        keyspace walk; keys written while the scan runs may be missed
+        """
         if not self.is_connected:
             return 0
         try:
-            keys = self._redis_client.keys(pattern)
-            if keys:
-                return self._redis_client.delete(*keys)
-            return 0
+            deleted = 0
+            batch = []
+            for key in self._redis_client.scan_iter(match=pattern, count=self.SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= self.SCAN_BATCH_SIZE:
+                    deleted += self._redis_client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += self._redis_client.delete(*batch)
+            return deleted
         except Exception as e:
             logger.warning(f"Cache delete pattern error for {pattern}: {e}")
             return 0
     
+    def delete_indexed(self, *index_keys: str) -> int:
+        """
+        Delete all keys tracked in the given index sets
+        Reads the members and deletes exactly those keys, instead of scanning
+        the keyspace for a pattern; members are also removed from the sets
+        """
+        if not self.is_connected or not index_keys:
+            return 0
+        try:
+            pipe = self._redis_client.pipeline(transaction=False)
+            for index_key in index_keys:
+                pipe.smembers(index_key)
+            members_per_index = pipe.execute()
+            
+            keys = set().union(*members_per_index)
+            if not keys:
+                return 0
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.delete(*keys)
+            for index_key, members in zip(index_keys, members_per_index):
+                if members:
+                    pipe.srem(index_key, *members)
+            return pipe.execute()[0]
+        except Exception as e:
+            logger.warning(f"Cache delete indexed error for {index_keys}: {e}")
+            return 0
+    
     def invalidate_reference_cache(self, ref_type: Optional[str] = None):
         """Invalidate reference data cache"""
         if ref_type:
-            self.delete_pattern(f"{self.PREFIX_REFERENCE}:{ref_type}:*")
+            self.delete_indexed(self._build_key(self.PREFIX_INDEX, self.PREFIX_REFERENCE, ref_type))
         else:
-            self.delete_pattern(f"{self.PREFIX_REFERENCE}:*")
+            self.delete_indexed(self._build_key(self.PREFIX_INDEX, self.PREFIX_REFERENCE))
     
     def invalidate_dashboard_cache(self, org_id: Optional[int] = None, user_id: Optional[int] = None):
         """Invalidate dashboard cache"""
+        index_keys = []
         if org_id:
-            self.delete_pattern(f"{self.PREFIX_DASHBOARD}:*:org:{org_id}*")
+            index_keys.append(self._build_key(self.PREFIX_INDEX, self.PREFIX_DASHBOARD, "org:%d" % org_id))
         if user_id:
-            self.delete_pattern(f"{self.PREFIX_DASHBOARD}:*:user:{user_id}*")
+            index_keys.append(self._build_key(self.PREFIX_INDEX, self.PREFIX_DASHBOARD, "user:%d" % user_id))
         if not org_id and not user_id:
-            self.delete_pattern(f"{self.PREFIX_DASHBOARD}:*")
+            index_keys.append(self._build_key(self.PREFIX_INDEX, self.PREFIX_DASHBOARD))
+        self.delete_indexed(*index_keys)
     
     def invalidate_user_cache(self, org_id: Optional[int] = None):
         """Invalidate users list cache"""
         if org_id:
-            self.delete_pattern(f"{self.PREFIX_USERS}:*:org:{org_id}*")
+            self.delete_indexed(self._build_key(self.PREFIX_INDEX, self.PREFIX_USERS, "org:%d" % org_id))
         else:
-            self.delete_pattern(f"{self.PREFIX_USERS}:*")
+            self.delete_indexed(self._build_key(self.PREFIX_INDEX, self.PREFIX_USERS))
     
     def invalidate_team_cache(self, org_id: Optional[int] = None):
         """Invalidate teams list cache"""
         if org_id:
-            self.delete_pattern(f"{self.PREFIX_TEAMS}:*:org:{org_id}*")
+            self.delete_indexed(self._build_key(self.PREFIX_INDEX, self.PREFIX_TEAMS, "org:%d" % org_id))
         else:
-            self.delete_pattern(f"{self.PREFIX_TEAMS}:*")
+            self.delete_indexed(self._build_key(self.PREFIX_INDEX, self.PREFIX_TEAMS))
     
     def invalidate_all(self):
-        """Clear all application cache"""
+        """Clear all application cache (only keys under the app namespace)"""
         if not self.is_connected:
             return
-        try:
-            self._redis_client.flushdb()
-            logger.info("All cache cleared")
-        except Exception as e:
-            logger.warning(f"Cache flush error: {e}")
+        deleted = self.delete_pattern(f"{self.PREFIX_APP}:*")
+        logger.info("All cache cleared (%s keys)", deleted)
     
     # Convenience methods for specific cache types
     def get_reference(self, ref_type: str, is_active: Optional[bool] = None) -> Optional[Any]:
@@ -179,7 +269,7 @@ class CacheService:
     def set_reference(self, ref_type: str, data: Any, is_active: Optional[bool] = None) -> bool:
         """Cache reference data"""
         key = self._build_key(self.PREFIX_REFERENCE, ref_type, f"active:{is_active}")
-        return self.set(key, data, self.TTL_REFERENCE)
+        return self.set(key, data, self.TTL_REFERENCE, self.index_keys(self.PREFIX_REFERENCE, ref_type))
     
     def get_dashboard(self, dashboard_type: str, org_id: Optional[int] = None, 
                       user_id: Optional[int] = None, team_ids: Optional[str] = None) -> Optional[Any]:
@@ -187,8 +277,8 @@ class CacheService:
         key = self._build_key(
             self.PREFIX_DASHBOARD, 
             dashboard_type,
-            f"org:{org_id}" if org_id else None,
-            f"user:{user_id}" if user_id else None,
+            "org:%d" % org_id if org_id else None,
+            "user:%d" % user_id if user_id else None,
             f"teams:{team_ids}" if team_ids else None
         )
         return self.get(key)
@@ -199,11 +289,15 @@ class CacheService:
         key = self._build_key(
             self.PREFIX_DASHBOARD,
             dashboard_type,
-            f"org:{org_id}" if org_id else None,
-            f"user:{user_id}" if user_id else None,
+            "org:%d" % org_id if org_id else None,
+            "user:%d" % user_id if user_id else None,
             f"teams:{team_ids}" if team_ids else None
         )
-        return self.set(key, data, self.TTL_DASHBOARD)
+        return self.set(key, data, self.TTL_DASHBOARD, self.index_keys(
+            self.PREFIX_DASHBOARD,
+            "org:%d" % org_id if org_id else None,
+            "user:%d" % user_id if user_id else None
+        ))
     
     def get_metrics(self, metric_type: str, org_id: Optional[int] = None, 
                     extra_key: Optional[str] = None) -> Optional[Any]:
@@ -211,7 +305,7 @@ class CacheService:
         key = self._build_key(
             self.PREFIX_METRICS,
             metric_type,
-            f"org:{org_id}" if org_id else None,
+            "org:%d" % org_id if org_id else None,
             extra_key
         )
         return self.get(key)
@@ -222,7 +316,7 @@ class CacheService:
         key = self._build_key(
             self.PREFIX_METRICS,
             metric_type,
-            f"org:{org_id}" if org_id else None,
+            "org:%d" % org_id if org_id else None,
             extra_key
         )
         return self.set(key, data, ttl or self.TTL_MEDIUM)
@@ -245,12 +339,16 @@ def cached(prefix: str, ttl: int = CacheService.TTL_SHORT,
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
+            # Skip key building and both cache round trips while Redis is down
+            if cache.is_disabled:
+                return await func(*args, **kwargs)
+            
             # Build cache key
             if key_builder:
                 cache_key = key_builder(*args, **kwargs)
             else:
                 # Default key builder using function name and arguments
-                key_parts = [prefix, func.__name__]
+                key_parts = [CacheService.PREFIX_APP, prefix, func.__name__]
                 key_parts.extend(str(arg) for arg in args if arg is not None)
                 key_parts.extend(f"{k}:{v}" for k, v in sorted(kwargs.items()) if v is not None)
                 cache_key = ":".join(key_parts)
@@ -2,17 +2,77 @@
 Metrics Service
 Business logic for calculating and storing performance metrics
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, and_, or_, case, false, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import date, datetime, timedelta
 from typing import Optional, Dict, List, Any
+from types import SimpleNamespace
 import json
+import pandas as pd
 from app.models.order import Order
 from app.models.user import User
 from app.models.team import Team
-from app.models.user_team import UserTeam
-from app.models.metrics import EmployeePerformanceMetrics, TeamPerformanceMetrics
+from app.models.metrics import EmployeePerformanceMetrics, TeamPerformanceMetrics, EmployeeDailyOrderStats
 from app.models.reference import OrderStatusType
+from app.services.order_stats_service import STATS_COUNTERS
+
+
+def _count_if(condition):
+    """COUNT of the rows matching a condition, for conditional aggregation"""
+    return func.count(case((condition, 1)))
+
+
+# Orders fetched per chunk by the date range recompute
+RANGE_CHUNK_SIZE = 5000
+
+# Statuses not counted as in progress
+TERMINAL_STATUS_NAMES = {"Completed", "On-hold", "BP and RTI"}
+
+EMPTY_STATUS_COUNTS = {"orders_completed": 0, "orders_on_hold": 0, "orders_bp_rti": 0}
+
+
+def _stats_columns() -> List[Any]:
+    """Summed EmployeeDailyOrderStats counters, labelled by counter name"""
+    return [
+        func.coalesce(func.sum(getattr(EmployeeDailyOrderStats, name)), 0).label(name)
+        for name in STATS_COUNTERS
+    ]
+
+
+def _aggregate_order_chunk(
+    orders: pd.DataFrame,
+    start_of_range: datetime,
+    end_of_range: datetime
+) -> pd.DataFrame:
+    """Aggregate a frame of order step columns into per (user_id, day) counters"""
+    # One long-format frame per step: user_id, day, minutes, single_seat
+    step_frames = []
+    for step in ("step1", "step2"):
+        end_col = orders[f"{step}_end_time"]
+        done = orders[f"{step}_user_id"].notna() & end_col.between(start_of_range, end_of_range)
+        step_orders = orders[done]
+        frame = pd.DataFrame({
+            "user_id": step_orders[f"{step}_user_id"].astype("int64"),
+            "day": step_orders[f"{step}_end_time"].dt.date,
+            "minutes": (
+                step_orders[f"{step}_end_time"] - step_orders[f"{step}_start_time"]
+            ).dt.total_seconds() // 60,
+            "single_seat": (
+                step_orders["step1_user_id"] == step_orders["step2_user_id"]
+                if step == "step2" else False
+            )
+        })
+        step_frames.append(
+            frame.groupby(["user_id", "day"]).agg(**{
+                f"{step}_completed": ("user_id", "size"),
+                f"{step}_timed_count": ("minutes", "count"),
+                f"{step}_minutes": ("minutes", "sum"),
+                f"{step}_single_seat": ("single_seat", "sum")
+            })
+        )
+    
+    return pd.concat(step_frames, axis=1).fillna(0)
 
 
 class MetricsService:
@@ -20,13 +80,79 @@ class MetricsService:
     
     def __init__(self, db: Session):
         self.db = db
+        self._status_cache: Optional[Dict[str, int]] = None
+    
+    def _status_ids(self) -> Dict[str, int]:
+        """Get all order status IDs by name (loaded once per service)"""
+        if self._status_cache is None:
+            self._status_cache = {
+                name: status_id
+                for name, status_id in self.db.query(OrderStatusType.name, OrderStatusType.id).all()
+            }
+        return self._status_cache
     
     def get_status_id(self, status_name: str) -> Optional[int]:
         """Get order status ID by name"""
-        status = self.db.query(OrderStatusType).filter(
-            OrderStatusType.name == status_name
-        ).first()
-        return status.id if status else None
+        return self._status_ids().get(status_name)
+    
+    def get_in_progress_status_ids(self) -> List[int]:
+        """Get the IDs of all statuses other than Completed, On-hold and BP and RTI"""
+        return [
+            status_id for name, status_id in self._status_ids().items()
+            if name not in TERMINAL_STATUS_NAMES
+        ]
+    
+    def _status_count_columns(self, status_col: Any = Order.order_status_id) -> List[Any]:
+        """Conditional COUNT columns for the completed / on-hold / BP and RTI statuses"""
+        completed_id = self.get_status_id("Completed")
+        on_hold_id = self.get_status_id("On-hold")
+        bp_rti_id = self.get_status_id("BP and RTI")
+        
+        return [
+            _count_if(
+                status_col == completed_id if completed_id else false()
+            ).label("orders_completed"),
+            _count_if(
+                status_col == on_hold_id if on_hold_id else false()
+            ).label("orders_on_hold"),
+            _count_if(
+                status_col == bp_rti_id if bp_rti_id else false()
+            ).label("orders_bp_rti")
+        ]
+    
+    def _employee_metrics_row(
+        self,
+        user_id: int,
+        org_id: int,
+        team_id: Optional[int],
+        metric_date: date,
+        stats: Any,
+        counts: Any
+    ) -> Dict[str, Any]:
+        """Build the employee metrics dict from the step stats and status counts"""
+        step1_completed = stats.step1_completed
+        step2_completed = stats.step2_completed
+        single_seat_completed = stats.single_seat_completed
+        
+        return {
+            "user_id": user_id,
+            "team_id": team_id,
+            "org_id": org_id,
+            "metric_date": metric_date,
+            "period_type": "daily",
+            "total_orders_assigned": step1_completed + step2_completed - single_seat_completed,
+            "total_step1_completed": step1_completed,
+            "total_step2_completed": step2_completed,
+            "total_single_seat_completed": single_seat_completed,
+            "total_orders_completed": step1_completed + step2_completed - single_seat_completed,
+            "total_working_minutes": stats.step1_minutes + stats.step2_minutes,
+            "avg_step1_duration_minutes": int(stats.step1_minutes / stats.step1_timed_count) if stats.step1_timed_count else None,
+            "avg_step2_duration_minutes": int(stats.step2_minutes / stats.step2_timed_count) if stats.step2_timed_count else None,
+            "orders_on_hold": counts.orders_on_hold,
+            "orders_completed": counts.orders_completed,
+            "orders_bp_rti": counts.orders_bp_rti,
+            "calculation_status": "calculated"
+        }
     
     def calculate_employee_daily_metrics(
         self,
@@ -34,174 +160,255 @@ class MetricsService:
         metric_date: date,
         team_id: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Calculate daily metrics for an employee"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        """
+        Calculate daily metrics for an employee
+        Step completions and durations are read from employee_daily_order_stats
+        
+        Daily step counts and minutes are also kept current on order writes
+        (see order_stats_service); saving this result reconciles the row and
+        fills in the averages and status counts.
+        """
+        user = self.db.query(User).options(
+            load_only(User.id, User.org_id)
+        ).filter(User.id == user_id).first()
         if not user:
             return {}
         
-        # Build date range
-        start_of_day = datetime.combine(metric_date, datetime.min.time())
-        end_of_day = datetime.combine(metric_date, datetime.max.time())
-        
-        # Base query for orders where user worked
-        base_query = self.db.query(Order).filter(
-            Order.deleted_at == None,
-            or_(
-                Order.step1_user_id == user_id,
-                Order.step2_user_id == user_id
-            )
+        # Step completions and durations from the daily order stats summary
+        stats_stmt = select(*_stats_columns()).where(
+            EmployeeDailyOrderStats.user_id == user_id,
+            EmployeeDailyOrderStats.metric_date == metric_date
         )
         
         if team_id:
-            base_query = base_query.filter(Order.team_id == team_id)
+            stats_stmt = stats_stmt.where(EmployeeDailyOrderStats.team_id == team_id)
         
-        # Step 1 completions
-        step1_completed = base_query.filter(
-            Order.step1_user_id == user_id,
-            Order.step1_end_time >= start_of_day,
-            Order.step1_end_time <= end_of_day
-        ).count()
+        stats = self.db.execute(stats_stmt).one()
         
-        # Step 2 completions
-        step2_completed = base_query.filter(
+        # Status counts (not date bound) for orders where user worked.
+        # UNION ALL of a step 1 arm and a step 2 arm (skipping orders already
+        # matched on step 1) so each arm can use its own step user index
+        step1_orders = select(Order.order_status_id).where(
+            Order.not_deleted(),
+            Order.step1_user_id == user_id
+        )
+        step2_orders = select(Order.order_status_id).where(
+            Order.not_deleted(),
             Order.step2_user_id == user_id,
-            Order.step2_end_time >= start_of_day,
-            Order.step2_end_time <= end_of_day
-        ).count()
+            Order.step1_user_id.is_distinct_from(user_id)
+        )
         
-        # Single seat completions (user did both steps)
-        single_seat_completed = base_query.filter(
-            Order.step1_user_id == user_id,
-            Order.step2_user_id == user_id,
-            Order.step2_end_time >= start_of_day,
-            Order.step2_end_time <= end_of_day
-        ).count()
-        
-        # Total working minutes (sum of step durations)
-        total_minutes = 0
-        
-        # Step 1 durations
-        step1_orders = base_query.filter(
-            Order.step1_user_id == user_id,
-            Order.step1_start_time != None,
-            Order.step1_end_time != None,
-            Order.step1_end_time >= start_of_day,
-            Order.step1_end_time <= end_of_day
-        ).all()
-        
-        step1_durations = []
-        for order in step1_orders:
-            duration = (order.step1_end_time - order.step1_start_time).total_seconds() / 60
-            total_minutes += int(duration)
-            step1_durations.append(duration)
-        
-        # Step 2 durations
-        step2_orders = base_query.filter(
-            Order.step2_user_id == user_id,
-            Order.step2_start_time != None,
-            Order.step2_end_time != None,
-            Order.step2_end_time >= start_of_day,
-            Order.step2_end_time <= end_of_day
-        ).all()
-        
-        step2_durations = []
-        for order in step2_orders:
-            duration = (order.step2_end_time - order.step2_start_time).total_seconds() / 60
-            total_minutes += int(duration)
-            step2_durations.append(duration)
-        
-        # Status counts
-        completed_id = self.get_status_id("Completed")
-        on_hold_id = self.get_status_id("On-hold")
-        bp_rti_id = self.get_status_id("BP and RTI")
+        if team_id:
+            step1_orders = step1_orders.where(Order.team_id == team_id)
+            step2_orders = step2_orders.where(Order.team_id == team_id)
+        
+        user_orders = union_all(step1_orders, step2_orders).cte("user_orders")
+        counts = self.db.execute(
+            select(*self._status_count_columns(user_orders.c.order_status_id))
+        ).one()
         
-        orders_completed = base_query.filter(
-            Order.order_status_id == completed_id
-        ).count() if completed_id else 0
+        return self._employee_metrics_row(
+            user_id, user.org_id, team_id, metric_date, stats, counts
+        )
+    
+    def calculate_employee_daily_metrics_bulk(
+        self,
+        team_id: int,
+        metric_date: date
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate daily metrics for every employee who worked on a team's orders
+        Uses a fixed number of grouped queries instead of per-employee calls
+        Returns metrics keyed by user_id
+        """
+        # Step completions and durations, one row per employee
+        stats_rows = self.db.query(
+            EmployeeDailyOrderStats.user_id, *_stats_columns()
+        ).filter(
+            EmployeeDailyOrderStats.team_id == team_id,
+            EmployeeDailyOrderStats.metric_date == metric_date
+        ).group_by(EmployeeDailyOrderStats.user_id).all()
+        
+        stats_by_user = {row[0]: row for row in stats_rows}
+        counts_by_user = self._status_counts_by_user(team_id)
+        
+        user_ids = stats_by_user.keys() | counts_by_user.keys()
+        if not user_ids:
+            return {}
         
-        orders_on_hold = base_query.filter(
-            Order.order_status_id == on_hold_id
-        ).count() if on_hold_id else 0
+        org_ids = dict(
+            self.db.query(User.id, User.org_id).filter(User.id.in_(user_ids)).all()
+        )
         
-        orders_bp_rti = base_query.filter(
-            Order.order_status_id == bp_rti_id
-        ).count() if bp_rti_id else 0
+        empty_stats = SimpleNamespace(**dict.fromkeys(STATS_COUNTERS, 0))
         
         return {
-            "user_id": user_id,
-            "team_id": team_id,
-            "org_id": user.org_id,
-            "metric_date": metric_date,
-            "period_type": "daily",
-            "total_orders_assigned": step1_completed + step2_completed - single_seat_completed,
-            "total_step1_completed": step1_completed,
-            "total_step2_completed": step2_completed,
-            "total_single_seat_completed": single_seat_completed,
-            "total_orders_completed": step1_completed + step2_completed - single_seat_completed,
-            "total_working_minutes": total_minutes,
-            "avg_step1_duration_minutes": int(sum(step1_durations) / len(step1_durations)) if step1_durations else None,
-            "avg_step2_duration_minutes": int(sum(step2_durations) / len(step2_durations)) if step2_durations else None,
-            "orders_on_hold": orders_on_hold,
-            "orders_completed": orders_completed,
-            "orders_bp_rti": orders_bp_rti,
-            "calculation_status": "calculated"
+            user_id: self._employee_metrics_row(
+                user_id,
+                org_ids[user_id],
+                team_id,
+                metric_date,
+                stats_by_user.get(user_id, empty_stats),
+                SimpleNamespace(**counts_by_user.get(user_id, EMPTY_STATUS_COUNTS))
+            )
+            for user_id in user_ids
+            if user_id in org_ids
         }
     
+    def _status_counts_by_user(self, team_id: int) -> Dict[int, Dict[str, int]]:
+        """
+        Get completed / on-hold / BP and RTI counts per employee for a team's orders
+        Grouped by step 1 user, then by step 2 user for the orders not already
+        counted against the same user on step 1
+        """
+        status_columns = self._status_count_columns()
+        status_rows = self.db.query(
+            Order.step1_user_id, *status_columns
+        ).filter(
+            Order.team_id == team_id,
+            Order.not_deleted(),
+            Order.step1_user_id != None
+        ).group_by(Order.step1_user_id).all()
+        status_rows += self.db.query(
+            Order.step2_user_id, *status_columns
+        ).filter(
+            Order.team_id == team_id,
+            Order.not_deleted(),
+            Order.step2_user_id != None,
+            Order.step2_user_id.is_distinct_from(Order.step1_user_id)
+        ).group_by(Order.step2_user_id).all()
+        
+        counts_by_user: Dict[int, Dict[str, int]] = {}
+        for user_id, completed, on_hold, bp_rti in status_rows:
+            counts = counts_by_user.setdefault(user_id, dict(EMPTY_STATUS_COUNTS))
+            counts["orders_completed"] += completed
+            counts["orders_on_hold"] += on_hold
+            counts["orders_bp_rti"] += bp_rti
+        return counts_by_user
+    
+    def calculate_employee_metrics_range(
+        self,
+        team_id: int,
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate daily metrics per employee for every day in a date range
+        Streams the team's orders for the window once and aggregates per
+        (employee, day) with pandas instead of recomputing each day separately
+        Only (employee, day) pairs with at least one completed step are returned
+        """
+        start_of_range = datetime.combine(start_date, datetime.min.time())
+        end_of_range = datetime.combine(end_date, datetime.max.time())
+        
+        # Stream the window through a server-side cursor in fixed-size chunks
+        # (set on the statement, so the session's connection keeps its options)
+        chunks = pd.read_sql(
+            select(
+                Order.step1_user_id,
+                Order.step1_start_time,
+                Order.step1_end_time,
+                Order.step2_user_id,
+                Order.step2_start_time,
+                Order.step2_end_time
+            ).where(
+                Order.team_id == team_id,
+                Order.not_deleted(),
+                or_(
+                    Order.step1_end_time.between(start_of_range, end_of_range),
+                    Order.step2_end_time.between(start_of_range, end_of_range)
+                )
+            ).execution_options(stream_results=True),
+            self.db.connection(),
+            parse_dates=[
+                "step1_start_time", "step1_end_time",
+                "step2_start_time", "step2_end_time"
+            ],
+            chunksize=RANGE_CHUNK_SIZE
+        )
+        
+        # Per-chunk (user_id, day) aggregates are additive, so sum them at the end
+        partials = [
+            _aggregate_order_chunk(orders, start_of_range, end_of_range)
+            for orders in chunks
+            if not orders.empty
+        ]
+        if not partials:
+            return []
+        
+        daily = pd.concat(partials).groupby(level=["user_id", "day"]).sum().astype("int64")
+        daily["single_seat_completed"] = daily.pop("step1_single_seat") + daily.pop("step2_single_seat")
+        
+        # to_dict converts numpy values back to plain Python ints for the DB driver
+        records = daily.reset_index().to_dict("records")
+        
+        user_ids = {record["user_id"] for record in records}
+        org_ids = dict(
+            self.db.query(User.id, User.org_id).filter(User.id.in_(user_ids)).all()
+        )
+        counts_by_user = self._status_counts_by_user(team_id)
+        
+        return [
+            self._employee_metrics_row(
+                record["user_id"],
+                org_ids[record["user_id"]],
+                team_id,
+                record["day"],
+                SimpleNamespace(**record),
+                SimpleNamespace(**counts_by_user.get(record["user_id"], EMPTY_STATUS_COUNTS))
+            )
+            for record in records
+            if record["user_id"] in org_ids
+        ]
+    
     def calculate_team_daily_metrics(
         self,
         team_id: int,
         metric_date: date
     ) -> Dict[str, Any]:
         """Calculate daily metrics for a team"""
-        team = self.db.query(Team).filter(Team.id == team_id).first()
+        team = self.db.query(Team).options(
+            load_only(Team.id, Team.org_id, Team.active_employee_count)
+        ).filter(Team.id == team_id).first()
         if not team:
             return {}
         
-        # Build date range
-        start_of_day = datetime.combine(metric_date, datetime.min.time())
-        end_of_day = datetime.combine(metric_date, datetime.max.time())
-        
-        # Orders for this team
-        base_query = self.db.query(Order).filter(
-            Order.team_id == team_id,
-            Order.deleted_at == None
-        )
-        
-        # Total orders
-        total_orders = base_query.filter(
-            Order.entry_date == metric_date
-        ).count()
-        
-        # Status counts
         completed_id = self.get_status_id("Completed")
         on_hold_id = self.get_status_id("On-hold")
         bp_rti_id = self.get_status_id("BP and RTI")
+        in_progress_ids = self.get_in_progress_status_ids()
+        
+        # All team counts in a single statement
+        stmt = select(
+            _count_if(Order.entry_date == metric_date).label("total_orders"),
+            _count_if(
+                and_(Order.order_status_id == completed_id, Order.entry_date == metric_date)
+                if completed_id else false()
+            ).label("completed"),
+            _count_if(
+                Order.order_status_id == on_hold_id if on_hold_id else false()
+            ).label("on_hold"),
+            _count_if(
+                Order.order_status_id == bp_rti_id if bp_rti_id else false()
+            ).label("bp_rti"),
+            # In progress (not completed, not on hold, not bp_rti)
+            _count_if(
+                Order.order_status_id.in_(in_progress_ids) if in_progress_ids else false()
+            ).label("in_progress")
+        ).select_from(Order).where(
+            Order.team_id == team_id,
+            Order.not_deleted()
+        )
         
-        completed = base_query.filter(
-            Order.order_status_id == completed_id,
-            Order.entry_date == metric_date
-        ).count() if completed_id else 0
-        
-        on_hold = base_query.filter(
-            Order.order_status_id == on_hold_id
-        ).count() if on_hold_id else 0
-        
-        bp_rti = base_query.filter(
-            Order.order_status_id == bp_rti_id
-        ).count() if bp_rti_id else 0
-        
-        # In progress (not completed, not on hold, not bp_rti)
-        in_progress = base_query.filter(
-            Order.order_status_id.notin_([
-                s for s in [completed_id, on_hold_id, bp_rti_id] if s
-            ])
-        ).count()
+        counts = self.db.execute(stmt).one()
+        total_orders = counts.total_orders
+        completed = counts.completed
+        on_hold = counts.on_hold
+        bp_rti = counts.bp_rti
+        in_progress = counts.in_progress
         
-        # Active employees in team
-        active_employees = self.db.query(UserTeam).filter(
-            UserTeam.team_id == team_id,
-            UserTeam.is_active == True
-        ).count()
+        # Active employees in team (maintained on membership writes)
+        active_employees = team.active_employee_count
         
         # Completion rate
         completion_rate = None
@@ -230,41 +437,90 @@ class MetricsService:
         }
     
     def save_employee_metrics(self, metrics_data: Dict[str, Any]) -> EmployeePerformanceMetrics:
-        """Save or update employee metrics"""
-        existing = self.db.query(EmployeePerformanceMetrics).filter(
-            EmployeePerformanceMetrics.user_id == metrics_data["user_id"],
-            EmployeePerformanceMetrics.metric_date == metrics_data["metric_date"],
-            EmployeePerformanceMetrics.period_type == metrics_data["period_type"]
-        ).first()
-        
-        if existing:
-            for key, value in metrics_data.items():
-                setattr(existing, key, value)
-            self.db.commit()
-            return existing
-        
-        metrics = EmployeePerformanceMetrics(**metrics_data)
-        self.db.add(metrics)
-        self.db.commit()
-        self.db.refresh(metrics)
+        """
+        Save or update employee metrics (single atomic UPSERT)
+        Flushes only; the caller commits once per batch
+        """
+        stmt = pg_insert(EmployeePerformanceMetrics).values(**metrics_data)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "metric_date", "period_type"],
+            set_={
+                **{
+                    key: stmt.excluded[key]
+                    for key in metrics_data
+                    if key not in ("user_id", "metric_date", "period_type")
+                },
+                "modified_at": datetime.utcnow()
+            }
+        ).returning(EmployeePerformanceMetrics)
+        
+        metrics = self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+        self.db.flush()
         return metrics
     
     def save_team_metrics(self, metrics_data: Dict[str, Any]) -> TeamPerformanceMetrics:
-        """Save or update team metrics"""
-        existing = self.db.query(TeamPerformanceMetrics).filter(
-            TeamPerformanceMetrics.team_id == metrics_data["team_id"],
-            TeamPerformanceMetrics.metric_date == metrics_data["metric_date"],
-            TeamPerformanceMetrics.period_type == metrics_data["period_type"]
-        ).first()
-        
-        if existing:
-            for key, value in metrics_data.items():
-                setattr(existing, key, value)
-            self.db.commit()
-            return existing
-        
-        metrics = TeamPerformanceMetrics(**metrics_data)
-        self.db.add(metrics)
-        self.db.commit()
-        self.db.refresh(metrics)
+        """
+        Save or update team metrics (single atomic UPSERT)
+        Flushes only; the caller commits once per batch
+        """
+        stmt = pg_insert(TeamPerformanceMetrics).values(**metrics_data)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["team_id", "metric_date", "period_type"],
+            set_={
+                **{
+                    key: stmt.excluded[key]
+                    for key in metrics_data
+                    if key not in ("team_id", "metric_date", "period_type")
+                },
+                "modified_at": datetime.utcnow()
+            }
+        ).returning(TeamPerformanceMetrics)
+        
+        metrics = self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+        self.db.flush()
         return metrics
+    
+    def _upsert_metrics_rows(self, model: Any, key_column: str, rows: List[Dict[str, Any]]) -> int:
+        """UPSERT many metrics rows in one batched statement, keyed by (key_column, metric_date, period_type)"""
+        if not rows:
+            return 0
+        
+        conflict_keys = (key_column, "metric_date", "period_type")
+        table = model.__table__
+        stmt = pg_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_keys),
+            set_={
+                **{
+                    key: stmt.excluded[key]
+                    for key in rows[0]
+                    if key not in conflict_keys
+                },
+                "modified_at": datetime.utcnow()
+            }
+        )
+        self.db.execute(stmt, rows)
+        self.db.flush()
+        return len(rows)
+    
+    def save_employee_metrics_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Save or update many employee metrics rows in one batched UPSERT
+        Rows must share the same keys (as returned by the calculators)
+        Flushes only; the caller commits
+        Returns the number of rows written
+        """
+        return self._upsert_metrics_rows(EmployeePerformanceMetrics, "user_id", rows)
+    
+    def save_team_metrics_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Save or update many team metrics rows in one batched UPSERT
+        Rows must share the same keys (as returned by the calculators)
+        Flushes only; the caller commits
+        Returns the number of rows written
+        """
+        return self._upsert_metrics_rows(TeamPerformanceMetrics, "team_id", rows)
@@ -0,0 +1,159 @@
+"""
+Order Score Service
+Keeps the per-order productivity credit columns (completion_type,
+step1_score_value, step2_score_value) in step with order and team writes
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select, update, case
+from typing import Any, Dict, Optional
+from app.models.order import Order
+from app.models.team import Team
+
+
+# Order.completion_type values
+COMPLETION_NONE = 0
+COMPLETION_STEP1_ONLY = 1
+COMPLETION_STEP2_ONLY = 2
+COMPLETION_SINGLE_SEAT = 3
+COMPLETION_SPLIT = 4
+
+# Order columns that decide the credit
+SCORE_FIELDS = ("team_id", "step1_user_id", "step2_user_id")
+
+# Team multiplier columns and their defaults when unset
+TEAM_MULTIPLIERS = {
+    "step1_score": 0.5,
+    "step2_score": 0.5,
+    "single_seat_score": 1.0,
+}
+
+
+def completion_type(step1_user_id: Optional[int], step2_user_id: Optional[int]) -> int:
+    """Classify how an order's steps are split between users"""
+    if step1_user_id is None and step2_user_id is None:
+        return COMPLETION_NONE
+    if step1_user_id == step2_user_id:
+        return COMPLETION_SINGLE_SEAT
+    if step2_user_id is None:
+        return COMPLETION_STEP1_ONLY
+    if step1_user_id is None:
+        return COMPLETION_STEP2_ONLY
+    return COMPLETION_SPLIT
+
+
+def order_score_values(
+    connection,
+    team_id: int,
+    step1_user_id: Optional[int],
+    step2_user_id: Optional[int]
+) -> Dict[str, Any]:
+    """Get the credit column values for an order using its team's current multipliers"""
+    kind = completion_type(step1_user_id, step2_user_id)
+    values: Dict[str, Any] = {
+        "completion_type": kind,
+        "step1_score_value": 0.0,
+        "step2_score_value": 0.0,
+    }
+    if kind == COMPLETION_NONE:
+        return values
+    
+    table = Team.__table__
+    row = connection.execute(
+        select(*(table.c[name] for name in TEAM_MULTIPLIERS)).where(table.c.id == team_id)
+    ).first()
+    multipliers = {
+        name: (row[index] if row is not None and row[index] else default)
+        for index, (name, default) in enumerate(TEAM_MULTIPLIERS.items())
+    }
+    
+    if kind == COMPLETION_SINGLE_SEAT:
+        values["step1_score_value"] = multipliers["single_seat_score"]
+    else:
+        if step1_user_id is not None:
+            values["step1_score_value"] = multipliers["step1_score"]
+        if step2_user_id is not None:
+            values["step2_score_value"] = multipliers["step2_score"]
+    return values
+
+
+def _set_order_score_values(connection, order: Order) -> None:
+    for name, value in order_score_values(
+        connection, order.team_id, order.step1_user_id, order.step2_user_id
+    ).items():
+        setattr(order, name, value)
+
+
+@event.listens_for(Order, "before_insert")
+def _order_before_insert(mapper, connection, order: Order) -> None:
+    _set_order_score_values(connection, order)
+
+
+@event.listens_for(Order, "before_update")
+def _order_before_update(mapper, connection, order: Order) -> None:
+    attrs = inspect(order).attrs
+    if any(attrs[field].history.has_changes() for field in SCORE_FIELDS):
+        _set_order_score_values(connection, order)
+
+
+def rescore_team_orders(connection, team_id: int, multipliers: Dict[str, Any]) -> None:
+    """Re-apply a team's multipliers to the credit columns of all its orders"""
+    values = {
+        name: (multipliers.get(name) or default)
+        for name, default in TEAM_MULTIPLIERS.items()
+    }
+    table = Order.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.team_id == team_id, table.c.completion_type != COMPLETION_NONE)
+        .values(
+            step1_score_value=case(
+                (table.c.completion_type == COMPLETION_SINGLE_SEAT, values["single_seat_score"]),
+                (table.c.step1_user_id != None, values["step1_score"]),
+                else_=0
+            ),
+            step2_score_value=case(
+                (table.c.completion_type == COMPLETION_SINGLE_SEAT, 0),
+                (table.c.step2_user_id != None, values["step2_score"]),
+                else_=0
+            ),
+            # Rescoring is not an order edit
+            modified_at=table.c.modified_at
+        )
+    )
+
+
+@event.listens_for(Team, "after_update")
+def _team_updated(mapper, connection, team: Team) -> None:
+    attrs = inspect(team).attrs
+    if any(attrs[name].history.has_changes() for name in TEAM_MULTIPLIERS):
+        rescore_team_orders(
+            connection, team.id,
+            {name: getattr(team, name) for name in TEAM_MULTIPLIERS}
+        )
+
+
+def rebuild_order_scores(db: Session) -> None:
+    """
+    Recompute completion_type and the credit columns for all orders
+    Used to backfill the columns and to reconcile them with teams
+    """
+    table = Order.__table__
+    db.execute(
+        update(table).values(
+            completion_type=case(
+                ((table.c.step1_user_id == None) & (table.c.step2_user_id == None), COMPLETION_NONE),
+                (table.c.step1_user_id == table.c.step2_user_id, COMPLETION_SINGLE_SEAT),
+                (table.c.step2_user_id == None, COMPLETION_STEP1_ONLY),
+                (table.c.step1_user_id == None, COMPLETION_STEP2_ONLY),
+                else_=COMPLETION_SPLIT
+            ),
+            modified_at=table.c.modified_at
+        )
+    )
+    connection = db.connection()
+    for team in db.query(Team).all():
+        rescore_team_orders(
+            connection, team.id,
+            {name: getattr(team, name) for name in TEAM_MULTIPLIERS}
+        )
+    db.commit()
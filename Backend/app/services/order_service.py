@@ -3,11 +3,15 @@ Order Service
 Business logic for order operations including audit trails and workflow
 """
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from app.models.order import Order
 from app.models.order_history import OrderHistory
 from app.models.user import User
+from app.services.order_stats_service import STATS_FIELDS, apply_order_change
+from app.services.order_score_service import SCORE_FIELDS, order_score_values
+from app.services.weekly_score_service import WEEKLY_SCORE_FIELDS, apply_order_weekly_change
 
 
 class OrderService:
@@ -25,8 +29,11 @@ class OrderService:
         new_value: Optional[str],
         change_type: str
     ) -> OrderHistory:
-        """Log a change to the order history"""
-        history = OrderHistory(
+        """
+        Build an order history entry for a change
+        The entry is not added to the session; callers save it
+        """
+        return OrderHistory(
             order_id=order_id,
             changed_by=changed_by,
             field_name=field_name,
@@ -34,8 +41,6 @@ class OrderService:
             new_value=new_value,
             change_type=change_type
         )
-        self.db.add(history)
-        return history
     
     def soft_delete(self, order: Order, user_id: int) -> bool:
         """Soft delete an order"""
@@ -46,10 +51,10 @@ class OrderService:
         order.deleted_by = user_id
         order.modified_by = user_id
         
-        self.log_change(
+        self.db.add(self.log_change(
             order.id, user_id, "deleted_at",
             None, str(order.deleted_at), "delete"
-        )
+        ))
         return True
     
     def restore(self, order: Order, user_id: int) -> bool:
@@ -62,10 +67,10 @@ class OrderService:
         order.deleted_by = None
         order.modified_by = user_id
         
-        self.log_change(
+        self.db.add(self.log_change(
             order.id, user_id, "deleted_at",
             old_deleted, None, "restore"
-        )
+        ))
         return True
     
     def update_with_audit(
@@ -79,30 +84,120 @@ class OrderService:
         Returns empty list (no fields are blocked now that locking is removed)
         """
         blocked_fields: List[str] = []
+        histories: List[OrderHistory] = []
         
         for field, new_value in update_data.items():
             old_value = getattr(order, field)
             if old_value != new_value:
-                self.log_change(
+                histories.append(self.log_change(
                     order.id, user_id, field,
                     str(old_value) if old_value is not None else None,
                     str(new_value) if new_value is not None else None,
                     "update"
-                )
+                ))
                 setattr(order, field, new_value)
         
         order.modified_by = user_id
+        
+        # Save all history entries in one batched INSERT
+        if histories:
+            self.db.bulk_save_objects(histories)
         return blocked_fields
     
-    def calculate_step_duration(self, start_time: datetime, end_time: datetime) -> Optional[int]:
-        """Calculate duration in minutes between start and end time"""
-        if not start_time or not end_time:
+    def update_by_id_with_audit(
+        self,
+        order_id: int,
+        update_data: Dict[str, Any],
+        user_id: int
+    ) -> Optional[List[str]]:
+        """
+        Update order fields by ID with audit logging, without loading the Order
+        Previous values come back from the same UPDATE ... RETURNING statement
+        Already loaded Order instances are not refreshed
+        Returns the changed field names, or None if the order does not exist
+        Raises ValueError if update_data has keys that are not Order columns,
+        or sets id or modified_by (modified_by is always user_id)
+        """
+        table = Order.__table__
+        unknown = set(update_data) - set(table.c.keys())
+        if unknown:
+            raise ValueError(f"Unknown order fields: {', '.join(sorted(unknown))}")
+        reserved = set(update_data) & {"id", "modified_by"}
+        if reserved:
+            raise ValueError(f"Order fields cannot be updated: {', '.join(sorted(reserved))}")
+        columns = list(dict.fromkeys([*update_data, *STATS_FIELDS, *SCORE_FIELDS, *WEEKLY_SCORE_FIELDS]))
+        
+        # Lock and snapshot the current row, then update it and return the snapshot
+        old = select(
+            table.c.id, *(table.c[name] for name in columns)
+        ).where(table.c.id == order_id).with_for_update().subquery("old")
+        stmt = update(table).where(
+            table.c.id == old.c.id
+        ).values(
+            **update_data, modified_by=user_id
+        ).returning(*(old.c[name] for name in columns))
+        
+        row = self.db.execute(stmt).mappings().one_or_none()
+        if row is None:
+            return None
+        
+        old_state = dict(row)
+        changed_fields = [
+            field for field, new_value in update_data.items()
+            if old_state[field] != new_value
+        ]
+        
+        histories = [
+            self.log_change(
+                order_id, user_id, field,
+                str(old_state[field]) if old_state[field] is not None else None,
+                str(update_data[field]) if update_data[field] is not None else None,
+                "update"
+            )
+            for field in changed_fields
+        ]
+        if histories:
+            self.db.bulk_save_objects(histories)
+        
+        # Core UPDATE bypasses the Order listeners, so refresh the productivity
+        # credit and apply the stats and weekly score changes here
+        new_state = {**old_state, **update_data}
+        if any(field in update_data for field in SCORE_FIELDS):
+            score_values = order_score_values(
+                self.db.connection(),
+                new_state["team_id"],
+                new_state["step1_user_id"],
+                new_state["step2_user_id"]
+            )
+            self.db.execute(
+                update(table).where(table.c.id == order_id).values(**score_values)
+            )
+            new_state.update(score_values)
+        
+        apply_order_weekly_change(
+            self.db.connection(),
+            {field: old_state[field] for field in WEEKLY_SCORE_FIELDS},
+            {field: new_state[field] for field in WEEKLY_SCORE_FIELDS}
+        )
+        apply_order_change(
+            self.db.connection(),
+            {field: old_state[field] for field in STATS_FIELDS},
+            {field: update_data.get(field, old_state[field]) for field in STATS_FIELDS}
+        )
+        return changed_fields
+    
+    @staticmethod
+    def calculate_step_duration(start_time: datetime, end_time: datetime) -> Optional[int]:
+        """Calculate duration in whole minutes between start and end time"""
+        if start_time is None or end_time is None:
             return None
         delta = end_time - start_time
-        return int(delta.total_seconds() / 60)
+        # Integer math on the timedelta parts, no float conversion
+        return delta.days * 1440 + delta.seconds // 60
     
-    def is_completed(self, order: Order) -> bool:
+    @staticmethod
+    def is_completed(order: Order) -> bool:
         """Check if an order is considered completed based on steps"""
         # An order is considered completed if both steps are done (for two-step orders)
         # or if the single step is done (for single-step orders)
-        return (order.step1_user_id is not None or order.step2_user_id is not None)
+        return order.step1_user_id is not None or order.step2_user_id is not None
@@ -0,0 +1,293 @@
+"""
+Order Stats Service
+Keeps the employee_daily_order_stats summary table and the daily employee
+performance metrics in step with order writes
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, func, case, literal, cast, BigInteger, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import date, datetime
+from typing import Any, Dict, Tuple
+from app.models.order import Order
+from app.models.metrics import EmployeeDailyOrderStats, EmployeePerformanceMetrics
+
+
+# Order columns that decide what an order contributes to the daily stats
+STATS_FIELDS = (
+    "org_id", "team_id", "deleted_at",
+    "step1_user_id", "step1_start_time", "step1_end_time",
+    "step2_user_id", "step2_start_time", "step2_end_time",
+)
+
+# Counter columns of EmployeeDailyOrderStats
+STATS_COUNTERS = (
+    "step1_completed", "step2_completed", "single_seat_completed",
+    "step1_timed_count", "step1_minutes", "step2_timed_count", "step2_minutes",
+)
+
+# (user_id, team_id, org_id, metric_date)
+StatsKey = Tuple[int, int, int, date]
+
+
+def order_stats_contributions(state: Dict[str, Any]) -> Dict[StatsKey, Dict[str, int]]:
+    """
+    Get the stats counters a single order contributes, keyed by stats row
+    Deleted orders contribute nothing
+    """
+    contributions: Dict[StatsKey, Dict[str, int]] = {}
+    if state["deleted_at"] is not None:
+        return contributions
+    
+    def row(user_id: int, end_time: datetime) -> Dict[str, int]:
+        key = (user_id, state["team_id"], state["org_id"], end_time.date())
+        if key not in contributions:
+            contributions[key] = dict.fromkeys(STATS_COUNTERS, 0)
+        return contributions[key]
+    
+    for step in ("step1", "step2"):
+        user_id = state[f"{step}_user_id"]
+        start_time = state[f"{step}_start_time"]
+        end_time = state[f"{step}_end_time"]
+        if user_id is None or end_time is None:
+            continue
+        
+        counters = row(user_id, end_time)
+        counters[f"{step}_completed"] += 1
+        if start_time is not None:
+            counters[f"{step}_timed_count"] += 1
+            counters[f"{step}_minutes"] += int((end_time - start_time).total_seconds() // 60)
+        
+        # Single seat is counted when the same user completes step 2
+        if step == "step2" and state["step1_user_id"] == user_id:
+            counters["single_seat_completed"] += 1
+    
+    return contributions
+
+
+def diff_stats_contributions(
+    old: Dict[StatsKey, Dict[str, int]],
+    new: Dict[StatsKey, Dict[str, int]]
+) -> Dict[StatsKey, Dict[str, int]]:
+    """Get the per-row counter deltas needed to go from old to new contributions"""
+    delta: Dict[StatsKey, Dict[str, int]] = {}
+    for key in old.keys() | new.keys():
+        old_counters = old.get(key, {})
+        new_counters = new.get(key, {})
+        counters = {
+            name: new_counters.get(name, 0) - old_counters.get(name, 0)
+            for name in STATS_COUNTERS
+        }
+        if any(counters.values()):
+            delta[key] = counters
+    return delta
+
+
+def apply_stats_delta(connection, delta: Dict[StatsKey, Dict[str, int]]) -> None:
+    """Add counter deltas onto the stats rows, creating missing rows (atomic UPSERT)"""
+    table = EmployeeDailyOrderStats.__table__
+    now = datetime.utcnow()
+    for (user_id, team_id, org_id, metric_date), counters in delta.items():
+        stmt = pg_insert(table).values(
+            user_id=user_id,
+            team_id=team_id,
+            org_id=org_id,
+            metric_date=metric_date,
+            modified_at=now,
+            **counters
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "team_id", "metric_date"],
+            set_={
+                **{name: table.c[name] + stmt.excluded[name] for name in STATS_COUNTERS},
+                "modified_at": now,
+            }
+        )
+        connection.execute(stmt)
+
+
+def apply_metrics_delta(connection, delta: Dict[StatsKey, Dict[str, int]]) -> None:
+    """
+    Add counter deltas onto the daily EmployeePerformanceMetrics rows (atomic UPSERT)
+    Daily metrics are keyed per employee, so deltas of all teams are combined.
+    Averages and status counts are left to the next full recalculation.
+    """
+    per_employee: Dict[Tuple[int, int, date], Dict[str, int]] = {}
+    for (user_id, team_id, org_id, metric_date), counters in delta.items():
+        combined = per_employee.setdefault(
+            (user_id, org_id, metric_date), dict.fromkeys(STATS_COUNTERS, 0)
+        )
+        for name in STATS_COUNTERS:
+            combined[name] += counters[name]
+    
+    table = EmployeePerformanceMetrics.__table__
+    now = datetime.utcnow()
+    for (user_id, org_id, metric_date), counters in per_employee.items():
+        orders = (
+            counters["step1_completed"] + counters["step2_completed"]
+            - counters["single_seat_completed"]
+        )
+        increments = {
+            "total_step1_completed": counters["step1_completed"],
+            "total_step2_completed": counters["step2_completed"],
+            "total_single_seat_completed": counters["single_seat_completed"],
+            "total_orders_assigned": orders,
+            "total_orders_completed": orders,
+            "total_working_minutes": counters["step1_minutes"] + counters["step2_minutes"],
+        }
+        stmt = pg_insert(table).values(
+            user_id=user_id,
+            org_id=org_id,
+            metric_date=metric_date,
+            period_type="daily",
+            calculation_status="pending",
+            created_at=now,
+            modified_at=now,
+            **increments
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "metric_date", "period_type"],
+            set_={
+                **{
+                    name: func.coalesce(table.c[name], 0) + stmt.excluded[name]
+                    for name in increments
+                },
+                "modified_at": now,
+            }
+        )
+        connection.execute(stmt)
+
+
+def _apply_delta(connection, delta: Dict[StatsKey, Dict[str, int]]) -> None:
+    """Apply an order's counter deltas to the stats and daily metrics tables"""
+    if not delta:
+        return
+    apply_stats_delta(connection, delta)
+    apply_metrics_delta(connection, delta)
+
+
+def apply_order_change(connection, old_state: Dict[str, Any], new_state: Dict[str, Any]) -> None:
+    """
+    Apply the stats change between two snapshots of an order's STATS_FIELDS
+    For order writes made outside the ORM unit of work, which skip the listeners
+    """
+    _apply_delta(connection, diff_stats_contributions(
+        order_stats_contributions(old_state),
+        order_stats_contributions(new_state)
+    ))
+
+
+def _order_state(order: Order, previous: bool = False) -> Dict[str, Any]:
+    """Snapshot the stats fields of an order, optionally as they were before this flush"""
+    state = {field: getattr(order, field) for field in STATS_FIELDS}
+    if previous:
+        attrs = inspect(order).attrs
+        for field in STATS_FIELDS:
+            history = attrs[field].history
+            if history.deleted:
+                state[field] = history.deleted[0]
+    return state
+
+
+@event.listens_for(Order, "after_insert")
+def _order_inserted(mapper, connection, order: Order) -> None:
+    _apply_delta(connection, order_stats_contributions(_order_state(order)))
+
+
+@event.listens_for(Order, "after_update")
+def _order_updated(mapper, connection, order: Order) -> None:
+    attrs = inspect(order).attrs
+    if not any(attrs[field].history.has_changes() for field in STATS_FIELDS):
+        return
+    apply_order_change(connection, _order_state(order, previous=True), _order_state(order))
+
+
+@event.listens_for(Order, "after_delete")
+def _order_deleted(mapper, connection, order: Order) -> None:
+    delta = diff_stats_contributions(
+        order_stats_contributions(_order_state(order, previous=True)), {}
+    )
+    _apply_delta(connection, delta)
+
+
+def rebuild_employee_daily_order_stats(db: Session, metric_date: date) -> int:
+    """
+    Recompute all stats rows for one day from the orders table
+    Used to reconcile the summary table with orders
+    Returns the number of stats rows written
+    """
+    return rebuild_employee_daily_order_stats_range(db, metric_date, metric_date)
+
+
+def rebuild_employee_daily_order_stats_range(db: Session, start_date: date, end_date: date) -> int:
+    """
+    Recompute all stats rows for an inclusive date range from the orders table
+    Used to backfill the summary table (pass the first and last step end dates
+    in orders) and to reconcile it with orders
+    Returns the number of stats rows written
+    """
+    range_start = datetime.combine(start_date, datetime.min.time())
+    range_end = datetime.combine(end_date, datetime.max.time())
+    
+    rows: Dict[StatsKey, Dict[str, int]] = {}
+    
+    for step in ("step1", "step2"):
+        user_col = getattr(Order, f"{step}_user_id")
+        start_col = getattr(Order, f"{step}_start_time")
+        end_col = getattr(Order, f"{step}_end_time")
+        end_day = cast(end_col, Date)
+        # Single seat is counted on the step 2 side only
+        single_seat = (
+            func.count(case((Order.step1_user_id == Order.step2_user_id, 1)))
+            if step == "step2" else literal(0)
+        )
+        
+        grouped = db.query(
+            user_col,
+            Order.team_id,
+            Order.org_id,
+            end_day,
+            func.count(Order.id),
+            func.count(start_col),
+            # Whole minutes per order, floored and summed in SQL as BIGINT
+            func.sum(
+                func.floor(func.extract('epoch', end_col - start_col) / 60).cast(BigInteger)
+            ),
+            single_seat
+        ).filter(
+            Order.not_deleted(),
+            user_col != None,
+            end_col >= range_start,
+            end_col <= range_end
+        ).group_by(user_col, Order.team_id, Order.org_id, end_day).all()
+        
+        for user_id, team_id, org_id, day, completed, timed, minutes, single_seat_count in grouped:
+            key = (user_id, team_id, org_id, day)
+            if key not in rows:
+                rows[key] = dict.fromkeys(STATS_COUNTERS, 0)
+            rows[key][f"{step}_completed"] = completed
+            rows[key][f"{step}_timed_count"] = timed
+            rows[key][f"{step}_minutes"] = minutes or 0
+            rows[key]["single_seat_completed"] += single_seat_count
+    
+    db.query(EmployeeDailyOrderStats).filter(
+        EmployeeDailyOrderStats.metric_date >= start_date,
+        EmployeeDailyOrderStats.metric_date <= end_date
+    ).delete(synchronize_session=False)
+    
+    if rows:
+        db.execute(
+            EmployeeDailyOrderStats.__table__.insert(),
+            [
+                {
+                    "user_id": user_id,
+                    "team_id": team_id,
+                    "org_id": org_id,
+                    "metric_date": day,
+                    **counters
+                }
+                for (user_id, team_id, org_id, day), counters in rows.items()
+            ]
+        )
+    
+    db.commit()
+    return len(rows)
@@ -16,17 +16,182 @@ Example:
 """
 # pyright: reportGeneralTypeIssues=false
 # pyright: reportArgumentType=false
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, contains_eager, load_only
+from sqlalchemy import func, and_, or_, case, select, literal, union_all, cast, true, false, Date, Integer
 from datetime import date, datetime, timedelta
 from typing import Optional, Dict, List, Any, Tuple
 from decimal import Decimal
+from functools import lru_cache
+from dataclasses import dataclass
+from types import SimpleNamespace
+import time
+import numpy as np
 from app.models.order import Order
 from app.models.user import User
 from app.models.team import Team
 from app.models.user_team import UserTeam
 from app.models.employee_weekly_target import EmployeeWeeklyTarget
+from app.models.metrics import EmployeeWeeklyScore
 from app.services.attendance_service import AttendanceService
+from app.schemas.attendance import AttendanceSummary
+from app.services.order_score_service import COMPLETION_SINGLE_SEAT, TEAM_MULTIPLIERS
+
+
+@lru_cache(maxsize=4096)
+def get_week_boundaries(reference_date: date) -> Tuple[date, date]:
+    """
+    Get the Sunday-Saturday week boundaries for a given date.
+    Returns (week_start_date, week_end_date)
+    """
+    day_of_week = reference_date.weekday()
+    
+    # Calculate Sunday of this week
+    if day_of_week == 6:  # Sunday
+        week_start = reference_date
+    else:
+        days_since_sunday = day_of_week + 1
+        week_start = reference_date - timedelta(days=days_since_sunday)
+    
+    week_end = week_start + timedelta(days=6)
+    return week_start, week_end
+
+
+@lru_cache(maxsize=4096)
+def get_weeks_in_range(start_date: date, end_date: date) -> Tuple[Tuple[date, date], ...]:
+    """
+    Get all weeks (Sunday-Saturday) that overlap with the given date range.
+    Returns an immutable tuple of (week_start, week_end) tuples, shared between callers.
+    """
+    weeks = []
+    current_week_start, current_week_end = get_week_boundaries(start_date)
+    
+    while current_week_start <= end_date:
+        weeks.append((current_week_start, current_week_end))
+        current_week_start = current_week_start + timedelta(days=7)
+        current_week_end = current_week_start + timedelta(days=6)
+    
+    return tuple(weeks)
+
+
+@dataclass(slots=True)
+class TeamTarget:
+    """A team's weekly target within a WeekBreakdown"""
+    team_id: int
+    target: int
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {"teamId": self.team_id, "target": self.target}
+
+
+@dataclass(slots=True)
+class WeekBreakdown:
+    """One week of get_weekly_target_for_range, serialized with as_dict() for responses"""
+    week_start: date
+    week_end: date
+    total_target: Optional[int]
+    team_targets: List[TeamTarget]
+    days_in_range: int
+    proportional_target: float
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "weekStart": self.week_start.isoformat(),
+            "weekEnd": self.week_end.isoformat(),
+            "totalTarget": self.total_target,
+            "teamTargets": [team_target.as_dict() for team_target in self.team_targets],
+            "daysInRange": self.days_in_range,
+            "proportionalTarget": self.proportional_target
+        }
+
+
+@lru_cache(maxsize=4096)
+def split_full_weeks(
+    start_date: date,
+    end_date: date
+) -> Tuple[Optional[Tuple[date, date]], Tuple[Tuple[date, date], ...]]:
+    """
+    Split a date range into whole Sunday-Saturday weeks and the leftover edge days.
+    Returns ((first_week_start, last_week_start) or None, ((edge_start, edge_end), ...))
+    """
+    first_week_start = start_date + timedelta(days=(6 - start_date.weekday()) % 7)
+    last_week_end = end_date - timedelta(days=(end_date.weekday() - 5) % 7)
+    if first_week_start + timedelta(days=6) > last_week_end:
+        return None, ((start_date, end_date),) if start_date <= end_date else ()
+    
+    edges = []
+    if start_date < first_week_start:
+        edges.append((start_date, first_week_start - timedelta(days=1)))
+    if end_date > last_week_end:
+        edges.append((last_week_end + timedelta(days=1), end_date))
+    return (first_week_start, last_week_end - timedelta(days=6)), tuple(edges)
+
+
+# Per (employee, team) completion totals: (step1_only, step2_only, single_seat,
+# step1_only_score, step2_only_score, single_seat_score); scores sum the per-order credit
+CompletionTotals = Tuple[int, int, int, float, float, float]
+NO_COMPLETIONS: CompletionTotals = (0, 0, 0, 0.0, 0.0, 0.0)
+
+
+def credit_multipliers(totals: CompletionTotals) -> Dict[str, float]:
+    """
+    Get the per-completion credit behind completion totals, for display.
+    A team's order credits are rewritten together when its multipliers change,
+    so score / count is the team multiplier; kinds without completions show the default.
+    """
+    step1_only, step2_only, single_seat, step1_only_score, step2_only_score, single_seat_score = totals
+    return {
+        "step1": round(step1_only_score / step1_only, 2) if step1_only else TEAM_MULTIPLIERS["step1_score"],
+        "step2": round(step2_only_score / step2_only, 2) if step2_only else TEAM_MULTIPLIERS["step2_score"],
+        "singleSeat": (
+            round(single_seat_score / single_seat, 2) if single_seat else TEAM_MULTIPLIERS["single_seat_score"]
+        )
+    }
+
+
+# Process-local cache of the team columns productivity reads (name, monthly
+# target): {team_id: (expires_at, snapshot)}. Scores come from the per-order
+# credits, never from cached multipliers, so every worker ranks and displays alike
+TEAM_CACHE_TTL = 60
+TEAM_CACHE_MAXSIZE = 1024
+_team_cache: Dict[int, Tuple[float, SimpleNamespace]] = {}
+
+
+def get_teams_cached(db: Session, team_ids: List[int]) -> Dict[int, SimpleNamespace]:
+    """
+    Get productivity snapshots of teams, loading expired or missing ones in one query.
+    Teams that don't exist are omitted.
+    """
+    now = time.monotonic()
+    teams: Dict[int, SimpleNamespace] = {}
+    missing = []
+    for team_id in team_ids:
+        entry = _team_cache.get(team_id)
+        if entry is not None and entry[0] > now:
+            teams[team_id] = entry[1]
+        else:
+            missing.append(team_id)
+    
+    if missing:
+        if len(_team_cache) + len(missing) > TEAM_CACHE_MAXSIZE:
+            _team_cache.clear()
+        rows = db.query(
+            Team.id, Team.name, Team.monthly_target
+        ).filter(Team.id.in_(missing)).all()
+        for row in rows:
+            snapshot = SimpleNamespace(**row._asdict())
+            _team_cache[row.id] = (now + TEAM_CACHE_TTL, snapshot)
+            teams[row.id] = snapshot
+    return teams
+
+
+def get_team_cached(db: Session, team_id: int) -> Optional[SimpleNamespace]:
+    """Get a productivity snapshot of one team (None if it doesn't exist)"""
+    return get_teams_cached(db, [team_id]).get(team_id)
+
+
+def invalidate_team_cache(team_id: int) -> None:
+    """Drop a team's cached snapshot after it changes"""
+    _team_cache.pop(team_id, None)
 
 
 class ProductivityService:
@@ -58,135 +223,161 @@ class ProductivityService:
         Get the Sunday-Saturday week boundaries for a given date.
         Returns (week_start_date, week_end_date)
         """
-        day_of_week = reference_date.weekday()
-        
-        # Calculate Sunday of this week
-        if day_of_week == 6:  # Sunday
-            week_start = reference_date
-        else:
-            days_since_sunday = day_of_week + 1
-            week_start = reference_date - timedelta(days=days_since_sunday)
-        
-        week_end = week_start + timedelta(days=6)
-        return week_start, week_end
+        return get_week_boundaries(reference_date)
     
-    def get_weeks_in_range(self, start_date: date, end_date: date) -> List[Tuple[date, date]]:
+    def get_weeks_in_range(self, start_date: date, end_date: date) -> Tuple[Tuple[date, date], ...]:
         """
         Get all weeks (Sunday-Saturday) that overlap with the given date range.
-        Returns list of (week_start, week_end) tuples.
+        Returns tuple of (week_start, week_end) tuples.
         """
-        weeks = []
-        current_week_start, current_week_end = self.get_week_boundaries(start_date)
-        
-        while current_week_start <= end_date:
-            weeks.append((current_week_start, current_week_end))
-            current_week_start = current_week_start + timedelta(days=7)
-            current_week_end = current_week_start + timedelta(days=6)
-        
-        return weeks
+        return get_weeks_in_range(start_date, end_date)
     
     def get_weekly_target_for_range(
         self, 
         user_id: int, 
         start_date: date, 
-        end_date: date
-    ) -> Tuple[float, Optional[int], List[Dict]]:
+        end_date: date,
+        include_weekly_breakdown: bool = True
+    ) -> Tuple[float, Optional[int], List[WeekBreakdown]]:
         """
         Calculate total expected target for a date range by summing weekly targets.
         For weeks without explicit targets, carry forward the last known target per team.
         
         Target is per employee PER TEAM - we sum targets from all teams.
         
+        Args:
+            include_weekly_breakdown: Build the per-week breakdown (skip when only totals are needed)
+        
         Returns:
             Tuple of (total_target, weekly_target_used, weekly_breakdown)
             - total_target: Sum of targets for all weeks and all teams in range
             - weekly_target_used: The total weekly target value (sum from all teams)
-            - weekly_breakdown: List of week details with targets per team
+            - weekly_breakdown: List of WeekBreakdown with targets per team (empty if not requested)
         """
         weeks = self.get_weeks_in_range(start_date, end_date)
-        total_target = 0.0
-        weekly_breakdown = []
-        
-        # Get all targets for this user across all teams, ordered by week
-        all_targets = self.db.query(EmployeeWeeklyTarget).filter(
-            EmployeeWeeklyTarget.user_id == user_id
-        ).order_by(EmployeeWeeklyTarget.week_start_date).all()
-        
-        # Create a map of (week_start, team_id) -> target
-        target_map: Dict[Tuple[date, int], int] = {}
-        for t in all_targets:
-            week_date = t.week_start_date  # type: ignore
-            team_id = int(t.team_id)  # type: ignore
-            target_map[(week_date, team_id)] = int(t.target)  # type: ignore
-        
-        # Find the most recent target per team before start_date for carryforward
-        last_known_per_team: Dict[int, int] = {}
-        for t in all_targets:
-            t_week_start = t.week_start_date  # type: ignore
-            team_id = int(t.team_id)  # type: ignore
-            if t_week_start < start_date:
-                last_known_per_team[team_id] = int(t.target)  # type: ignore
+        if not weeks:
+            return 0.0, None, []
         
         # Get all teams the user is a member of
         user_team_ids = [
-            int(ut.team_id) for ut in self.db.query(UserTeam).filter(  # type: ignore
+            team_id for (team_id,) in self.db.query(UserTeam.team_id).filter(
                 UserTeam.user_id == user_id,
                 UserTeam.is_active == True
             ).all()
         ]
         
-        for week_start, week_end in weeks:
-            week_total_target = 0
-            team_targets_for_week = []
-            
-            for team_id in user_team_ids:
-                # Check if we have a target for this week and team
-                key = (week_start, team_id)
-                if key in target_map:
-                    last_known_per_team[team_id] = target_map[key]
-                
-                team_target = last_known_per_team.get(team_id)
-                if team_target is not None:
-                    team_targets_for_week.append({
-                        "teamId": team_id,
-                        "target": team_target
-                    })
-                    week_total_target += team_target
-            
-            if week_total_target > 0:
-                # Calculate days of this week that fall within the range
-                overlap_start = max(week_start, start_date)
-                overlap_end = min(week_end, end_date)
-                days_in_range = (overlap_end - overlap_start).days + 1
-                
-                # Proportional target for partial weeks
-                weekly_proportion = days_in_range / 7.0
-                proportional_target = float(week_total_target) * weekly_proportion
-                total_target += proportional_target
-                
-                weekly_breakdown.append({
-                    "weekStart": week_start.isoformat(),
-                    "weekEnd": week_end.isoformat(),
-                    "totalTarget": week_total_target,
-                    "teamTargets": team_targets_for_week,
-                    "daysInRange": days_in_range,
-                    "proportionalTarget": round(proportional_target, 2)
-                })
-            else:
-                weekly_breakdown.append({
-                    "weekStart": week_start.isoformat(),
-                    "weekEnd": week_end.isoformat(),
-                    "totalTarget": None,
-                    "teamTargets": [],
-                    "daysInRange": 0,
-                    "proportionalTarget": 0
-                })
+        # Carried-forward target per (week, team), resolved in SQL
+        targets_by_week = self._carried_forward_targets(
+            user_id, user_team_ids, weeks, start_date
+        )
+        
+        # Targets of member teams as a (weeks x teams) matrix
+        team_column = {team_id: i for i, team_id in enumerate(user_team_ids)}
+        team_targets = np.zeros((len(weeks), len(user_team_ids)), dtype=np.int64)
+        for i, (week_start, _) in enumerate(weeks):
+            for team_id, team_target in targets_by_week.get(week_start, {}).items():
+                if team_id in team_column:
+                    team_targets[i, team_column[team_id]] = team_target
+        week_totals = team_targets.sum(axis=1)
+        
+        # Days of each week that fall within the range (partial weeks at the edges)
+        week_starts = np.arange(
+            np.datetime64(weeks[0][0]), np.datetime64(weeks[-1][0]) + 1, 7
+        )
+        week_ends = week_starts + 6
+        days_in_range = np.clip(
+            (np.minimum(week_ends, np.datetime64(end_date))
+             - np.maximum(week_starts, np.datetime64(start_date))).astype(np.int64) + 1,
+            0, 7
+        )
+        
+        # Proportional target for partial weeks
+        proportional_targets = np.where(week_totals > 0, week_totals * days_in_range / 7.0, 0.0)
+        total_target = float(proportional_targets.sum())
+        
+        weekly_breakdown: List[WeekBreakdown] = []
+        if include_weekly_breakdown:
+            for i, (week_start, week_end) in enumerate(weeks):
+                if week_totals[i] > 0:
+                    weekly_breakdown.append(WeekBreakdown(
+                        week_start,
+                        week_end,
+                        int(week_totals[i]),
+                        [
+                            TeamTarget(team_id, team_target)
+                            for team_id, team_target in targets_by_week.get(week_start, {}).items()
+                            if team_id in team_column
+                        ],
+                        int(days_in_range[i]),
+                        round(float(proportional_targets[i]), 2)
+                    ))
+                else:
+                    weekly_breakdown.append(WeekBreakdown(week_start, week_end, None, [], 0, 0))
         
         # Calculate the current week's total target for display
-        current_week_total = sum(last_known_per_team.values()) if last_known_per_team else None
+        # (last week of the range, including targets carried from teams the user has left)
+        last_week_targets = targets_by_week.get(weeks[-1][0])
+        current_week_total = sum(last_week_targets.values()) if last_week_targets else None
         
         return total_target, current_week_total, weekly_breakdown
     
+    def _carried_forward_targets(
+        self,
+        user_id: int,
+        user_team_ids: List[int],
+        weeks: Tuple[Tuple[date, date], ...],
+        start_date: date
+    ) -> Dict[date, Dict[int, int]]:
+        """
+        Get the target in effect for every week and every team the user has targets for.
+        Weeks come from generate_series; each (week, team) takes the most recent target
+        on or before that week. Teams the user is no longer a member of only carry the
+        most recent target before start_date.
+        
+        Returns:
+            {week_start: {team_id: target}} (teams without a target yet are omitted)
+        """
+        if not weeks:
+            return {}
+        
+        week_series = select(
+            cast(func.generate_series(
+                weeks[0][0], weeks[-1][0], timedelta(days=7)
+            ), Date).label("week_start")
+        ).cte("weeks")
+        target_teams = select(EmployeeWeeklyTarget.team_id).where(
+            EmployeeWeeklyTarget.user_id == user_id
+        ).distinct().cte("target_teams")
+        
+        carry_until = case(
+            (target_teams.c.team_id.in_(user_team_ids), week_series.c.week_start),
+            else_=start_date - timedelta(days=1)
+        ) if user_team_ids else start_date - timedelta(days=1)
+        
+        latest_target = select(EmployeeWeeklyTarget.target).where(
+            EmployeeWeeklyTarget.user_id == user_id,
+            EmployeeWeeklyTarget.team_id == target_teams.c.team_id,
+            EmployeeWeeklyTarget.week_start_date <= carry_until
+        ).order_by(
+            EmployeeWeeklyTarget.week_start_date.desc()
+        ).limit(1).correlate(week_series, target_teams).scalar_subquery()
+        
+        rows = self.db.execute(
+            select(
+                week_series.c.week_start,
+                target_teams.c.team_id,
+                latest_target.label("target")
+            ).select_from(
+                week_series.join(target_teams, true())
+            ).order_by(week_series.c.week_start, target_teams.c.team_id)
+        ).all()
+        
+        targets_by_week: Dict[date, Dict[int, int]] = {}
+        for week_start, team_id, target in rows:
+            if target is not None:
+                targets_by_week.setdefault(week_start, {})[team_id] = target
+        return targets_by_week
+    
     def get_working_days_in_month(self, year: int, month: int) -> int:
         """
         Calculate working days in a month (ALL days - company works 7 days/week)
@@ -203,71 +394,135 @@ class ProductivityService:
         delta = end_date - start_date
         return delta.days + 1  # +1 to include both start and end dates
     
-    def get_employee_team_score(
+    def _completion_counts_by_team(
         self,
         user_id: int,
-        team_id: int,
+        team_ids: List[int],
         start_date: date,
         end_date: date
-    ) -> Dict[str, Any]:
+    ) -> Dict[int, CompletionTotals]:
         """
-        Calculate score for an employee in a specific team (orders only from this team).
-        Uses team-specific score multipliers.
-        
-        Returns:
-            Dict with step counts and scores for this team
+        Count an employee's step1-only, step2-only and single seat completions
+        and their credit for several teams (based on entry_date).
+        Returns {team_id: CompletionTotals}; teams without orders are omitted.
         """
-        # Get team settings for score multipliers
-        team = self.db.query(Team).filter(Team.id == team_id).first()
+        counts = self._completion_counts_by_members([user_id], team_ids, start_date, end_date)
+        return {team_id: member_counts for (_, team_id), member_counts in counts.items()}
+    
+    def _completion_counts_by_members(
+        self,
+        user_ids: List[int],
+        team_ids: List[int],
+        start_date: date,
+        end_date: date
+    ) -> Dict[Tuple[int, int], CompletionTotals]:
+        """
+        Count step1-only, step2-only and single seat completions of several
+        employees in several teams and sum their credit (based on entry_date).
+        Whole weeks are summed from employee_weekly_scores; only the partial
+        weeks at the edges of the range are counted from orders.
+        Returns {(user_id, team_id): CompletionTotals}; pairs without orders are omitted.
+        """
+        if not user_ids or not team_ids:
+            return {}
+        
+        full_weeks, edges = split_full_weeks(start_date, end_date)
+        counts: Dict[Tuple[int, int], CompletionTotals] = {}
+        
+        def add(key: Tuple[int, int], *totals) -> None:
+            previous = counts.get(key, NO_COMPLETIONS)
+            counts[key] = (
+                previous[0] + totals[0], previous[1] + totals[1], previous[2] + totals[2],
+                previous[3] + float(totals[3]), previous[4] + float(totals[4]),
+                previous[5] + float(totals[5])
+            )
+        
+        if full_weeks:
+            rows = self.db.query(
+                EmployeeWeeklyScore.user_id,
+                EmployeeWeeklyScore.team_id,
+                func.sum(EmployeeWeeklyScore.step1_only),
+                func.sum(EmployeeWeeklyScore.step2_only),
+                func.sum(EmployeeWeeklyScore.single_seat),
+                func.sum(EmployeeWeeklyScore.step1_only_score),
+                func.sum(EmployeeWeeklyScore.step2_only_score),
+                func.sum(EmployeeWeeklyScore.single_seat_score)
+            ).filter(
+                EmployeeWeeklyScore.user_id.in_(user_ids),
+                EmployeeWeeklyScore.team_id.in_(team_ids),
+                EmployeeWeeklyScore.week_start_date >= full_weeks[0],
+                EmployeeWeeklyScore.week_start_date <= full_weeks[1]
+            ).group_by(EmployeeWeeklyScore.user_id, EmployeeWeeklyScore.team_id).all()
+            for user_id, team_id, *totals in rows:
+                add((user_id, team_id), *totals)
+        
+        if not edges:
+            return counts
+        
+        is_single_seat = Order.completion_type == COMPLETION_SINGLE_SEAT
+        in_range = (
+            Order.team_id.in_(team_ids),
+            Order.not_deleted(),
+            or_(*(Order.entry_date.between(edge_start, edge_end) for edge_start, edge_end in edges))
+        )
+        
+        # UNION ALL of a step 1 arm and a step 2 arm instead of an OR over both
+        # step user columns, so each arm can use its own partial index
+        step1_orders = select(
+            Order.step1_user_id.label("user_id"),
+            Order.team_id.label("team_id"),
+            case((is_single_seat, literal("single_seat")), else_=literal("step1_only")).label("kind"),
+            Order.step1_score_value.label("score")
+        ).where(Order.step1_user_id.in_(user_ids), *in_range)
+        step2_orders = select(
+            Order.step2_user_id.label("user_id"),
+            Order.team_id.label("team_id"),
+            literal("step2_only").label("kind"),
+            Order.step2_score_value.label("score")
+        ).where(Order.step2_user_id.in_(user_ids), ~is_single_seat, *in_range)
+        member_orders = union_all(step1_orders, step2_orders).cte("member_orders")
+        
+        rows = self.db.execute(
+            select(
+                member_orders.c.user_id,
+                member_orders.c.team_id,
+                # Step 1 completions (user did step 1, but NOT step 2)
+                func.count(case((member_orders.c.kind == "step1_only", 1))),
+                # Step 2 completions (user did step 2, but NOT step 1)
+                func.count(case((member_orders.c.kind == "step2_only", 1))),
+                # Single Seat completions (user did BOTH steps)
+                func.count(case((member_orders.c.kind == "single_seat", 1))),
+                # Credit of each kind (per-order credit columns)
+                *(
+                    func.sum(case((member_orders.c.kind == kind, member_orders.c.score), else_=0))
+                    for kind in ("step1_only", "step2_only", "single_seat")
+                )
+            ).group_by(member_orders.c.user_id, member_orders.c.team_id)
+        ).all()
+        for user_id, team_id, *totals in rows:
+            add((user_id, team_id), *totals)
+        
+        return counts
+    
+    def _build_team_score(
+        self,
+        team_id: int,
+        team: Optional[Team],
+        counts: CompletionTotals
+    ) -> Dict[str, Any]:
+        """Build the team score dict from completion counts and their summed per-order credit"""
         if not team:
             return {
                 "teamId": team_id,
                 "teamName": "Unknown",
                 "completions": {"step1Only": 0, "step2Only": 0, "singleSeat": 0, "total": 0},
                 "scores": {"step1Score": 0, "step2Score": 0, "singleSeatScore": 0, "totalScore": 0},
-                "scoreMultipliers": {"step1": 0.5, "step2": 0.5, "singleSeat": 1.0}
+                "scoreMultipliers": credit_multipliers(NO_COMPLETIONS)
             }
         
-        # Base query for orders in this team within the date range (based on entry_date)
-        base_query = self.db.query(Order).filter(
-            Order.team_id == team_id,
-            Order.deleted_at == None,
-            Order.entry_date >= start_date,
-            Order.entry_date <= end_date
-        )
-        
-        # Count Step 1 completions (user did step 1, but NOT step 2)
-        step1_only_count = base_query.filter(
-            Order.step1_user_id == user_id,
-            or_(
-                Order.step2_user_id != user_id,
-                Order.step2_user_id == None
-            )
-        ).count()
-        
-        # Count Step 2 completions (user did step 2, but NOT step 1)
-        step2_only_count = base_query.filter(
-            Order.step2_user_id == user_id,
-            or_(
-                Order.step1_user_id != user_id,
-                Order.step1_user_id == None
-            )
-        ).count()
-        
-        # Count Single Seat completions (user did BOTH steps)
-        single_seat_count = base_query.filter(
-            Order.step1_user_id == user_id,
-            Order.step2_user_id == user_id
-        ).count()
-        
-        # Calculate scores using team-specific scoring configuration
-        step1_multiplier = float(team.step1_score) if team.step1_score else 0.5
-        step2_multiplier = float(team.step2_score) if team.step2_score else 0.5
-        single_seat_multiplier = float(team.single_seat_score) if team.single_seat_score else 1.0
-        
-        step1_score = step1_only_count * step1_multiplier
-        step2_score = step2_only_count * step2_multiplier
-        single_seat_score = single_seat_count * single_seat_multiplier
+        # Scores are the credits stored on orders (team multipliers applied on write),
+        # the same values the leaderboard ranks by
+        step1_only_count, step2_only_count, single_seat_count, step1_score, step2_score, single_seat_score = counts
         
         total_score = step1_score + step2_score + single_seat_score
         
@@ -286,18 +541,89 @@ class ProductivityService:
                 "singleSeatScore": single_seat_score,
                 "totalScore": total_score
             },
-            "scoreMultipliers": {
-                "step1": step1_multiplier,
-                "step2": step2_multiplier,
-                "singleSeat": single_seat_multiplier
-            }
+            "scoreMultipliers": credit_multipliers(counts)
         }
     
-    def calculate_employee_score(
+    def get_employee_team_score(
         self,
         user_id: int,
+        team_id: int,
+        start_date: date,
+        end_date: date,
+        team: Optional[Team] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate score for an employee in a specific team (orders only from this team).
+        Uses team-specific score multipliers.
+        Pass an already loaded team to skip the team lookup.
+        
+        Returns:
+            Dict with step counts and scores for this team
+        """
+        # Get team settings for score multipliers
+        if team is None:
+            team = get_team_cached(self.db, team_id)
+        if not team:
+            return self._build_team_score(team_id, None, NO_COMPLETIONS)
+        
+        # Idle employees (common on leaderboards) skip the count queries
+        if not self._has_team_orders(user_id, team_id, start_date, end_date):
+            return self._build_team_score(team_id, team, NO_COMPLETIONS)
+        
+        counts = self._completion_counts_by_team(user_id, [team_id], start_date, end_date)
+        return self._build_team_score(team_id, team, counts.get(team_id, NO_COMPLETIONS))
+    
+    def _has_team_orders(
+        self,
+        user_id: int,
+        team_id: int,
+        start_date: date,
+        end_date: date
+    ) -> bool:
+        """
+        Check if an employee worked on any order of a team in the range (based on entry_date).
+        One EXISTS probe per step user column, each served by its partial index.
+        """
+        in_range = (
+            Order.team_id == team_id,
+            Order.not_deleted(),
+            Order.entry_date >= start_date,
+            Order.entry_date <= end_date
+        )
+        return bool(self.db.scalar(select(or_(
+            select(Order.id).where(Order.step1_user_id == user_id, *in_range).exists(),
+            select(Order.id).where(Order.step2_user_id == user_id, *in_range).exists()
+        ))))
+    
+    def get_employee_team_scores(
+        self,
+        user_id: int,
+        team_ids: List[int],
         start_date: date,
         end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate an employee's score for several teams at once.
+        Runs one grouped count query and one team query instead of per-team queries.
+        
+        Returns:
+            List of team score dicts, in the order of team_ids
+        """
+        teams_by_id = get_teams_cached(self.db, team_ids)
+        counts = self._completion_counts_by_team(user_id, team_ids, start_date, end_date)
+        
+        return [
+            self._build_team_score(tid, teams_by_id.get(tid), counts.get(tid, NO_COMPLETIONS))
+            for tid in team_ids
+        ]
+    
+    def calculate_employee_score(
+        self,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        include_weekly_breakdown: bool = True,
+        attendance_cache: Optional[Dict[int, AttendanceSummary]] = None
     ) -> Dict[str, Any]:
         """
         Calculate productivity score for an employee.
@@ -316,11 +642,19 @@ class ProductivityService:
         
         NOTE: Only calculates for users with role 'employee'
         
+        Args:
+            include_weekly_breakdown: Build teamBreakdown and weeklyBreakdown
+                (pass False when only the totals are needed; both are then empty)
+            attendance_cache: Summaries from AttendanceService.get_employees_attendance_summary
+                for the same date range, to skip the per-employee attendance lookup
+        
         Returns:
             Dict with step counts, scores, and productivity percentage
         """
         # Verify user is an employee (not team_lead, admin, superadmin)
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self.db.query(User).options(
+            load_only(User.id, User.user_name, User.employee_id, User.user_role)
+        ).filter(User.id == user_id).first()
         if not user:
             return {"error": "User not found"}
         if user.user_role != 'employee':  # type: ignore
@@ -331,12 +665,12 @@ class ProductivityService:
         actual_end_date = min(end_date, today)
         
         # Get ALL active teams the employee is assigned to
-        user_teams = self.db.query(UserTeam).filter(
-            UserTeam.user_id == user_id,
-            UserTeam.is_active == True
-        ).all()
-        
-        user_team_ids = [int(ut.team_id) for ut in user_teams]  # type: ignore
+        user_team_ids = [
+            team_id for (team_id,) in self.db.query(UserTeam.team_id).filter(
+                UserTeam.user_id == user_id,
+                UserTeam.is_active == True
+            ).all()
+        ]
         
         if not user_team_ids:
             return {
@@ -354,14 +688,14 @@ class ProductivityService:
         total_score = 0.0
         team_breakdown = []
         
-        for tid in user_team_ids:
-            team_score_data = self.get_employee_team_score(
-                user_id=user_id,
-                team_id=tid,
-                start_date=start_date,
-                end_date=actual_end_date
-            )
-            
+        team_scores = self.get_employee_team_scores(
+            user_id=user_id,
+            team_ids=user_team_ids,
+            start_date=start_date,
+            end_date=actual_end_date
+        )
+        
+        for team_score_data in team_scores:
             total_step1_count += team_score_data["completions"]["step1Only"]
             total_step2_count += team_score_data["completions"]["step2Only"]
             total_single_seat_count += team_score_data["completions"]["singleSeat"]
@@ -371,7 +705,7 @@ class ProductivityService:
             total_score += team_score_data["scores"]["totalScore"]
             
             # Only include in breakdown if there's activity
-            if team_score_data["completions"]["total"] > 0:
+            if include_weekly_breakdown and team_score_data["completions"]["total"] > 0:
                 team_breakdown.append(team_score_data)
         
         # Calculate working days (up to today, not future dates)
@@ -383,7 +717,8 @@ class ProductivityService:
         proportional_target, weekly_target_used, weekly_breakdown = self.get_weekly_target_for_range(
             user_id=user_id,
             start_date=start_date,
-            end_date=actual_end_date
+            end_date=actual_end_date,
+            include_weekly_breakdown=include_weekly_breakdown
         )
         
         has_weekly_target = weekly_target_used is not None
@@ -397,12 +732,15 @@ class ProductivityService:
         
         # Calculate attendance using manual attendance records
         # Use AttendanceService to get attendance summary
-        attendance_service = AttendanceService(self.db)
-        attendance_summary = attendance_service.get_employee_attendance_summary(
-            user_id=user_id,
-            start_date=start_date,
-            end_date=actual_end_date
-        )
+        if attendance_cache is not None and user_id in attendance_cache:
+            attendance_summary = attendance_cache[user_id]
+        else:
+            attendance_service = AttendanceService(self.db)
+            attendance_summary = attendance_service.get_employee_attendance_summary(
+                user_id=user_id,
+                start_date=start_date,
+                end_date=actual_end_date
+            )
         
         days_present = attendance_summary.days_present
         days_absent = attendance_summary.days_absent
@@ -450,7 +788,7 @@ class ProductivityService:
             },
             "teamBreakdown": team_breakdown,
             "productivityPercent": productivity_percent,
-            "weeklyBreakdown": weekly_breakdown,
+            "weeklyBreakdown": [week.as_dict() for week in weekly_breakdown],
             "hasWeeklyTarget": has_weekly_target
         }
     
@@ -458,17 +796,22 @@ class ProductivityService:
         self,
         team_id: int,
         start_date: date,
-        end_date: date
+        end_date: date,
+        team: Optional[Team] = None,
+        targets_by_member: Optional[Dict[Tuple[int, int], List[EmployeeWeeklyTarget]]] = None
     ) -> Dict[str, Any]:
         """
         Calculate productivity for all active members of a team.
         Shows each employee's score ONLY for this team (not aggregated across all teams).
+        Pass an already loaded team to skip the team lookup, and targets preloaded
+        with _bulk_load_targets to skip the weekly target lookup.
         
         Returns:
             Dict with team info and list of employee productivity scores for this team
         """
         # Get team
-        team = self.db.query(Team).filter(Team.id == team_id).first()
+        if team is None:
+            team = get_team_cached(self.db, team_id)
         if not team:
             return {"error": "Team not found"}
         
@@ -477,61 +820,46 @@ class ProductivityService:
         actual_end_date = min(end_date, today)
         
         # Get active team members - ONLY employees (not team_lead, admin, superadmin)
+        # The joined User row populates membership.user (no per-member lookup)
         team_members = self.db.query(UserTeam).join(
             User, User.id == UserTeam.user_id
+        ).options(
+            load_only(UserTeam.user_id, UserTeam.team_id),
+            contains_eager(UserTeam.user).load_only(User.id, User.user_name, User.employee_id)
         ).filter(
             UserTeam.team_id == team_id,
             UserTeam.is_active == True,
             User.user_role == 'employee'
         ).all()
         
+        # Weekly targets for all members in one query
+        if targets_by_member is None:
+            targets_by_member = self._bulk_load_targets(
+                [m.user_id for m in team_members], [team_id]  # type: ignore
+            )
+        
+        # Completion counts for all members in one pass
+        counts_by_member = self._completion_counts_by_members(
+            [m.user_id for m in team_members], [team_id], start_date, actual_end_date  # type: ignore
+        )
+        
         employee_scores = []
         total_team_score = 0.0
         total_expected = 0.0
         
         for membership in team_members:
-            user = self.db.query(User).filter(
-                User.id == membership.user_id,
-                User.user_role == 'employee'
-            ).first()
-            if not user:
-                continue
+            user = membership.user
             
-            # Get score for THIS TEAM ONLY (not aggregated across all teams)
-            team_score_data = self.get_employee_team_score(
-                user_id=int(user.id),  # type: ignore
-                team_id=team_id,
+            employee_data = self._employee_team_productivity(
+                user=user,
+                team=team,
                 start_date=start_date,
-                end_date=actual_end_date
+                end_date=actual_end_date,
+                targets=targets_by_member.get((user.id, team_id), []),  # type: ignore
+                counts=counts_by_member.get((user.id, team_id), NO_COMPLETIONS)  # type: ignore
             )
-            
-            # Get employee's weekly target for this team
-            target_for_team = self._get_employee_target_for_team(
-                user_id=int(user.id),  # type: ignore
-                team_id=team_id,
-                start_date=start_date,
-                end_date=actual_end_date
-            )
-            
-            team_score = team_score_data["scores"]["totalScore"]
-            
-            # Calculate productivity % for this employee in this team
-            employee_productivity = None
-            if target_for_team > 0:
-                employee_productivity = round((team_score / target_for_team) * 100, 2)
-            
-            employee_data = {
-                "userId": int(user.id),  # type: ignore
-                "userName": user.user_name,
-                "userName": user.user_name,
-                "employeeId": user.employee_id,
-                "completions": team_score_data["completions"],
-                "scores": team_score_data["scores"],
-                "expectedTarget": target_for_team,
-                "productivityPercent": employee_productivity,
-                "teamId": team_id,
-                "teamName": team.name
-            }
+            team_score = employee_data["scores"]["totalScore"]
+            target_for_team = employee_data["expectedTarget"]
             
             employee_scores.append(employee_data)
             total_team_score += team_score
@@ -549,11 +877,9 @@ class ProductivityService:
             "teamId": team_id,
             "teamName": team.name,
             "monthlyTarget": team.monthly_target,
-            "scoreMultipliers": {
-                "step1": float(team.step1_score) if team.step1_score else 0.5,
-                "step2": float(team.step2_score) if team.step2_score else 0.5,
-                "singleSeat": float(team.single_seat_score) if team.single_seat_score else 1.0
-            },
+            "scoreMultipliers": credit_multipliers(
+                tuple(map(sum, zip(NO_COMPLETIONS, *counts_by_member.values())))
+            ),
             "period": {
                 "startDate": start_date.isoformat(),
                 "endDate": actual_end_date.isoformat(),
@@ -564,40 +890,119 @@ class ProductivityService:
             "totalTeamScore": total_team_score,
             "totalExpectedTarget": team_target,  # Use team target (monthly_target or sum of employee targets)
             "employeeTargetSum": total_expected,  # Keep track of sum of employee targets separately
-            "teamProductivityPercent": round(float(team_productivity), 2),
+            "teamProductivityPercent": round(team_productivity, 2),
             "employees": employee_scores
         }
     
+    def _employee_team_productivity(
+        self,
+        user: User,
+        team: Team,
+        start_date: date,
+        end_date: date,
+        targets: List[EmployeeWeeklyTarget],
+        counts: CompletionTotals
+    ) -> Dict[str, Any]:
+        """
+        Calculate an employee's score, target and productivity for ONE team
+        (not aggregated across all teams). end_date must already be capped at today.
+        Takes the member's completion counts from _completion_counts_by_members.
+        """
+        # Get score for THIS TEAM ONLY (not aggregated across all teams)
+        team_score_data = self._build_team_score(team.id, team, counts)  # type: ignore
+        
+        # Get employee's weekly target for this team
+        target_for_team = self._get_employee_target_for_team(
+            user_id=user.id,  # type: ignore
+            team_id=team.id,  # type: ignore
+            start_date=start_date,
+            end_date=end_date,
+            targets=targets
+        )
+        
+        team_score = team_score_data["scores"]["totalScore"]
+        
+        # Calculate productivity % for this employee in this team
+        employee_productivity = None
+        if target_for_team > 0:
+            employee_productivity = round((team_score / target_for_team) * 100, 2)
+        
+        return {
+            "userId": user.id,  # type: ignore
+            "userName": user.user_name,
+            "employeeId": user.employee_id,
+            "completions": team_score_data["completions"],
+            "scores": team_score_data["scores"],
+            "expectedTarget": target_for_team,
+            "productivityPercent": employee_productivity,
+            "teamId": team.id,  # type: ignore
+            "teamName": team.name
+        }
+    
+    def _bulk_load_targets(
+        self,
+        user_ids: List[int],
+        team_ids: List[int]
+    ) -> Dict[Tuple[int, int], List[EmployeeWeeklyTarget]]:
+        """
+        Load weekly targets for many employees and teams in one query.
+        Returns {(user_id, team_id): targets ordered by week}
+        """
+        targets_by_member: Dict[Tuple[int, int], List[EmployeeWeeklyTarget]] = {}
+        if not user_ids or not team_ids:
+            return targets_by_member
+        
+        all_targets = self.db.query(EmployeeWeeklyTarget).options(
+            load_only(
+                EmployeeWeeklyTarget.user_id, EmployeeWeeklyTarget.team_id,
+                EmployeeWeeklyTarget.week_start_date, EmployeeWeeklyTarget.target
+            )
+        ).filter(
+            EmployeeWeeklyTarget.user_id.in_(user_ids),
+            EmployeeWeeklyTarget.team_id.in_(team_ids)
+        ).order_by(EmployeeWeeklyTarget.week_start_date).all()
+        
+        for t in all_targets:
+            targets_by_member.setdefault((t.user_id, t.team_id), []).append(t)  # type: ignore
+        return targets_by_member
+    
     def _get_employee_target_for_team(
         self,
         user_id: int,
         team_id: int,
         start_date: date,
-        end_date: date
+        end_date: date,
+        targets: Optional[List[EmployeeWeeklyTarget]] = None
     ) -> float:
         """
         Get employee's target for a specific team within a date range.
         Returns proportional target based on weeks in range.
+        Pass the member's targets (ordered by week) to skip the lookup.
         """
         weeks = self.get_weeks_in_range(start_date, end_date)
         total_target = 0.0
         
         # Get all targets for this user and team, ordered by week
-        all_targets = self.db.query(EmployeeWeeklyTarget).filter(
-            EmployeeWeeklyTarget.user_id == user_id,
-            EmployeeWeeklyTarget.team_id == team_id
-        ).order_by(EmployeeWeeklyTarget.week_start_date).all()
+        if targets is not None:
+            all_targets = targets
+        else:
+            all_targets = self.db.query(EmployeeWeeklyTarget).options(
+                load_only(EmployeeWeeklyTarget.week_start_date, EmployeeWeeklyTarget.target)
+            ).filter(
+                EmployeeWeeklyTarget.user_id == user_id,
+                EmployeeWeeklyTarget.team_id == team_id
+            ).order_by(EmployeeWeeklyTarget.week_start_date).all()
         
         # Create a map of week_start -> target
         target_map: Dict[date, int] = {}
         for t in all_targets:
-            target_map[t.week_start_date] = int(t.target)  # type: ignore
+            target_map[t.week_start_date] = t.target  # type: ignore
         
         # Find the most recent target before start_date for carryforward
         last_known_target: Optional[int] = None
         for t in all_targets:
             if t.week_start_date < start_date:  # type: ignore
-                last_known_target = int(t.target)  # type: ignore
+                last_known_target = t.target  # type: ignore
         
         for week_start, week_end in weeks:
             # Check if we have a target for this week
@@ -612,7 +1017,7 @@ class ProductivityService:
                 
                 # Proportional target for partial weeks
                 weekly_proportion = days_in_range / 7.0
-                proportional_target = float(last_known_target) * weekly_proportion
+                proportional_target = last_known_target * weekly_proportion
                 total_target += proportional_target
         
         return round(total_target, 2)
@@ -621,7 +1026,8 @@ class ProductivityService:
         self,
         user_id: int,
         year: int,
-        month: int
+        month: int,
+        include_weekly_breakdown: bool = True
     ) -> Dict[str, Any]:
         """
         Get productivity for a specific month
@@ -636,7 +1042,8 @@ class ProductivityService:
         result = self.calculate_employee_score(
             user_id=user_id,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            include_weekly_breakdown=include_weekly_breakdown
         )
         
         result["month"] = month
@@ -644,13 +1051,187 @@ class ProductivityService:
         
         return result
     
+    def get_monthly_productivity_bulk(
+        self,
+        org_id: Optional[int],
+        year: int,
+        month: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Get monthly productivity for every employee of an organization.
+        Completion counts for all employees and teams come from
+        _completion_counts_by_members (weekly rollup plus the edge days),
+        weekly targets and attendance from one query each, instead of running
+        get_monthly_productivity per employee.
+        
+        Returns:
+            List of employee productivity dicts (same shape as get_monthly_productivity,
+            without teamBreakdown/weeklyBreakdown), ordered by user id
+        """
+        import calendar
+        
+        # Get first and last day of the month
+        _, last_day = calendar.monthrange(year, month)
+        start_date = date(year, month, 1)
+        end_date = date(year, month, last_day)
+        actual_end_date = min(end_date, date.today())
+        
+        # Active memberships of all employees in the organization
+        membership_query = self.db.query(User, UserTeam.team_id).join(
+            UserTeam, UserTeam.user_id == User.id
+        ).options(
+            load_only(User.id, User.user_name, User.employee_id)
+        ).filter(
+            UserTeam.is_active == True,
+            User.user_role == 'employee'
+        )
+        if org_id is not None:
+            membership_query = membership_query.filter(User.org_id == org_id)
+        
+        users_by_id: Dict[int, User] = {}
+        team_ids_by_user: Dict[int, List[int]] = {}
+        for user, tid in membership_query.order_by(User.id, UserTeam.team_id).all():
+            users_by_id[user.id] = user  # type: ignore
+            team_ids_by_user.setdefault(user.id, []).append(tid)  # type: ignore
+        if not users_by_id:
+            return []
+        
+        user_ids = list(users_by_id)
+        all_team_ids = sorted({tid for tids in team_ids_by_user.values() for tid in tids})
+        teams_by_id = get_teams_cached(self.db, all_team_ids)
+        
+        counts = self._completion_counts_by_members(user_ids, all_team_ids, start_date, actual_end_date)
+        targets_by_user = self._weekly_targets_by_user(user_ids)
+        attendance_by_user = AttendanceService(self.db).get_employees_attendance_summary(
+            user_ids, start_date, actual_end_date
+        )
+        
+        weeks = self.get_weeks_in_range(start_date, actual_end_date)
+        last_week_start = weeks[-1][0] if weeks else None
+        working_days = self.get_working_days_in_range(start_date, actual_end_date)
+        
+        results = []
+        for user_id in user_ids:
+            user = users_by_id[user_id]
+            user_team_ids = team_ids_by_user[user_id]
+            
+            total_step1_count = 0
+            total_step2_count = 0
+            total_single_seat_count = 0
+            total_step1_score = 0.0
+            total_step2_score = 0.0
+            total_single_seat_score = 0.0
+            total_score = 0.0
+            for tid in user_team_ids:
+                team_score_data = self._build_team_score(
+                    tid, teams_by_id.get(tid), counts.get((user_id, tid), NO_COMPLETIONS)
+                )
+                total_step1_count += team_score_data["completions"]["step1Only"]
+                total_step2_count += team_score_data["completions"]["step2Only"]
+                total_single_seat_count += team_score_data["completions"]["singleSeat"]
+                total_step1_score += team_score_data["scores"]["step1Score"]
+                total_step2_score += team_score_data["scores"]["step2Score"]
+                total_single_seat_score += team_score_data["scores"]["singleSeatScore"]
+                total_score += team_score_data["scores"]["totalScore"]
+            
+            # Proportional target summed over the member teams
+            user_targets = targets_by_user.get(user_id, {})
+            proportional_target = round(sum(
+                self._get_employee_target_for_team(
+                    user_id=user_id,
+                    team_id=tid,
+                    start_date=start_date,
+                    end_date=actual_end_date,
+                    targets=user_targets.get(tid, [])
+                )
+                for tid in user_team_ids
+            ), 2)
+            
+            # Full weekly target in effect for the last week (teams the user has
+            # left keep their last target before the month, as in get_weekly_target_for_range)
+            weekly_target_used: Optional[int] = None
+            if last_week_start is not None:
+                for tid, team_targets in user_targets.items():
+                    carry_until = last_week_start if tid in user_team_ids else start_date - timedelta(days=1)
+                    in_effect = [t.target for t in team_targets if t.week_start_date <= carry_until]
+                    if in_effect:
+                        weekly_target_used = (weekly_target_used or 0) + in_effect[-1]  # type: ignore
+            
+            attendance_summary = attendance_by_user[user_id]
+            
+            productivity_percent = None
+            if proportional_target > 0:
+                productivity_percent = round((total_score / proportional_target) * 100, 2)
+            
+            results.append({
+                "userId": user_id,
+                "userName": user.user_name,
+                "employeeId": user.employee_id,
+                "teamsIncluded": user_team_ids,
+                "weeklyTarget": weekly_target_used,
+                "expectedTarget": weekly_target_used if weekly_target_used is not None else 0,
+                "period": {
+                    "startDate": start_date.isoformat(),
+                    "endDate": actual_end_date.isoformat(),
+                    "requestedEndDate": end_date.isoformat(),
+                    "workingDays": working_days
+                },
+                "attendance": {
+                    "daysPresent": attendance_summary.days_present,
+                    "daysAbsent": attendance_summary.days_absent,
+                    "daysLeave": attendance_summary.days_leave,
+                    "attendancePercent": round(attendance_summary.attendance_percent, 2)
+                },
+                "completions": {
+                    "step1Only": total_step1_count,
+                    "step2Only": total_step2_count,
+                    "singleSeat": total_single_seat_count,
+                    "total": total_step1_count + total_step2_count + total_single_seat_count
+                },
+                "scores": {
+                    "step1Score": total_step1_score,
+                    "step2Score": total_step2_score,
+                    "singleSeatScore": total_single_seat_score,
+                    "totalScore": total_score
+                },
+                "productivityPercent": productivity_percent,
+                "hasWeeklyTarget": weekly_target_used is not None,
+                "month": month,
+                "year": year
+            })
+        
+        return results
+    
+    def _weekly_targets_by_user(
+        self,
+        user_ids: List[int]
+    ) -> Dict[int, Dict[int, List[EmployeeWeeklyTarget]]]:
+        """
+        Load weekly targets of many employees (all teams) in one query.
+        Returns {user_id: {team_id: targets ordered by week}}
+        """
+        targets_by_user: Dict[int, Dict[int, List[EmployeeWeeklyTarget]]] = {}
+        all_targets = self.db.query(EmployeeWeeklyTarget).options(
+            load_only(
+                EmployeeWeeklyTarget.user_id, EmployeeWeeklyTarget.team_id,
+                EmployeeWeeklyTarget.week_start_date, EmployeeWeeklyTarget.target
+            )
+        ).filter(
+            EmployeeWeeklyTarget.user_id.in_(user_ids)
+        ).order_by(EmployeeWeeklyTarget.week_start_date).all()
+        
+        for t in all_targets:
+            targets_by_user.setdefault(t.user_id, {}).setdefault(t.team_id, []).append(t)  # type: ignore
+        return targets_by_user
+    
     def get_leaderboard(
         self,
         org_id: Optional[int],
         team_id: Optional[int],
         start_date: date,
         end_date: date,
-        limit: int = 10
+        limit: int = 10,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Get top performers by productivity score
@@ -661,37 +1242,145 @@ class ProductivityService:
             start_date: Start of period
             end_date: End of period
             limit: Number of top performers to return
+            offset: Number of higher-ranked performers to skip (for paging)
             
         Returns:
             List of employee productivity scores sorted by total score descending
         """
-        # Get teams to query
-        teams_query = self.db.query(Team).filter(Team.is_active == True)
-        
-        if org_id:
-            teams_query = teams_query.filter(Team.org_id == org_id)
-        if team_id:
-            teams_query = teams_query.filter(Team.id == team_id)
-        
-        teams = teams_query.all()
-        
-        all_scores = []
-        seen_user_ids = set()  # Avoid duplicates if user is in multiple teams
+        # Adjust end_date to not exceed today's date
+        actual_end_date = min(end_date, date.today())
+        
+        # Stage 1: score every (employee, team) membership in SQL, keep one team
+        # per employee (lowest team id) and rank/limit server-side
+        ranked = self._rank_leaderboard_members(org_id, team_id, start_date, actual_end_date)
+        top_rows = self.db.query(ranked.c.user_id, ranked.c.team_id).order_by(
+            ranked.c.total_score.desc(), ranked.c.user_id
+        ).offset(offset).limit(limit).all()
+        if not top_rows:
+            return []
+        
+        # Stage 2: detailed breakdown only for the top-ranked employees, from a fixed
+        # number of batched queries (users, teams, targets, completion counts)
+        user_ids = [user_id for user_id, _ in top_rows]
+        team_ids = list({tid for _, tid in top_rows})
+        users_by_id = {
+            user.id: user
+            for user in self.db.query(User).options(
+                load_only(User.id, User.user_name, User.employee_id)
+            ).filter(User.id.in_(user_ids)).all()
+        }
+        teams_by_id = get_teams_cached(self.db, team_ids)
+        targets_by_member = self._bulk_load_targets(user_ids, team_ids)
+        counts_by_member = self._completion_counts_by_members(
+            user_ids, team_ids, start_date, actual_end_date
+        )
         
-        for team in teams:
-            team_data = self.calculate_team_productivity(
-                team_id=int(team.id),  # type: ignore
+        all_scores = [
+            self._employee_team_productivity(
+                user=users_by_id[user_id],
+                team=teams_by_id[tid],
                 start_date=start_date,
-                end_date=end_date
+                end_date=actual_end_date,
+                targets=targets_by_member.get((user_id, tid), []),
+                counts=counts_by_member.get((user_id, tid), NO_COMPLETIONS)
             )
-            
-            if "employees" in team_data:
-                for emp in team_data["employees"]:
-                    if emp["userId"] not in seen_user_ids:
-                        all_scores.append(emp)
-                        seen_user_ids.add(emp["userId"])
+            for user_id, tid in top_rows
+        ]
         
         # Sort by total score descending
         all_scores.sort(key=lambda x: x["scores"]["totalScore"], reverse=True)
         
-        return all_scores[:limit]
+        return all_scores
+    
+    def _rank_leaderboard_members(
+        self,
+        org_id: Optional[int],
+        team_id: Optional[int],
+        start_date: date,
+        end_date: date
+    ):
+        """
+        Build a subquery of (user_id, team_id, total_score) for active employee
+        memberships of active teams, one row per employee.
+        Scores sum the per-order credit of that team's orders only: whole weeks
+        from employee_weekly_scores, the partial edge weeks from orders.
+        """
+        credits = self._score_credits(start_date, end_date)
+        score = func.coalesce(func.sum(credits.c.score), 0)
+        
+        query = self.db.query(
+            UserTeam.user_id.label("user_id"),
+            UserTeam.team_id.label("team_id"),
+            score.label("total_score")
+        ).join(
+            User, User.id == UserTeam.user_id
+        ).join(
+            Team, Team.id == UserTeam.team_id
+        ).outerjoin(
+            credits, and_(
+                credits.c.user_id == UserTeam.user_id,
+                credits.c.team_id == UserTeam.team_id
+            )
+        ).filter(
+            Team.is_active == True,
+            UserTeam.is_active == True,
+            User.user_role == 'employee'
+        )
+        
+        if org_id:
+            query = query.filter(Team.org_id == org_id)
+        if team_id:
+            query = query.filter(Team.id == team_id)
+        
+        # One row per employee: keep the membership with the lowest team id
+        per_member = query.group_by(UserTeam.user_id, UserTeam.team_id).subquery()
+        
+        return self.db.query(per_member).distinct(per_member.c.user_id).order_by(
+            per_member.c.user_id, per_member.c.team_id
+        ).subquery()
+    
+    def _score_credits(self, start_date: date, end_date: date):
+        """
+        Build a subquery of (user_id, team_id, score) credit rows for a date range.
+        Whole weeks come from employee_weekly_scores, the partial edge weeks from
+        the per-order credit columns (precomputed with the team multipliers on write).
+        """
+        full_weeks, edges = split_full_weeks(start_date, end_date)
+        arms = []
+        
+        if full_weeks:
+            arms.append(select(
+                EmployeeWeeklyScore.user_id.label("user_id"),
+                EmployeeWeeklyScore.team_id.label("team_id"),
+                EmployeeWeeklyScore.total_score.label("score")
+            ).where(
+                EmployeeWeeklyScore.week_start_date >= full_weeks[0],
+                EmployeeWeeklyScore.week_start_date <= full_weeks[1]
+            ))
+        
+        if edges:
+            in_edges = (
+                Order.not_deleted(),
+                or_(*(Order.entry_date.between(edge_start, edge_end) for edge_start, edge_end in edges))
+            )
+            arms.append(select(
+                Order.step1_user_id.label("user_id"),
+                Order.team_id.label("team_id"),
+                Order.step1_score_value.label("score")
+            ).where(Order.step1_user_id != None, *in_edges))
+            arms.append(select(
+                Order.step2_user_id.label("user_id"),
+                Order.team_id.label("team_id"),
+                Order.step2_score_value.label("score")
+            ).where(Order.step2_user_id != None, *in_edges))
+        
+        if not arms:
+            # Empty range: no credit rows
+            return select(
+                literal(None, Integer).label("user_id"),
+                literal(None, Integer).label("team_id"),
+                literal(0).label("score")
+            ).where(false()).subquery("credits")
+        if len(arms) == 1:
+            return arms[0].subquery("credits")
+        return union_all(*arms).subquery("credits")
@@ -2,11 +2,10 @@
 Quality Audit Service
 Business logic for quality audit operations and calculations
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
+from sqlalchemy.orm import Session, selectinload, raiseload
+from sqlalchemy import func, or_, extract, select, union_all, update
 from typing import Optional, List
 from datetime import date, datetime
-from decimal import Decimal
 
 from app.models.quality_audit import QualityAudit
 from app.models.user import User
@@ -19,13 +18,24 @@ from app.schemas.quality_audit import (
 )
 
 
+# Bound lookup of OFE by process type (unknown process types give 0)
+_OFE_GET = PROCESS_TYPE_OFE.get
+
+
+def _period_filter(bound, condition):
+    """Filter for one side of an audit period; a period column that is NULL leaves that side open"""
+    if isinstance(bound, date):
+        return condition
+    return or_(bound.is_(None), condition)
+
+
 class QualityAuditService:
     """Service for quality audit business logic"""
     
     @staticmethod
     def calculate_ofe(process_type: str) -> int:
         """Calculate OFE based on process type"""
-        return PROCESS_TYPE_OFE.get(process_type, 0)
+        return _OFE_GET(process_type, 0)
     
     @staticmethod
     def get_total_files_reviewed(
@@ -39,67 +49,41 @@ class QualityAuditService:
         Get total number of files reviewed by examiner in the period.
         Counts completed orders where the user was step1_user or step2_user.
         """
-        query = db.query(func.count(Order.id)).filter(
-            Order.team_id == team_id,
-            Order.deleted_at.is_(None),
-            and_(
-                (Order.step1_user_id == examiner_id) | (Order.step2_user_id == examiner_id)
-            )
-        )
-        
-        # Add date filters if provided (using entry_date since completed_date is removed)
-        if start_date:
-            query = query.filter(Order.entry_date >= start_date)
-        if end_date:
-            query = query.filter(Order.entry_date <= end_date)
-        
-        total = query.scalar()
+        total = db.scalar(QualityAuditService._files_reviewed_count(
+            examiner_id, team_id, start_date, end_date
+        ))
         return total or 0
     
     @staticmethod
-    def calculate_quality_metrics(
-        total_files_reviewed: int,
-        ofe: int,
-        files_with_error: int,
-        total_errors: int,
-        files_with_cce_error: int
-    ) -> tuple[int, Decimal, Decimal, Decimal]:
+    def _files_reviewed_count(examiner_id, team_id, start_date=None, end_date=None):
         """
-        Calculate quality metrics.
-        
-        Returns:
-            tuple: (ofe_count, fb_quality, ofe_quality, cce_quality)
+        Build the files reviewed count statement.
+        Arguments may be values or QualityAudit columns, so the count can also run
+        as a correlated subquery of an UPDATE of the audit.
         """
-        # Calculate OFE Count
-        ofe_count = total_files_reviewed * ofe
+        in_period = [Order.team_id == team_id, Order.not_deleted()]
         
-        # Calculate FB Quality: 1 - (files_with_error / total_files_reviewed)
-        if total_files_reviewed > 0:
-            fb_quality = Decimal(1) - (Decimal(files_with_error) / Decimal(total_files_reviewed))
-        else:
-            # If no files reviewed, quality should be 0 if there are errors, otherwise 0
-            fb_quality = Decimal(0)
-        
-        # Calculate OFE Quality: 1 - (total_errors / ofe_count)
-        if ofe_count > 0:
-            ofe_quality = Decimal(1) - (Decimal(total_errors) / Decimal(ofe_count))
-        else:
-            # If no OFE count, quality should be 0 if there are errors, otherwise 0
-            ofe_quality = Decimal(0)
-        
-        # Calculate CCE Quality: 1 - (files_with_cce_error / total_files_reviewed)
-        if total_files_reviewed > 0:
-            cce_quality = Decimal(1) - (Decimal(files_with_cce_error) / Decimal(total_files_reviewed))
-        else:
-            # If no files reviewed, quality should be 0 if there are errors, otherwise 0
-            cce_quality = Decimal(0)
-        
-        # Ensure values are between 0 and 1
-        fb_quality = max(Decimal(0), min(Decimal(1), fb_quality))
-        ofe_quality = max(Decimal(0), min(Decimal(1), ofe_quality))
-        cce_quality = max(Decimal(0), min(Decimal(1), cce_quality))
-        
-        return ofe_count, fb_quality, ofe_quality, cce_quality
+        # Add date filters if provided (using entry_date since completed_date is removed)
+        if start_date is not None:
+            in_period.append(_period_filter(start_date, Order.entry_date >= start_date))
+        if end_date is not None:
+            in_period.append(_period_filter(end_date, Order.entry_date <= end_date))
+        
+        # UNION ALL of a step 1 arm and a step 2 arm instead of an OR over both
+        # step user columns, so each arm can use its own partial index; single seat
+        # orders are counted once, on the step 1 side. Audit columns stay correlated
+        # to the enclosing UPDATE instead of joining quality_audits into each arm
+        step1_orders = select(Order.id).where(
+            Order.step1_user_id == examiner_id, *in_period
+        ).correlate(QualityAudit)
+        step2_orders = select(Order.id).where(
+            Order.step2_user_id == examiner_id,
+            Order.step1_user_id.is_distinct_from(examiner_id),
+            *in_period
+        ).correlate(QualityAudit)
+        reviewed = union_all(step1_orders, step2_orders).subquery()
+        
+        return select(func.count()).select_from(reviewed)
     
     @staticmethod
     def create_quality_audit(
@@ -111,12 +95,12 @@ class QualityAuditService:
         Create a new quality audit record with calculated fields
         """
         # Get examiner's org_id
-        examiner = db.query(User).filter(User.id == audit_data.examiner_id).first()
+        examiner = db.query(User.org_id).filter(User.id == audit_data.examiner_id).first()
         if not examiner:
             raise ValueError("Examiner not found")
         
         # Calculate OFE
-        ofe = QualityAuditService.calculate_ofe(audit_data.process_type)
+        ofe = _OFE_GET(audit_data.process_type, 0)
         
         # Get total files reviewed - use manual entry if provided, otherwise fetch from DB
         if audit_data.total_files_reviewed is not None:
@@ -130,16 +114,7 @@ class QualityAuditService:
                 end_date=audit_data.audit_period_end
             )
         
-        # Calculate quality metrics
-        ofe_count, fb_quality, ofe_quality, cce_quality = QualityAuditService.calculate_quality_metrics(
-            total_files_reviewed=total_files_reviewed,
-            ofe=ofe,
-            files_with_error=audit_data.files_with_error,
-            total_errors=audit_data.total_errors,
-            files_with_cce_error=audit_data.files_with_cce_error
-        )
-        
-        # Create audit record
+        # Create audit record (OFE count and quality percentages are generated by the database)
         audit = QualityAudit(
             examiner_id=audit_data.examiner_id,
             team_id=audit_data.team_id,
@@ -150,19 +125,16 @@ class QualityAuditService:
             total_errors=audit_data.total_errors,
             files_with_cce_error=audit_data.files_with_cce_error,
             total_files_reviewed=total_files_reviewed,
-            ofe_count=ofe_count,
-            fb_quality=fb_quality,
-            ofe_quality=ofe_quality,
-            cce_quality=cce_quality,
             audit_date=audit_data.audit_date,
             audit_period_start=audit_data.audit_period_start,
             audit_period_end=audit_data.audit_period_end,
             created_by=current_user_id
         )
         
+        # No refresh: every column was set here, and the commit expires the
+        # instance so its first read reloads it once
         db.add(audit)
         db.commit()
-        db.refresh(audit)
         
         return audit
     
@@ -175,65 +147,45 @@ class QualityAuditService:
     ) -> QualityAudit:
         """
         Update an existing quality audit record and recalculate metrics
+        A single UPDATE ... RETURNING; OFE count and quality percentages are
+        regenerated by the database
         """
-        audit = db.query(QualityAudit).filter(
-            QualityAudit.id == audit_id,
-            QualityAudit.deleted_at.is_(None)
-        ).first()
-        
-        if not audit:
-            raise ValueError("Quality audit not found")
+        values = {"modified_by": current_user_id}
         
         # Update fields if provided
         if audit_data.process_type is not None:
-            audit.process_type = audit_data.process_type
-            audit.ofe = QualityAuditService.calculate_ofe(audit_data.process_type)
-        
-        if audit_data.files_with_error is not None:
-            audit.files_with_error = audit_data.files_with_error
-        
-        if audit_data.total_errors is not None:
-            audit.total_errors = audit_data.total_errors
-        
-        if audit_data.files_with_cce_error is not None:
-            audit.files_with_cce_error = audit_data.files_with_cce_error
-        
-        if audit_data.audit_date is not None:
-            audit.audit_date = audit_data.audit_date
-        
-        if audit_data.audit_period_start is not None:
-            audit.audit_period_start = audit_data.audit_period_start
-        
-        if audit_data.audit_period_end is not None:
-            audit.audit_period_end = audit_data.audit_period_end
-        
-        # Recalculate total files reviewed if period changed
+            values["process_type"] = audit_data.process_type
+            values["ofe"] = _OFE_GET(audit_data.process_type, 0)
+        
+        for field in (
+            "files_with_error", "total_errors", "files_with_cce_error",
+            "audit_date", "audit_period_start", "audit_period_end"
+        ):
+            value = getattr(audit_data, field)
+            if value is not None:
+                values[field] = value
+        
+        # Recalculate total files reviewed if period changed, as a subquery
+        # correlated to the audit row (unchanged period sides keep their stored value)
         if audit_data.audit_period_start is not None or audit_data.audit_period_end is not None:
-            audit.total_files_reviewed = QualityAuditService.get_total_files_reviewed(
-                db=db,
-                examiner_id=audit.examiner_id,
-                team_id=audit.team_id,
-                start_date=audit.audit_period_start,
-                end_date=audit.audit_period_end
-            )
-        
-        # Recalculate quality metrics
-        ofe_count, fb_quality, ofe_quality, cce_quality = QualityAuditService.calculate_quality_metrics(
-            total_files_reviewed=audit.total_files_reviewed,
-            ofe=audit.ofe,
-            files_with_error=audit.files_with_error,
-            total_errors=audit.total_errors,
-            files_with_cce_error=audit.files_with_cce_error
-        )
+            values["total_files_reviewed"] = QualityAuditService._files_reviewed_count(
+                examiner_id=QualityAudit.examiner_id,
+                team_id=QualityAudit.team_id,
+                start_date=values.get("audit_period_start", QualityAudit.audit_period_start),
+                end_date=values.get("audit_period_end", QualityAudit.audit_period_end)
+            ).scalar_subquery()
+        
+        audit = db.execute(
+            update(QualityAudit)
+            .where(QualityAudit.id == audit_id, QualityAudit.deleted_at.is_(None))
+            .values(**values)
+            .returning(QualityAudit)
+        ).scalar_one_or_none()
         
-        audit.ofe_count = ofe_count
-        audit.fb_quality = fb_quality
-        audit.ofe_quality = ofe_quality
-        audit.cce_quality = cce_quality
-        audit.modified_by = current_user_id
+        if not audit:
+            raise ValueError("Quality audit not found")
         
         db.commit()
-        db.refresh(audit)
         
         return audit
     
@@ -257,7 +209,11 @@ class QualityAuditService:
         skip: int = 0,
         limit: int = 100
     ):
-        """List quality audits with filters"""
+        """
+        List quality audits with filters
+        Examiner and team are loaded in one batch each; other relationships raise
+        instead of lazy loading per row
+        """
         query = db.query(QualityAudit).filter(QualityAudit.deleted_at.is_(None))
         
         if org_id is not None:
@@ -277,8 +233,22 @@ class QualityAuditService:
         if end_date is not None:
             query = query.filter(QualityAudit.audit_date <= end_date)
         
-        total = query.count()
-        items = query.order_by(QualityAudit.audit_date.desc()).offset(skip).limit(limit).all()
+        # Total comes from a window count over the filtered rows, so the page
+        # and the total share one scan
+        rows = query.add_columns(func.count().over().label("total")).options(
+            selectinload(QualityAudit.examiner),
+            selectinload(QualityAudit.team),
+            raiseload('*')
+        ).order_by(QualityAudit.audit_date.desc()).offset(skip).limit(limit).all()
+        
+        items = [audit for audit, _ in rows]
+        if rows:
+            total = rows[0].total
+        elif skip > 0:
+            # Page past the end returns no rows to carry the total
+            total = query.count()
+        else:
+            total = 0
         
         return items, total
     
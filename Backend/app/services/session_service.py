@@ -2,16 +2,26 @@
 Redis-based Session and Token Management Service
 Provides token blacklisting, active session tracking, rate limiting, and refresh token rotation
 """
-import json
+import orjson
 import redis
+import time
 import uuid
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import logging
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Increment a counter and start its expiry window on the first hit, atomically
+INCR_WITH_WINDOW_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
 
 class SessionService:
     """Redis-based session and token management service"""
@@ -19,6 +29,8 @@ class SessionService:
     # Cache key prefixes for session management
     PREFIX_BLACKLIST = "token:blacklist"
     PREFIX_SESSION = "session"
+    PREFIX_SESSION_INDEX = "session:index"
+    PREFIX_SESSION_ACTIVITY = "session:la"
     PREFIX_REFRESH_USED = "refresh:used"
     PREFIX_RATE_LIMIT = "rate:limit"
     PREFIX_LOGIN_ATTEMPTS = "login:attempts"
@@ -33,8 +45,20 @@ class SessionService:
     MAX_REQUESTS_PER_MINUTE = 60
     MAX_LOGIN_ATTEMPTS = 5
     
+    # Seconds a connection health check result is reused
+    PING_INTERVAL = 1.0
+    
+    # In-process blacklist lookups: a blacklisted token stays blacklisted, so hits
+    # are kept for the access token lifetime; misses are rechecked after a second
+    BLACKLIST_MISS_TTL = 1.0
+    BLACKLIST_CACHE_MAXSIZE = 10_000
+    
     _instance: Optional['SessionService'] = None
     _redis_client: Optional[redis.Redis] = None
+    _incr_with_window = None
+    _last_ping: float = 0.0
+    _last_ping_ok: bool = False
+    _blacklist_cache: Dict[str, Tuple[float, bool]] = {}
     
     def __new__(cls):
         if cls._instance is None:
@@ -57,6 +81,7 @@ class SessionService:
             )
             # Test connection
             self._redis_client.ping()
+            self._incr_with_window = self._redis_client.register_script(INCR_WITH_WINDOW_SCRIPT)
             logger.info("Redis session service connection established successfully")
         except redis.ConnectionError as e:
             logger.error(f"Failed to connect to Redis: {e}. Session management disabled.")
@@ -67,20 +92,37 @@ class SessionService:
     
     @property
     def is_connected(self) -> bool:
-        """Check if Redis is connected"""
+        """
+        Check if Redis is connected
+        The PING result is reused for PING_INTERVAL seconds; failures in between
+        are handled by each operation's own error handling
+        """
         if self._redis_client is None:
             return False
+        now = time.monotonic()
+        if now - self._last_ping < self.PING_INTERVAL:
+            return self._last_ping_ok
         try:
             self._redis_client.ping()
-            return True
+            self._last_ping_ok = True
         except:
-            return False
+            self._last_ping_ok = False
+        self._last_ping = now
+        return self._last_ping_ok
     
     def _build_key(self, prefix: str, *args) -> str:
-        """Build a cache key from prefix and arguments"""
+        """
+        Build a cache key from prefix and arguments
+        Per-request paths (blacklist check, session activity) format their keys
+        inline with f-strings instead
+        """
         parts = [prefix] + [str(arg) for arg in args if arg is not None]
         return ":".join(parts)
     
+    def _increment(self, key: str, window: int) -> int:
+        """Increment a windowed counter in one round trip (no GET/SETEX/INCR race)"""
+        return int(self._incr_with_window(keys=[key], args=[window]))
+    
     # ============ Token Blacklist Management ============
     
     def blacklist_token(self, jti: str, ttl: Optional[int] = None) -> bool:
@@ -102,12 +144,26 @@ class SessionService:
             key = self._build_key(self.PREFIX_BLACKLIST, jti)
             ttl = ttl or self.TTL_ACCESS_TOKEN
             self._redis_client.setex(key, ttl, "revoked")
+            self._cache_blacklist(jti, True)
             logger.info(f"Token {jti} blacklisted successfully")
             return True
         except Exception as e:
             logger.error(f"Error blacklisting token {jti}: {e}")
             return False
     
+    def _queue_blacklist(self, pipe, jti: Optional[str]) -> None:
+        """Queue a token blacklist write on a pipeline (no-op without a JTI)"""
+        if jti:
+            pipe.setex(self._build_key(self.PREFIX_BLACKLIST, jti), self.TTL_ACCESS_TOKEN, "revoked")
+            self._cache_blacklist(jti, True)
+    
+    def _cache_blacklist(self, jti: str, blacklisted: bool) -> None:
+        """Remember a blacklist lookup result in-process"""
+        if len(self._blacklist_cache) >= self.BLACKLIST_CACHE_MAXSIZE:
+            self._blacklist_cache.clear()
+        ttl = self.TTL_ACCESS_TOKEN if blacklisted else self.BLACKLIST_MISS_TTL
+        self._blacklist_cache[jti] = (time.monotonic() + ttl, blacklisted)
+    
     def is_token_blacklisted(self, jti: str) -> bool:
         """
         Check if a token is blacklisted
@@ -118,18 +174,68 @@ class SessionService:
         Returns:
             True if token is blacklisted, False otherwise
         """
+        entry = self._blacklist_cache.get(jti)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
         if not self.is_connected:
             return False
         
         try:
-            key = self._build_key(self.PREFIX_BLACKLIST, jti)
-            return self._redis_client.exists(key) > 0
+            key = f"{self.PREFIX_BLACKLIST}:{jti}"
+            blacklisted = self._redis_client.exists(key) > 0
+            self._cache_blacklist(jti, blacklisted)
+            return blacklisted
         except Exception as e:
             logger.error(f"Error checking token blacklist for {jti}: {e}")
             return False
     
     # ============ Active Session Management ============
     
+    def _index_session(self, pipe, user_id: int, session_id: str) -> None:
+        """
+        Queue the per-user session index update on a pipeline
+        The index is a sorted set of session IDs scored by expiry timestamp, so
+        listing never scans the keyspace and expired entries can be trimmed by score
+        """
+        index_key = f"{self.PREFIX_SESSION_INDEX}:{user_id}"
+        pipe.zadd(index_key, {session_id: time.time() + self.TTL_ACCESS_TOKEN})
+        pipe.expire(index_key, self.TTL_ACCESS_TOKEN)
+    
+    def _get_session_ids(self, user_id: int) -> List[str]:
+        """
+        Get the IDs of a user's unexpired sessions from the session index,
+        trimming expired entries first
+        Falls back to a keyspace SCAN when the user has no index yet
+        """
+        index_key = self._build_key(self.PREFIX_SESSION_INDEX, user_id)
+        pipe = self._redis_client.pipeline(transaction=False)
+        pipe.zremrangebyscore(index_key, "-inf", time.time())
+        pipe.zrange(index_key, 0, -1)
+        pipe.exists(index_key)
+        _, session_ids, indexed = pipe.execute()
+        if not indexed:
+            session_ids = self._index_unindexed_sessions(user_id)
+        return session_ids
+    
+    def _index_unindexed_sessions(self, user_id: int) -> List[str]:
+        """
+        Find a user's sessions that are missing from the session index (created
+        before the index existed) with an incremental SCAN, and add them to the
+        index so later lookups read the sorted set only
+        """
+        pattern = self._build_key(self.PREFIX_SESSION, user_id, "*")
+        session_ids = [
+            key.rsplit(":", 1)[1]
+            for key in self._redis_client.scan_iter(match=pattern, count=1000)
+        ]
+        if session_ids:
+            pipe = self._redis_client.pipeline(transaction=False)
+            for session_id in session_ids:
+                self._index_session(pipe, user_id, session_id)
+            pipe.execute()
+        return session_ids
+    
     def create_session(
         self,
         user_id: int,
@@ -170,8 +276,11 @@ class SessionService:
                 "last_activity": datetime.utcnow().isoformat()
             }
             
-            serialized = json.dumps(session_data, default=str)
-            self._redis_client.setex(key, self.TTL_ACCESS_TOKEN, serialized)
+            serialized = orjson.dumps(session_data, default=str)
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.setex(key, self.TTL_ACCESS_TOKEN, serialized)
+            self._index_session(pipe, user_id, session_id)
+            pipe.execute()
             logger.info(f"Session {session_id} created for user {user_id}")
             return session_id
         except Exception as e:
@@ -193,18 +302,29 @@ class SessionService:
             return None
         
         try:
-            key = self._build_key(self.PREFIX_SESSION, user_id, session_id)
-            data = self._redis_client.get(key)
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.get(self._build_key(self.PREFIX_SESSION, user_id, session_id))
+            pipe.get(self._build_key(self.PREFIX_SESSION_ACTIVITY, user_id, session_id))
+            data, last_activity = pipe.execute()
             if data:
-                return json.loads(data)
+                return self._decode_session(data, last_activity)
             return None
         except Exception as e:
             logger.error(f"Error getting session {session_id} for user {user_id}: {e}")
             return None
     
+    def _decode_session(self, data: str, last_activity: Optional[str]) -> Dict[str, Any]:
+        """Deserialize a session blob, overlaying the separately stored last activity"""
+        session = orjson.loads(data)
+        if last_activity:
+            session["last_activity"] = last_activity
+        return session
+    
     def update_session_activity(self, user_id: int, session_id: str) -> bool:
         """
         Update session last activity timestamp and extend TTL
+        The session blob is left as created: its TTL is extended and the timestamp
+        goes to a small side key, all in one round trip without JSON work
         
         Args:
             user_id: User ID
@@ -217,14 +337,14 @@ class SessionService:
             return False
         
         try:
-            session = self.get_session(user_id, session_id)
-            if session:
-                session["last_activity"] = datetime.utcnow().isoformat()
-                key = self._build_key(self.PREFIX_SESSION, user_id, session_id)
-                serialized = json.dumps(session, default=str)
-                self._redis_client.setex(key, self.TTL_ACCESS_TOKEN, serialized)
-                return True
-            return False
+            key = f"{self.PREFIX_SESSION}:{user_id}:{session_id}"
+            activity_key = f"{self.PREFIX_SESSION_ACTIVITY}:{user_id}:{session_id}"
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.expire(key, self.TTL_ACCESS_TOKEN)
+            pipe.setex(activity_key, self.TTL_ACCESS_TOKEN, datetime.utcnow().isoformat())
+            self._index_session(pipe, user_id, session_id)
+            # Index entries of a missing session are trimmed on the next listing
+            return bool(pipe.execute()[0])
         except Exception as e:
             logger.error(f"Error updating session activity {session_id}: {e}")
             return False
@@ -243,18 +363,7 @@ class SessionService:
             return []
         
         try:
-            pattern = self._build_key(self.PREFIX_SESSION, user_id, "*")
-            keys = self._redis_client.keys(pattern)
-            sessions = []
-            
-            for key in keys:
-                data = self._redis_client.get(key)
-                if data:
-                    session = json.loads(data)
-                    # Add TTL information
-                    ttl = self._redis_client.ttl(key)
-                    session["expires_in_seconds"] = ttl
-                    sessions.append(session)
+            sessions = self._load_sessions(user_id, self._get_session_ids(user_id))
             
             # Sort by creation time (newest first)
             sessions.sort(key=lambda x: x.get("created_at", ""), reverse=True)
@@ -263,6 +372,48 @@ class SessionService:
             logger.error(f"Error getting sessions for user {user_id}: {e}")
             return []
     
+    def _load_sessions(self, user_id: int, session_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Load session data, last activity and remaining TTL for a user's sessions
+        in one round trip (GET, GET and TTL per session, pipelined)
+        
+        Args:
+            user_id: User ID
+            session_ids: Session IDs from the session index
+        
+        Returns:
+            List of session data dictionaries (index entries whose session key is
+            gone are skipped and removed from the index)
+        """
+        if not session_ids:
+            return []
+        
+        pipe = self._redis_client.pipeline(transaction=False)
+        for session_id in session_ids:
+            key = self._build_key(self.PREFIX_SESSION, user_id, session_id)
+            pipe.get(key)
+            pipe.get(self._build_key(self.PREFIX_SESSION_ACTIVITY, user_id, session_id))
+            pipe.ttl(key)
+        results = pipe.execute()
+        
+        sessions = []
+        stale_ids = []
+        for session_id, data, last_activity, ttl in zip(
+            session_ids, results[0::3], results[1::3], results[2::3]
+        ):
+            if data:
+                session = self._decode_session(data, last_activity)
+                # Add TTL information
+                session["expires_in_seconds"] = ttl
+                sessions.append(session)
+            else:
+                stale_ids.append(session_id)
+        
+        if stale_ids:
+            index_key = self._build_key(self.PREFIX_SESSION_INDEX, user_id)
+            self._redis_client.zrem(index_key, *stale_ids)
+        return sessions
+    
     def revoke_session(self, user_id: int, session_id: str) -> bool:
         """
         Revoke a specific session (logout from specific device)
@@ -279,16 +430,18 @@ class SessionService:
         
         try:
             # Get session to extract JTI
-            session = self.get_session(user_id, session_id)
-            if session:
-                jti = session.get("jti")
-                if jti:
-                    # Blacklist the token
-                    self.blacklist_token(jti)
-            
-            # Delete the session
             key = self._build_key(self.PREFIX_SESSION, user_id, session_id)
-            self._redis_client.delete(key)
+            data = self._redis_client.get(key)
+            
+            # Blacklist the token, delete the session and drop it from the
+            # session index in one round trip
+            index_key = self._build_key(self.PREFIX_SESSION_INDEX, user_id)
+            pipe = self._redis_client.pipeline(transaction=False)
+            if data:
+                self._queue_blacklist(pipe, orjson.loads(data).get("jti"))
+            pipe.delete(key, self._build_key(self.PREFIX_SESSION_ACTIVITY, user_id, session_id))
+            pipe.zrem(index_key, session_id)
+            pipe.execute()
             logger.info(f"Session {session_id} revoked for user {user_id}")
             return True
         except Exception as e:
@@ -309,21 +462,21 @@ class SessionService:
             return 0
         
         try:
-            sessions = self.get_user_sessions(user_id)
-            count = 0
+            session_ids = self._get_session_ids(user_id)
+            sessions = self._load_sessions(user_id, session_ids)
+            count = len(sessions)
             
-            # Blacklist all tokens
+            # Blacklist all tokens and delete all session keys and the index in one round trip
+            pipe = self._redis_client.pipeline(transaction=False)
             for session in sessions:
-                jti = session.get("jti")
-                if jti:
-                    self.blacklist_token(jti)
-                count += 1
-            
-            # Delete all session keys
-            pattern = self._build_key(self.PREFIX_SESSION, user_id, "*")
-            keys = self._redis_client.keys(pattern)
-            if keys:
-                self._redis_client.delete(*keys)
+                self._queue_blacklist(pipe, session.get("jti"))
+            keys = [
+                self._build_key(prefix, user_id, session_id)
+                for session_id in session_ids
+                for prefix in (self.PREFIX_SESSION, self.PREFIX_SESSION_ACTIVITY)
+            ]
+            pipe.delete(self._build_key(self.PREFIX_SESSION_INDEX, user_id), *keys)
+            pipe.execute()
             
             logger.info(f"All {count} sessions revoked for user {user_id}")
             return count
@@ -375,6 +528,49 @@ class SessionService:
             logger.error(f"Error checking refresh token usage {jti}: {e}")
             return False
     
+    def clear_refresh_token_used(self, jti: str) -> bool:
+        """
+        Remove a refresh token's used marker (after a refresh failed server-side,
+        so the client can retry with the same token)
+        
+        Args:
+            jti: Refresh token unique identifier
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_connected:
+            return False
+        
+        try:
+            key = self._build_key(self.PREFIX_REFRESH_USED, jti)
+            self._redis_client.delete(key)
+            return True
+        except Exception as e:
+            logger.error(f"Error clearing refresh token usage {jti}: {e}")
+            return False
+    
+    def check_and_mark_refresh_used(self, jti: str) -> bool:
+        """
+        Mark a refresh token as used and report whether it already was, atomically
+        (SET NX in one round trip, so two concurrent refreshes cannot both pass)
+        
+        Args:
+            jti: Refresh token unique identifier
+        
+        Returns:
+            True if token was already used (reject the refresh), False otherwise
+        """
+        if not self.is_connected:
+            return False
+        
+        try:
+            key = self._build_key(self.PREFIX_REFRESH_USED, jti)
+            return not self._redis_client.set(key, "used", ex=self.TTL_REFRESH_TOKEN, nx=True)
+        except Exception as e:
+            logger.error(f"Error checking and marking refresh token {jti}: {e}")
+            return False
+    
     # ============ Rate Limiting ============
     
     def check_rate_limit(self, identifier: str, max_requests: Optional[int] = None, window: Optional[int] = None) -> bool:
@@ -397,20 +593,11 @@ class SessionService:
             window = window or self.TTL_RATE_LIMIT
             
             key = self._build_key(self.PREFIX_RATE_LIMIT, identifier)
-            current = self._redis_client.get(key)
-            
-            if current is None:
-                # First request in window
-                self._redis_client.setex(key, window, 1)
-                return True
+            count = self._increment(key, window)
             
-            count = int(current)
-            if count >= max_requests:
+            if count > max_requests:
                 logger.warning(f"Rate limit exceeded for {identifier}")
                 return False
-            
-            # Increment counter
-            self._redis_client.incr(key)
             return True
         except Exception as e:
             logger.error(f"Error checking rate limit for {identifier}: {e}")
@@ -433,12 +620,7 @@ class SessionService:
         try:
             window = window or self.TTL_RATE_LIMIT
             key = self._build_key(self.PREFIX_RATE_LIMIT, identifier)
-            
-            if not self._redis_client.exists(key):
-                self._redis_client.setex(key, window, 1)
-                return 1
-            
-            return self._redis_client.incr(key)
+            return self._increment(key, window)
         except Exception as e:
             logger.error(f"Error incrementing rate limit for {identifier}: {e}")
             return 0
@@ -468,12 +650,7 @@ class SessionService:
                 return 0
             
             # Increment failed attempts
-            if not self._redis_client.exists(key):
-                self._redis_client.setex(key, self.TTL_LOGIN_ATTEMPTS, 1)
-                return 1
-            
-            count = self._redis_client.incr(key)
-            return count
+            return self._increment(key, self.TTL_LOGIN_ATTEMPTS)
         except Exception as e:
             logger.error(f"Error recording login attempt for {identifier}: {e}")
             return 0
@@ -0,0 +1,84 @@
+"""
+Team Stats Service
+Keeps the denormalized Team.active_employee_count in step with membership writes
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, update, func, select
+from typing import Dict, Optional
+from app.models.team import Team
+from app.models.user_team import UserTeam
+
+
+def _membership_team(membership: UserTeam, previous: bool = False) -> Optional[int]:
+    """Get the team an active membership counts towards, or None if inactive"""
+    team_id = membership.team_id
+    is_active = membership.is_active
+    if previous:
+        attrs = inspect(membership).attrs
+        if attrs.team_id.history.deleted:
+            team_id = attrs.team_id.history.deleted[0]
+        if attrs.is_active.history.deleted:
+            is_active = attrs.is_active.history.deleted[0]
+    return team_id if is_active else None
+
+
+def apply_active_count_delta(connection, deltas: Dict[int, int]) -> None:
+    """Add active employee count deltas onto teams (atomic UPDATE per team)"""
+    table = Team.__table__
+    for team_id, delta in deltas.items():
+        if not delta:
+            continue
+        connection.execute(
+            update(table)
+            .where(table.c.id == team_id)
+            .values(
+                active_employee_count=table.c.active_employee_count + delta,
+                # Membership changes are not team edits
+                modified_at=table.c.modified_at
+            )
+        )
+
+
+@event.listens_for(UserTeam, "after_insert")
+def _membership_inserted(mapper, connection, membership: UserTeam) -> None:
+    team_id = _membership_team(membership)
+    if team_id is not None:
+        apply_active_count_delta(connection, {team_id: 1})
+
+
+@event.listens_for(UserTeam, "after_update")
+def _membership_updated(mapper, connection, membership: UserTeam) -> None:
+    old_team_id = _membership_team(membership, previous=True)
+    new_team_id = _membership_team(membership)
+    if old_team_id == new_team_id:
+        return
+    deltas: Dict[int, int] = {}
+    if old_team_id is not None:
+        deltas[old_team_id] = deltas.get(old_team_id, 0) - 1
+    if new_team_id is not None:
+        deltas[new_team_id] = deltas.get(new_team_id, 0) + 1
+    apply_active_count_delta(connection, deltas)
+
+
+@event.listens_for(UserTeam, "after_delete")
+def _membership_deleted(mapper, connection, membership: UserTeam) -> None:
+    team_id = _membership_team(membership, previous=True)
+    if team_id is not None:
+        apply_active_count_delta(connection, {team_id: -1})
+
+
+def rebuild_active_employee_counts(db: Session) -> None:
+    """
+    Recompute Team.active_employee_count for all teams from user_teams
+    Used to backfill the column and to reconcile it with memberships
+    """
+    active_count = select(func.count(UserTeam.id)).where(
+        UserTeam.team_id == Team.id,
+        UserTeam.is_active == True
+    ).scalar_subquery()
+    db.execute(
+        update(Team)
+        .values(active_employee_count=active_count, modified_at=Team.modified_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
@@ -0,0 +1,254 @@
+"""
+Weekly Score Service
+Keeps the employee_weekly_scores summary table in step with order and team writes
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select, update, insert, func, case, literal, union_all, type_coerce, Integer, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Tuple
+from app.models.order import Order
+from app.models.team import Team
+from app.models.metrics import EmployeeWeeklyScore
+from app.services.order_score_service import COMPLETION_SINGLE_SEAT, TEAM_MULTIPLIERS
+
+
+# Order columns that decide what an order contributes to the weekly scores
+WEEKLY_SCORE_FIELDS = (
+    "team_id", "entry_date", "deleted_at",
+    "step1_user_id", "step2_user_id",
+    "step1_score_value", "step2_score_value",
+)
+
+# Counter columns of EmployeeWeeklyScore
+WEEKLY_SCORE_COUNTERS = (
+    "step1_only", "step2_only", "single_seat",
+    "step1_only_score", "step2_only_score", "single_seat_score", "total_score",
+)
+
+# (user_id, team_id, week_start_date)
+WeeklyKey = Tuple[int, int, date]
+
+
+def week_start(day: date) -> date:
+    """Get the Sunday starting the week of a date"""
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+def order_weekly_contributions(state: Dict[str, Any]) -> Dict[WeeklyKey, Dict[str, Any]]:
+    """
+    Get the weekly score counters a single order contributes, keyed by summary row
+    Deleted orders contribute nothing
+    """
+    contributions: Dict[WeeklyKey, Dict[str, Any]] = {}
+    if state["deleted_at"] is not None or state["entry_date"] is None:
+        return contributions
+    
+    def row(user_id: int) -> Dict[str, Any]:
+        key = (user_id, state["team_id"], week_start(state["entry_date"]))
+        if key not in contributions:
+            contributions[key] = dict.fromkeys(WEEKLY_SCORE_COUNTERS, 0)
+        return contributions[key]
+    
+    step1_user_id = state["step1_user_id"]
+    step2_user_id = state["step2_user_id"]
+    
+    # Single seat is credited once, on the step 1 side
+    if step1_user_id is not None and step1_user_id == step2_user_id:
+        counters = row(step1_user_id)
+        credit = state["step1_score_value"] or 0
+        counters["single_seat"] += 1
+        counters["single_seat_score"] += credit
+        counters["total_score"] += credit
+        return contributions
+    
+    if step1_user_id is not None:
+        counters = row(step1_user_id)
+        credit = state["step1_score_value"] or 0
+        counters["step1_only"] += 1
+        counters["step1_only_score"] += credit
+        counters["total_score"] += credit
+    if step2_user_id is not None:
+        counters = row(step2_user_id)
+        credit = state["step2_score_value"] or 0
+        counters["step2_only"] += 1
+        counters["step2_only_score"] += credit
+        counters["total_score"] += credit
+    
+    return contributions
+
+
+def diff_weekly_contributions(
+    old: Dict[WeeklyKey, Dict[str, Any]],
+    new: Dict[WeeklyKey, Dict[str, Any]]
+) -> Dict[WeeklyKey, Dict[str, Any]]:
+    """Get the per-row counter deltas needed to go from old to new contributions"""
+    delta: Dict[WeeklyKey, Dict[str, Any]] = {}
+    for key in old.keys() | new.keys():
+        old_counters = old.get(key, {})
+        new_counters = new.get(key, {})
+        counters = {
+            name: new_counters.get(name, 0) - old_counters.get(name, 0)
+            for name in WEEKLY_SCORE_COUNTERS
+        }
+        if any(counters.values()):
+            delta[key] = counters
+    return delta
+
+
+def apply_weekly_delta(connection, delta: Dict[WeeklyKey, Dict[str, Any]]) -> None:
+    """Add counter deltas onto the weekly score rows, creating missing rows (atomic UPSERT)"""
+    table = EmployeeWeeklyScore.__table__
+    now = datetime.utcnow()
+    for (user_id, team_id, week_start_date), counters in delta.items():
+        stmt = pg_insert(table).values(
+            user_id=user_id,
+            team_id=team_id,
+            week_start_date=week_start_date,
+            modified_at=now,
+            **counters
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "team_id", "week_start_date"],
+            set_={
+                **{name: table.c[name] + stmt.excluded[name] for name in WEEKLY_SCORE_COUNTERS},
+                "modified_at": now,
+            }
+        )
+        connection.execute(stmt)
+
+
+def apply_order_weekly_change(connection, old_state: Dict[str, Any], new_state: Dict[str, Any]) -> None:
+    """
+    Apply the weekly score change between two snapshots of an order's WEEKLY_SCORE_FIELDS
+    For order writes made outside the ORM unit of work, which skip the listeners
+    """
+    apply_weekly_delta(connection, diff_weekly_contributions(
+        order_weekly_contributions(old_state),
+        order_weekly_contributions(new_state)
+    ))
+
+
+def _order_state(order: Order, previous: bool = False) -> Dict[str, Any]:
+    """Snapshot the weekly score fields of an order, optionally as they were before this flush"""
+    state = {field: getattr(order, field) for field in WEEKLY_SCORE_FIELDS}
+    if previous:
+        attrs = inspect(order).attrs
+        for field in WEEKLY_SCORE_FIELDS:
+            history = attrs[field].history
+            if history.deleted:
+                state[field] = history.deleted[0]
+    return state
+
+
+@event.listens_for(Order, "after_insert")
+def _order_inserted(mapper, connection, order: Order) -> None:
+    apply_weekly_delta(connection, order_weekly_contributions(_order_state(order)))
+
+
+@event.listens_for(Order, "after_update")
+def _order_updated(mapper, connection, order: Order) -> None:
+    attrs = inspect(order).attrs
+    if not any(attrs[field].history.has_changes() for field in WEEKLY_SCORE_FIELDS):
+        return
+    apply_order_weekly_change(connection, _order_state(order, previous=True), _order_state(order))
+
+
+@event.listens_for(Order, "after_delete")
+def _order_deleted(mapper, connection, order: Order) -> None:
+    apply_weekly_delta(connection, diff_weekly_contributions(
+        order_weekly_contributions(_order_state(order, previous=True)), {}
+    ))
+
+
+def rescore_team_weekly_scores(connection, team_id: int, multipliers: Dict[str, Any]) -> None:
+    """Re-apply a team's multipliers to the scores of all its weekly rows"""
+    values = {
+        name: (multipliers.get(name) or default)
+        for name, default in TEAM_MULTIPLIERS.items()
+    }
+    table = EmployeeWeeklyScore.__table__
+    step1_only_score = table.c.step1_only * values["step1_score"]
+    step2_only_score = table.c.step2_only * values["step2_score"]
+    single_seat_score = table.c.single_seat * values["single_seat_score"]
+    connection.execute(
+        update(table).where(table.c.team_id == team_id).values(
+            step1_only_score=step1_only_score,
+            step2_only_score=step2_only_score,
+            single_seat_score=single_seat_score,
+            total_score=step1_only_score + step2_only_score + single_seat_score,
+            modified_at=datetime.utcnow()
+        )
+    )
+
+
+@event.listens_for(Team, "after_update")
+def _team_updated(mapper, connection, team: Team) -> None:
+    attrs = inspect(team).attrs
+    if any(attrs[name].history.has_changes() for name in TEAM_MULTIPLIERS):
+        rescore_team_weekly_scores(
+            connection, team.id,
+            {name: getattr(team, name) for name in TEAM_MULTIPLIERS}
+        )
+
+
+def rebuild_employee_weekly_scores(db: Session) -> None:
+    """
+    Recompute all weekly score rows from the orders table
+    Used to backfill the summary table and to reconcile it with orders
+    (run rebuild_order_scores first when the credit columns are stale)
+    """
+    is_single_seat = Order.completion_type == COMPLETION_SINGLE_SEAT
+    # Sunday of the entry_date week (date - integer is a date in PostgreSQL)
+    order_week = type_coerce(
+        Order.entry_date - func.extract('dow', Order.entry_date).cast(Integer), Date
+    )
+    live = (Order.not_deleted(),)
+    
+    step1_arm = select(
+        Order.step1_user_id.label("user_id"),
+        Order.team_id.label("team_id"),
+        order_week.label("week_start_date"),
+        case((is_single_seat, 0), else_=1).label("step1_only"),
+        literal(0).label("step2_only"),
+        case((is_single_seat, 1), else_=0).label("single_seat"),
+        case((is_single_seat, 0), else_=Order.step1_score_value).label("step1_only_score"),
+        literal(0).label("step2_only_score"),
+        case((is_single_seat, Order.step1_score_value), else_=0).label("single_seat_score"),
+        Order.step1_score_value.label("score")
+    ).where(Order.step1_user_id != None, *live)
+    step2_arm = select(
+        Order.step2_user_id.label("user_id"),
+        Order.team_id.label("team_id"),
+        order_week.label("week_start_date"),
+        literal(0).label("step1_only"),
+        literal(1).label("step2_only"),
+        literal(0).label("single_seat"),
+        literal(0).label("step1_only_score"),
+        Order.step2_score_value.label("step2_only_score"),
+        literal(0).label("single_seat_score"),
+        Order.step2_score_value.label("score")
+    ).where(Order.step2_user_id != None, ~is_single_seat, *live)
+    credits = union_all(step1_arm, step2_arm).subquery("credits")
+    
+    grouped = select(
+        credits.c.user_id,
+        credits.c.team_id,
+        credits.c.week_start_date,
+        func.sum(credits.c.step1_only),
+        func.sum(credits.c.step2_only),
+        func.sum(credits.c.single_seat),
+        func.sum(credits.c.step1_only_score),
+        func.sum(credits.c.step2_only_score),
+        func.sum(credits.c.single_seat_score),
+        func.sum(credits.c.score),
+        literal(datetime.utcnow())
+    ).group_by(credits.c.user_id, credits.c.team_id, credits.c.week_start_date)
+    
+    table = EmployeeWeeklyScore.__table__
+    db.execute(table.delete())
+    db.execute(insert(table).from_select(
+        ["user_id", "team_id", "week_start_date", *WEEKLY_SCORE_COUNTERS, "modified_at"],
+        grouped
+    ))
+    db.commit()
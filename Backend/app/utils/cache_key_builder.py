@@ -3,13 +3,21 @@ Cache Key Builder Utility
 Centralizes cache key generation patterns.
 Eliminates duplicate cache key building logic across services and endpoints.
 """
-from typing import Optional, List
-from app.core.dependencies import ROLE_SUPERADMIN, ROLE_ADMIN, ROLE_TEAM_LEAD
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Sequence, Tuple
+from app.core.dependencies import ROLE_SUPERADMIN, ROLE_ADMIN, ROLE_TEAM_LEAD, ROLE_EMPLOYEE
+
+
+# Distinct argument tuples remembered per memoized key builder
+CACHE_KEY_MEMO_SIZE = 4096
 
 
 class CacheKeyBuilder:
     """Standardized cache key generation"""
     
+    # Application namespace in front of every key (matching cache_service.py)
+    PREFIX_APP = "empperf"
+    
     # Cache key prefixes (matching cache_service.py)
     PREFIX_REFERENCE = "ref"
     PREFIX_DASHBOARD = "dash"
@@ -18,25 +26,7 @@ class CacheKeyBuilder:
     PREFIX_TEAMS = "teams"
     PREFIX_ORGS = "orgs"
     PREFIX_ORDERS = "orders"
-    
-    @staticmethod
-    def build_key(prefix: str, *args: str) -> str:
-        """
-        Build a cache key from prefix and arguments.
-        
-        Args:
-            prefix: Cache prefix (e.g., PREFIX_DASHBOARD)
-            *args: Additional key components (will be converted to strings)
-            
-        Returns:
-            Complete cache key joined with colons
-            
-        Example:
-            key = CacheKeyBuilder.build_key("dash", "admin", "org:5", "month:3")
-            # Returns: "dash:admin:org:5:month:3"
-        """
-        parts = [prefix] + [str(arg) for arg in args if arg is not None]
-        return ":".join(parts)
+    PREFIX_INDEX = "idx"
     
     @staticmethod
     def build_reference_key(
@@ -56,290 +46,490 @@ class CacheKeyBuilder:
         Example:
             key = CacheKeyBuilder.build_reference_key("order_status", is_active=True)
         """
-        active_suffix = f"active:{is_active}" if is_active is not None else "all"
-        return CacheKeyBuilder.build_key(CacheKeyBuilder.PREFIX_REFERENCE, ref_type, active_suffix)
+        return _build_reference_key(ref_type, is_active)
     
     @staticmethod
-    def build_dashboard_key(
-        dashboard_type: str,
-        role: str,
-        org_id: Optional[int] = None,
-        user_id: Optional[int] = None,
-        team_ids: Optional[str] = None,
-        month: Optional[int] = None,
-        year: Optional[int] = None
-    ) -> str:
+    def build_invalidation_pattern_seq(prefix: str, pairs: Sequence[Tuple[str, Any]]) -> str:
         """
-        Build cache key for dashboard data.
+        Build a Redis pattern for cache invalidation from (key, value) pairs.
+        Used with SCAN pattern matching for bulk deletion.
         
         Args:
-            dashboard_type: Type of dashboard (e.g., "admin", "teamlead", "employee")
-            role: User role for cache context
-            org_id: Optional org filter
-            user_id: Optional user filter
-            team_ids: Optional team IDs (comma-separated string)
-            month: Optional month filter
-            year: Optional year filter
+            prefix: Cache prefix to invalidate
+            pairs: Filter (key, value) pairs in key order; None or "*" values match anything
             
         Returns:
-            Cache key
-        """
-        parts = [CacheKeyBuilder.PREFIX_DASHBOARD, dashboard_type, f"role:{role}"]
-        
-        if org_id:
-            parts.append(f"org:{org_id}")
-        if user_id:
-            parts.append(f"user:{user_id}")
-        if team_ids:
-            parts.append(f"teams:{team_ids}")
-        if month:
-            parts.append(f"month:{month}")
-        if year:
-            parts.append(f"year:{year}")
-        
-        return ":".join(parts)
-    
-    @staticmethod
-    def build_metrics_key(
-        metrics_type: str,
-        org_id: Optional[int] = None,
-        team_id: Optional[int] = None,
-        user_id: Optional[int] = None,
-        period_type: Optional[str] = None,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
-        extra_key: Optional[str] = None
-    ) -> str:
-        """
-        Build cache key for metrics data.
-        
-        Args:
-            metrics_type: Type of metrics (e.g., "dashboard", "employee", "team")
-            org_id: Optional org filter
-            team_id: Optional team filter
-            user_id: Optional user filter
-            period_type: Optional period type (daily, weekly, monthly)
-            start_date: Optional start date (ISO format string)
-            end_date: Optional end date (ISO format string)
-            extra_key: Additional context string
+            Redis pattern string (with * wildcards)
             
-        Returns:
-            Cache key
+        Example:
+            pattern = CacheKeyBuilder.build_invalidation_pattern_seq(
+                "dash", (("role", "*"), ("org", 5))
+            )
+            # Returns: "empperf:dash:*:org:5*"
         """
-        parts = [CacheKeyBuilder.PREFIX_METRICS, metrics_type]
+        # Collect parts and join once; don't grow the pattern with += (quadratic
+        # copying on interpreters without CPython's in-place concat)
+        parts = [CacheKeyBuilder.PREFIX_APP, prefix]
+        append = parts.append
+        for key, value in pairs:
+            append("*" if value is None or value == "*" else "%s:%s" % (key, value))
         
-        if org_id:
-            parts.append(f"org:{org_id}")
-        if team_id:
-            parts.append(f"team:{team_id}")
-        if user_id:
-            parts.append(f"user:{user_id}")
-        if period_type:
-            parts.append(f"period:{period_type}")
-        if start_date:
-            parts.append(f"start:{start_date}")
-        if end_date:
-            parts.append(f"end:{end_date}")
-        if extra_key:
-            parts.append(extra_key)
-        
-        return ":".join(parts)
+        return ":".join(parts) + "*"
     
     @staticmethod
-    def build_users_list_key(
-        role: str,
-        org_id: Optional[int] = None,
-        team_id: Optional[int] = None,
-        filter_role: Optional[str] = None,
-        is_active: Optional[bool] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> str:
+    def build_invalidation_pattern(prefix: str, **filters) -> str:
         """
-        Build cache key for user listing.
+        Build a Redis pattern for cache invalidation from keyword filters.
+        Deprecated: kept for existing callers; use build_invalidation_pattern_seq,
+        which takes pre-built pairs instead of a kwargs dict.
         
-        Args:
-            role: Current user's role (for access context)
-            org_id: Optional org filter
-            team_id: Optional team filter
-            filter_role: Optional role filter (employee, team_lead, etc)
-            is_active: Optional active filter
-            skip: Pagination offset
-            limit: Pagination limit
-            
-        Returns:
-            Cache key
+        Example:
+            pattern = CacheKeyBuilder.build_invalidation_pattern(
+                "dash", role="*", org="5"
+            )
+            # Returns: "empperf:dash:*:org:5*"
         """
-        parts = [CacheKeyBuilder.PREFIX_USERS, "list", f"role:{role}"]
-        
-        if org_id:
-            parts.append(f"org:{org_id}")
-        if team_id:
-            parts.append(f"team:{team_id}")
-        if filter_role:
-            parts.append(f"filter_role:{filter_role}")
-        if is_active is not None:
-            parts.append(f"active:{is_active}")
-        
-        parts.extend([f"skip:{skip}", f"limit:{limit}"])
-        
-        return ":".join(parts)
+        return CacheKeyBuilder.build_invalidation_pattern_seq(prefix, filters.items())
     
     @staticmethod
-    def build_teams_list_key(
-        role: str,
-        org_id: Optional[int] = None,
-        is_active: Optional[bool] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> str:
+    def get_invalidation_patterns_for_user_org(org_id: int) -> List[str]:
         """
-        Build cache key for team listing.
+        Get all cache invalidation patterns when org data changes.
         
         Args:
-            role: Current user's role
-            org_id: Optional org filter
-            is_active: Optional active filter
-            skip: Pagination offset
-            limit: Pagination limit
+            org_id: Organization that changed
             
         Returns:
-            Cache key
+            List of patterns to invalidate
         """
-        parts = [CacheKeyBuilder.PREFIX_TEAMS, "list", f"role:{role}"]
-        
-        if org_id:
-            parts.append(f"org:{org_id}")
-        if is_active is not None:
-            parts.append(f"active:{is_active}")
-        
-        parts.extend([f"skip:{skip}", f"limit:{limit}"])
-        
-        return ":".join(parts)
+        return [template % org_id for template in _ORG_INVALIDATION_TEMPLATES]
     
     @staticmethod
-    def build_orders_list_key(
-        role: str,
-        org_id: Optional[int] = None,
-        team_id: Optional[int] = None,
-        user_id: Optional[int] = None,
-        status_id: Optional[int] = None,
-        skip: int = 0,
-        limit: int = 100,
-        my_orders: bool = False
-    ) -> str:
+    def get_invalidation_patterns_for_team(team_id: int) -> List[str]:
         """
-        Build cache key for orders listing.
+        Get all cache invalidation patterns when team data changes.
         
         Args:
-            role: Current user's role
-            org_id: Optional org filter
-            team_id: Optional team filter
-            user_id: Optional user filter
-            status_id: Optional status filter
-            skip: Pagination offset
-            limit: Pagination limit
-            my_orders: If True, filter to current user's orders
+            team_id: Team that changed
             
         Returns:
-            Cache key
+            List of patterns to invalidate
         """
-        parts = [CacheKeyBuilder.PREFIX_ORDERS, "list", f"role:{role}"]
-        
-        if org_id:
-            parts.append(f"org:{org_id}")
-        if team_id:
-            parts.append(f"team:{team_id}")
-        if user_id:
-            parts.append(f"user:{user_id}")
-        if status_id:
-            parts.append(f"status:{status_id}")
-        if my_orders:
-            parts.append("my_orders:true")
-        
-        parts.extend([f"skip:{skip}", f"limit:{limit}"])
-        
-        return ":".join(parts)
+        return [template % team_id for template in _TEAM_INVALIDATION_TEMPLATES]
     
     @staticmethod
-    def build_invalidation_pattern(prefix: str, **filters) -> str:
-        """
-        Build a Redis pattern for cache invalidation.
-        Used with KEYS pattern matching for bulk deletion.
-        
-        Args:
-            prefix: Cache prefix to invalidate
-            **filters: Filter keys as kwargs (will be converted to pattern)
-            
-        Returns:
-            Redis pattern string (with * wildcards)
-            
-        Example:
-            pattern = CacheKeyBuilder.build_invalidation_pattern(
-                "dash", role="*", org="5"
-            )
-            # Returns: "dash:*:role:*:org:5*"
-        """
-        parts = [prefix]
-        for key, value in filters.items():
-            if value is None or value == "*":
-                parts.append("*")
-            else:
-                parts.append(f"{key}:{value}")
-        
-        return ":".join(parts) + "*"
-    
-    @staticmethod
-    def get_invalidation_patterns_for_user_org(org_id: int) -> List[str]:
+    def get_invalidation_patterns_for_user(user_id: int) -> List[str]:
         """
-        Get all cache invalidation patterns when org data changes.
+        Get all cache invalidation patterns when user data changes.
         
         Args:
-            org_id: Organization that changed
+            user_id: User that changed
             
         Returns:
             List of patterns to invalidate
         """
         return [
-            f"{CacheKeyBuilder.PREFIX_DASHBOARD}:*:org:{org_id}*",
-            f"{CacheKeyBuilder.PREFIX_METRICS}:*:org:{org_id}*",
-            f"{CacheKeyBuilder.PREFIX_USERS}:*:org:{org_id}*",
-            f"{CacheKeyBuilder.PREFIX_TEAMS}:*:org:{org_id}*",
-            f"{CacheKeyBuilder.PREFIX_ORDERS}:*:org:{org_id}*",
+            _USER_INVALIDATION_TEMPLATES[0] % user_id,
+            _USER_INVALIDATION_TEMPLATES[1] % user_id,
+            _ALL_USER_LISTS_PATTERN,  # All user lists may be affected
+            _USER_INVALIDATION_TEMPLATES[2] % user_id,
         ]
     
     @staticmethod
-    def get_invalidation_patterns_for_team(team_id: int) -> List[str]:
+    def get_invalidation_index_keys_for_user_org(org_id: int) -> List[str]:
         """
-        Get all cache invalidation patterns when team data changes.
+        Get the index sets to clear when org data changes.
+        Their members are deleted directly (see CacheService.delete_indexed)
+        instead of scanning for the patterns above.
         
         Args:
-            team_id: Team that changed
+            org_id: Organization that changed
             
         Returns:
-            List of patterns to invalidate
+            List of index set keys
         """
-        return [
-            f"{CacheKeyBuilder.PREFIX_DASHBOARD}:*:teams:{team_id}*",
-            f"{CacheKeyBuilder.PREFIX_METRICS}:*:team:{team_id}*",
-            f"{CacheKeyBuilder.PREFIX_TEAMS}:*:*team:{team_id}*",
-            f"{CacheKeyBuilder.PREFIX_ORDERS}:*:team:{team_id}*",
-        ]
+        return [template % org_id for template in _ORG_INDEX_TEMPLATES]
     
     @staticmethod
-    def get_invalidation_patterns_for_user(user_id: int) -> List[str]:
+    def get_invalidation_index_keys_for_user(user_id: int) -> List[str]:
         """
-        Get all cache invalidation patterns when user data changes.
+        Get the index sets to clear when user data changes.
         
         Args:
             user_id: User that changed
             
         Returns:
-            List of patterns to invalidate
+            List of index set keys
         """
         return [
-            f"{CacheKeyBuilder.PREFIX_DASHBOARD}:*:user:{user_id}*",
-            f"{CacheKeyBuilder.PREFIX_METRICS}:*:user:{user_id}*",
-            f"{CacheKeyBuilder.PREFIX_USERS}:*:*",  # All user lists may be affected
-            f"{CacheKeyBuilder.PREFIX_ORDERS}:*:user:{user_id}*",
+            _USER_INDEX_TEMPLATES[0] % user_id,
+            _ALL_USER_LISTS_INDEX,  # All user lists may be affected
         ]
+
+
+# "<app>:" namespace in front of every key and pattern
+_NS = f"{CacheKeyBuilder.PREFIX_APP}:"
+
+# Precomputed "<app>:<prefix>:<subtype>:role:<role>" key heads for the known roles
+_ROLE_HEAD: Dict[Tuple[str, str, str], str] = {
+    (prefix, subtype, role): f"{_NS}{prefix}:{subtype}:role:{role}"
+    for prefix, subtypes in (
+        (CacheKeyBuilder.PREFIX_DASHBOARD, ("admin", "teamlead", "employee")),
+        (CacheKeyBuilder.PREFIX_USERS, ("list",)),
+        (CacheKeyBuilder.PREFIX_TEAMS, ("list",)),
+        (CacheKeyBuilder.PREFIX_ORDERS, ("list",)),
+    )
+    for subtype in subtypes
+    for role in (ROLE_SUPERADMIN, ROLE_ADMIN, ROLE_TEAM_LEAD, ROLE_EMPLOYEE)
+}
+
+
+def _role_head(prefix: str, subtype: str, role: str) -> str:
+    """Get the key head for a prefix, subtype and role (formatted only for unknown combinations)"""
+    return _ROLE_HEAD.get((prefix, subtype, role)) or f"{_NS}{prefix}:{subtype}:role:{role}"
+
+
+# Invalidation pattern templates; only the ID is substituted per invalidation
+_ORG_INVALIDATION_TEMPLATES = tuple(
+    f"{_NS}{prefix}:*:org:%d*"
+    for prefix in (
+        CacheKeyBuilder.PREFIX_DASHBOARD, CacheKeyBuilder.PREFIX_METRICS,
+        CacheKeyBuilder.PREFIX_USERS, CacheKeyBuilder.PREFIX_TEAMS, CacheKeyBuilder.PREFIX_ORDERS,
+    )
+)
+_TEAM_INVALIDATION_TEMPLATES = (
+    f"{_NS}{CacheKeyBuilder.PREFIX_DASHBOARD}:*:teams:%d*",
+    f"{_NS}{CacheKeyBuilder.PREFIX_METRICS}:*:team:%d*",
+    f"{_NS}{CacheKeyBuilder.PREFIX_TEAMS}:*:*team:%d*",
+    f"{_NS}{CacheKeyBuilder.PREFIX_ORDERS}:*:team:%d*",
+)
+_USER_INVALIDATION_TEMPLATES = (
+    f"{_NS}{CacheKeyBuilder.PREFIX_DASHBOARD}:*:user:%d*",
+    f"{_NS}{CacheKeyBuilder.PREFIX_METRICS}:*:user:%d*",
+    f"{_NS}{CacheKeyBuilder.PREFIX_ORDERS}:*:user:%d*",
+)
+_ALL_USER_LISTS_PATTERN = f"{_NS}{CacheKeyBuilder.PREFIX_USERS}:*:*"
+
+# Index set templates (matching the sets CacheService.set maintains)
+_ORG_INDEX_TEMPLATES = tuple(
+    f"{_NS}{CacheKeyBuilder.PREFIX_INDEX}:{prefix}:org:%d"
+    for prefix in (
+        CacheKeyBuilder.PREFIX_DASHBOARD, CacheKeyBuilder.PREFIX_USERS, CacheKeyBuilder.PREFIX_TEAMS,
+    )
+)
+_USER_INDEX_TEMPLATES = (
+    f"{_NS}{CacheKeyBuilder.PREFIX_INDEX}:{CacheKeyBuilder.PREFIX_DASHBOARD}:user:%d",
+)
+_ALL_USER_LISTS_INDEX = f"{_NS}{CacheKeyBuilder.PREFIX_INDEX}:{CacheKeyBuilder.PREFIX_USERS}"
+
+
+# Key builders as module-level functions; hot callers use these directly and skip
+# the class attribute lookup and staticmethod dispatch
+def build_key(prefix: str, *args: str) -> str:
+    """
+    Build a cache key from prefix and arguments, under the app namespace.
+    
+    Args:
+        prefix: Cache prefix (e.g., PREFIX_DASHBOARD)
+        *args: Additional key components (will be converted to strings)
+        
+    Returns:
+        Complete cache key joined with colons
+        
+    Example:
+        key = build_key("dash", "admin", "org:5", "month:3")
+        # Returns: "empperf:dash:admin:org:5:month:3"
+    """
+    parts = [CacheKeyBuilder.PREFIX_APP, prefix]
+    parts.extend([str(arg) for arg in args if arg is not None])
+    return ":".join(parts)
+
+
+def build_dashboard_key(
+    dashboard_type: str,
+    role: str,
+    org_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    team_ids: Optional[str] = None,
+    month: Optional[int] = None,
+    year: Optional[int] = None
+) -> str:
+    """
+    Build cache key for dashboard data.
+    
+    Args:
+        dashboard_type: Type of dashboard (e.g., "admin", "teamlead", "employee")
+        role: User role for cache context
+        org_id: Optional org filter
+        user_id: Optional user filter
+        team_ids: Optional team IDs (comma-separated string)
+        month: Optional month filter
+        year: Optional year filter
+        
+    Returns:
+        Cache key
+    """
+    return _build_dashboard_key(dashboard_type, role, org_id, user_id, team_ids, month, year)
+
+
+def build_metrics_key(
+    metrics_type: str,
+    org_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    period_type: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    extra_key: Optional[str] = None
+) -> str:
+    """
+    Build cache key for metrics data.
+    
+    Args:
+        metrics_type: Type of metrics (e.g., "dashboard", "employee", "team")
+        org_id: Optional org filter
+        team_id: Optional team filter
+        user_id: Optional user filter
+        period_type: Optional period type (daily, weekly, monthly)
+        start_date: Optional start date (ISO format string)
+        end_date: Optional end date (ISO format string)
+        extra_key: Additional context string
+        
+    Returns:
+        Cache key
+    """
+    if not (org_id or team_id or user_id or period_type or start_date or end_date or extra_key):
+        return f"{CacheKeyBuilder.PREFIX_APP}:{CacheKeyBuilder.PREFIX_METRICS}:{metrics_type}"
+    
+    parts = [CacheKeyBuilder.PREFIX_APP, CacheKeyBuilder.PREFIX_METRICS, metrics_type]
+    
+    if org_id:
+        parts.append("org:%d" % org_id)
+    if team_id:
+        parts.append("team:%d" % team_id)
+    if user_id:
+        parts.append("user:%d" % user_id)
+    if period_type:
+        parts.append("period:%s" % period_type)
+    if start_date:
+        parts.append("start:%s" % start_date)
+    if end_date:
+        parts.append("end:%s" % end_date)
+    if extra_key:
+        parts.append(extra_key)
+    
+    return ":".join(parts)
+
+
+def build_users_list_key(
+    role: str,
+    org_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    filter_role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> str:
+    """
+    Build cache key for user listing.
+    
+    Args:
+        role: Current user's role (for access context)
+        org_id: Optional org filter
+        team_id: Optional team filter
+        filter_role: Optional role filter (employee, team_lead, etc)
+        is_active: Optional active filter
+        skip: Pagination offset
+        limit: Pagination limit
+        
+    Returns:
+        Cache key
+    """
+    return _build_users_list_key(role, org_id, team_id, filter_role, is_active, skip, limit)
+
+
+def build_teams_list_key(
+    role: str,
+    org_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> str:
+    """
+    Build cache key for team listing.
+    
+    Args:
+        role: Current user's role
+        org_id: Optional org filter
+        is_active: Optional active filter
+        skip: Pagination offset
+        limit: Pagination limit
+        
+    Returns:
+        Cache key
+    """
+    return _build_teams_list_key(role, org_id, is_active, skip, limit)
+
+
+def build_orders_list_key(
+    role: str,
+    org_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    my_orders: bool = False
+) -> str:
+    """
+    Build cache key for orders listing.
+    
+    Args:
+        role: Current user's role
+        org_id: Optional org filter
+        team_id: Optional team filter
+        user_id: Optional user filter
+        status_id: Optional status filter
+        skip: Pagination offset
+        limit: Pagination limit
+        my_orders: If True, filter to current user's orders
+        
+    Returns:
+        Cache key
+    """
+    return _build_orders_list_key(role, org_id, team_id, user_id, status_id, skip, limit, my_orders)
+
+
+# Kept on the class for existing CacheKeyBuilder.build_* callers
+CacheKeyBuilder.build_key = staticmethod(build_key)
+CacheKeyBuilder.build_dashboard_key = staticmethod(build_dashboard_key)
+CacheKeyBuilder.build_metrics_key = staticmethod(build_metrics_key)
+CacheKeyBuilder.build_users_list_key = staticmethod(build_users_list_key)
+CacheKeyBuilder.build_teams_list_key = staticmethod(build_teams_list_key)
+CacheKeyBuilder.build_orders_list_key = staticmethod(build_orders_list_key)
+
+
+# Memoized key builders behind the public builders (module-level, so the caches
+# are not tied to the class); called with positional arguments only
+@lru_cache(maxsize=None)
+def _build_reference_key(
+    ref_type: str,
+    is_active: Optional[bool]
+) -> str:
+    if is_active is None:
+        return "%s%s:%s:all" % (_NS, CacheKeyBuilder.PREFIX_REFERENCE, ref_type)
+    return "%s%s:%s:active:%s" % (_NS, CacheKeyBuilder.PREFIX_REFERENCE, ref_type, is_active)
+
+
+@lru_cache(maxsize=CACHE_KEY_MEMO_SIZE)
+def _build_dashboard_key(
+    dashboard_type: str,
+    role: str,
+    org_id: Optional[int],
+    user_id: Optional[int],
+    team_ids: Optional[str],
+    month: Optional[int],
+    year: Optional[int]
+) -> str:
+    head = _role_head(CacheKeyBuilder.PREFIX_DASHBOARD, dashboard_type, role)
+    if not (org_id or user_id or team_ids or month or year):
+        return head
+    
+    parts = [head]
+    
+    if org_id:
+        parts.append("org:%d" % org_id)
+    if user_id:
+        parts.append("user:%d" % user_id)
+    if team_ids:
+        parts.append("teams:%s" % team_ids)
+    if month:
+        parts.append("month:%d" % month)
+    if year:
+        parts.append("year:%d" % year)
+    
+    return ":".join(parts)
+
+
+@lru_cache(maxsize=CACHE_KEY_MEMO_SIZE)
+def _build_users_list_key(
+    role: str,
+    org_id: Optional[int],
+    team_id: Optional[int],
+    filter_role: Optional[str],
+    is_active: Optional[bool],
+    skip: int,
+    limit: int
+) -> str:
+    head = _role_head(CacheKeyBuilder.PREFIX_USERS, "list", role)
+    if not (org_id or team_id or filter_role) and is_active is None:
+        return f"{head}:skip:{skip}:limit:{limit}"
+    
+    parts = [head]
+    
+    if org_id:
+        parts.append(f"org:{org_id}")
+    if team_id:
+        parts.append(f"team:{team_id}")
+    if filter_role:
+        parts.append(f"filter_role:{filter_role}")
+    if is_active is not None:
+        parts.append(f"active:{is_active}")
+    
+    # Filters joined once, then one format call appends the pagination tail
+    return "%s:skip:%s:limit:%s" % (":".join(parts), skip, limit)
+
+
+@lru_cache(maxsize=CACHE_KEY_MEMO_SIZE)
+def _build_teams_list_key(
+    role: str,
+    org_id: Optional[int],
+    is_active: Optional[bool],
+    skip: int,
+    limit: int
+) -> str:
+    head = _role_head(CacheKeyBuilder.PREFIX_TEAMS, "list", role)
+    if not org_id and is_active is None:
+        return f"{head}:skip:{skip}:limit:{limit}"
+    
+    parts = [head]
+    
+    if org_id:
+        parts.append(f"org:{org_id}")
+    if is_active is not None:
+        parts.append(f"active:{is_active}")
+    
+    # Filters joined once, then one format call appends the pagination tail
+    return "%s:skip:%s:limit:%s" % (":".join(parts), skip, limit)
+
+
+@lru_cache(maxsize=CACHE_KEY_MEMO_SIZE)
+def _build_orders_list_key(
+    role: str,
+    org_id: Optional[int],
+    team_id: Optional[int],
+    user_id: Optional[int],
+    status_id: Optional[int],
+    skip: int,
+    limit: int,
+    my_orders: bool
+) -> str:
+    head = _role_head(CacheKeyBuilder.PREFIX_ORDERS, "list", role)
+    if not (org_id or team_id or user_id or status_id or my_orders):
+        return f"{head}:skip:{skip}:limit:{limit}"
+    
+    parts = [head]
+    
+    if org_id:
+        parts.append(f"org:{org_id}")
+    if team_id:
+        parts.append(f"team:{team_id}")
+    if user_id:
+        parts.append(f"user:{user_id}")
+    if status_id:
+        parts.append(f"status:{status_id}")
+    if my_orders:
+        parts.append("my_orders:true")
+    
+    # Filters joined once, then one format call appends the pagination tail
+    return "%s:skip:%s:limit:%s" % (":".join(parts), skip, limit)
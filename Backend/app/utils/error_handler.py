@@ -4,11 +4,32 @@ Centralizes error handling patterns for consistent HTTP responses.
 Eliminates duplicate HTTPException patterns across endpoints.
 """
 from fastapi import HTTPException, status
+from functools import lru_cache
 from typing import Optional, Any, Dict
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
+# "<Resource> with ID %s not found" templates for the common resource types,
+# interned so the per-call work is a single format of the ID
+_NOT_FOUND_TEMPLATES: Dict[str, str] = {
+    resource_type: sys.intern("%s with ID %%s not found" % resource_type)
+    for resource_type in ("Team", "User", "Organization", "Order")
+}
+
+# Distinct (resource_type, resource_id) not-found details remembered
+NOT_FOUND_DETAIL_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=NOT_FOUND_DETAIL_CACHE_SIZE, typed=True)
+def _not_found_detail(resource_type: str, resource_id: Any) -> str:
+    """Get the not-found detail for a resource (memoized, so 404 bursts for one ID reuse it)"""
+    template = _NOT_FOUND_TEMPLATES.get(resource_type)
+    if template is not None:
+        return template % (resource_id,)
+    return "%s with ID %s not found" % (resource_type, resource_id)
+
 
 class ErrorHandler:
     """Standardized error handling with consistent HTTP responses"""
@@ -16,7 +37,7 @@ class ErrorHandler:
     @staticmethod
     def not_found(detail: str = "Resource not found", name: str = "Resource") -> HTTPException:
         """404 Not Found error"""
-        logger.warning(f"404 - {name} not found: {detail}")
+        logger.warning("404 - %s not found: %s", name, detail)
         return HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=detail
@@ -25,7 +46,7 @@ class ErrorHandler:
     @staticmethod
     def forbidden(detail: str = "Access denied") -> HTTPException:
         """403 Forbidden error"""
-        logger.warning(f"403 - Forbidden: {detail}")
+        logger.warning("403 - Forbidden: %s", detail)
         return HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=detail
@@ -34,7 +55,7 @@ class ErrorHandler:
     @staticmethod
     def unauthorized(detail: str = "Unauthorized") -> HTTPException:
         """401 Unauthorized error"""
-        logger.warning(f"401 - Unauthorized: {detail}")
+        logger.warning("401 - Unauthorized: %s", detail)
         return HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=detail,
@@ -44,7 +65,7 @@ class ErrorHandler:
     @staticmethod
     def bad_request(detail: str = "Invalid request") -> HTTPException:
         """400 Bad Request error"""
-        logger.warning(f"400 - Bad Request: {detail}")
+        logger.warning("400 - Bad Request: %s", detail)
         return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=detail
@@ -53,7 +74,7 @@ class ErrorHandler:
     @staticmethod
     def conflict(detail: str = "Resource already exists") -> HTTPException:
         """409 Conflict error"""
-        logger.warning(f"409 - Conflict: {detail}")
+        logger.warning("409 - Conflict: %s", detail)
         return HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=detail
@@ -62,10 +83,7 @@ class ErrorHandler:
     @staticmethod
     def internal_error(detail: str = "Internal server error", log_exception: Optional[Exception] = None) -> HTTPException:
         """500 Internal Server Error"""
-        if log_exception:
-            logger.error(f"500 - Internal Server Error: {detail}", exc_info=log_exception)
-        else:
-            logger.error(f"500 - Internal Server Error: {detail}")
+        logger.error("500 - Internal Server Error: %s", detail, exc_info=log_exception or None)
         
         return HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -77,7 +95,10 @@ class ErrorHandler:
     @staticmethod
     def resource_not_found(resource_type: str, resource_id: Any) -> HTTPException:
         """Generic resource not found"""
-        detail = f"{resource_type} with ID {resource_id} not found"
+        try:
+            detail = _not_found_detail(resource_type, resource_id)
+        except TypeError:  # Unhashable ID, format it directly
+            detail = "%s with ID %s not found" % (resource_type, resource_id)
         return ErrorHandler.not_found(detail=detail, name=resource_type)
     
     @staticmethod
@@ -105,7 +126,7 @@ class ErrorHandler:
         """User doesn't have access to team"""
         detail = "Cannot access this team"
         if team_id:
-            detail += f" (Team: {team_id})"
+            detail += " (Team: %s)" % (team_id,)
         return ErrorHandler.forbidden(detail=detail)
     
     @staticmethod
@@ -113,54 +134,54 @@ class ErrorHandler:
         """User doesn't have access to organization"""
         detail = "Cannot access this organization"
         if org_id:
-            detail += f" (Org: {org_id})"
+            detail += " (Org: %s)" % (org_id,)
         return ErrorHandler.forbidden(detail=detail)
     
     @staticmethod
     def insufficient_permissions(required_role: str) -> HTTPException:
         """User doesn't have required role"""
-        detail = f"{required_role} access required"
+        detail = "%s access required" % (required_role,)
         return ErrorHandler.forbidden(detail=detail)
     
     @staticmethod
     def team_lead_required() -> HTTPException:
         """Team lead or higher role required"""
-        return ErrorHandler.insufficient_permissions("Team lead or higher")
+        return ErrorHandler.forbidden(detail="Team lead or higher access required")
     
     @staticmethod
     def admin_required() -> HTTPException:
         """Admin role required"""
-        return ErrorHandler.insufficient_permissions("Admin")
+        return ErrorHandler.forbidden(detail="Admin access required")
     
     @staticmethod
     def superadmin_required() -> HTTPException:
         """Superadmin access required"""
-        return ErrorHandler.insufficient_permissions("Superadmin")
+        return ErrorHandler.forbidden(detail="Superadmin access required")
     
     @staticmethod
     def employee_only_self_access(resource_type: str = "this resource") -> HTTPException:
         """Employees can only access their own data"""
-        detail = f"Employees can only access their own {resource_type}"
+        detail = "Employees can only access their own %s" % (resource_type,)
         return ErrorHandler.forbidden(detail=detail)
     
     @staticmethod
     def resource_already_exists(resource_type: str, identifier: str = "") -> HTTPException:
         """Resource already exists"""
-        detail = f"{resource_type} already exists"
+        detail = "%s already exists" % (resource_type,)
         if identifier:
-            detail += f" ({identifier})"
+            detail += " (%s)" % (identifier,)
         return ErrorHandler.conflict(detail=detail)
     
     @staticmethod
     def invalid_input(field: str, reason: str) -> HTTPException:
         """Invalid input parameter"""
-        detail = f"Invalid {field}: {reason}"
+        detail = "Invalid %s: %s" % (field, reason)
         return ErrorHandler.bad_request(detail=detail)
     
     @staticmethod
     def missing_required_field(field: str) -> HTTPException:
         """Required field is missing"""
-        return ErrorHandler.bad_request(detail=f"Required field missing: {field}")
+        return ErrorHandler.bad_request(detail="Required field missing: %s" % (field,))
     
     @staticmethod
     def invalid_date_range() -> HTTPException:
@@ -170,13 +191,13 @@ class ErrorHandler:
     @staticmethod
     def user_not_in_team(user_id: int, team_id: int) -> HTTPException:
         """User is not a member of team"""
-        detail = f"User {user_id} is not a member of team {team_id}"
+        detail = "User %s is not a member of team %s" % (user_id, team_id)
         return ErrorHandler.forbidden(detail=detail)
     
     @staticmethod
     def not_team_lead_of_team(user_id: int, team_id: int) -> HTTPException:
         """User is not the team lead of specified team"""
-        detail = f"User {user_id} is not the team lead of team {team_id}"
+        detail = "User %s is not the team lead of team %s" % (user_id, team_id)
         return ErrorHandler.forbidden(detail=detail)
     
     @staticmethod
@@ -196,8 +217,10 @@ class ErrorHandler:
         Returns:
             HTTPException to return to client
         """
-        error_msg = f"Exception: {context}" if context else "Unexpected error"
-        logger.error(error_msg, exc_info=exception)
+        if context:
+            logger.error("Exception: %s", context, exc_info=exception)
+        else:
+            logger.error("Unexpected error", exc_info=exception)
         
         if return_generic:
             return ErrorHandler.internal_error(detail="An unexpected error occurred")
@@ -3,6 +3,8 @@ Query Builder Utility
 Centralizes common query filtering patterns for role-based access control.
 Eliminates duplicate filtering logic across endpoints.
 """
+from sqlalchemy import func, select
+from collections import namedtuple
 from sqlalchemy.orm import Session, Query
 from typing import List, Optional, Any
 from app.models.user import User
@@ -18,6 +20,87 @@ from app.core.dependencies import (
 )
 
 
+class _EmptyQuery:
+    """
+    Stand-in for a query that can only return no rows (no access).
+    Chained filters and pagination are no-ops and results are empty, so no SQL
+    is sent; route it through apply_pagination or its result methods.
+    """
+    
+    def _chain(self, *args, **kwargs) -> "_EmptyQuery":
+        return self
+    
+    filter = filter_by = join = outerjoin = options = order_by = distinct = offset = limit = _chain
+    
+    def count(self) -> int:
+        return 0
+    
+    def all(self) -> list:
+        return []
+    
+    def first(self) -> None:
+        return None
+    
+    def one_or_none(self) -> None:
+        return None
+    
+    def scalar(self) -> None:
+        return None
+    
+    def __iter__(self):
+        return iter(())
+
+
+_EMPTY_QUERY = _EmptyQuery()
+
+
+def _get_cached_user_teams(user: User, db: Session) -> List[int]:
+    """Get the user's accessible team IDs, loaded once per request (cached on the user)"""
+    team_ids = getattr(user, "_cached_teams", None)
+    if team_ids is None:
+        team_ids = get_user_teams(user, db)
+        user._cached_teams = team_ids
+    return team_ids
+
+
+def _get_cached_org_team_ids(user: User, db: Session) -> List[int]:
+    """Get the team IDs of the user's organization, loaded once per request (cached on the user)"""
+    team_ids = getattr(user, "_org_team_ids", None)
+    if team_ids is None:
+        team_ids = list(db.scalars(select(Team.id).where(Team.org_id == user.org_id)))
+        user._org_team_ids = team_ids
+    return team_ids
+
+
+def _can_access_team(user: User, db: Session, team_id: int) -> bool:
+    """
+    Check one team against the user's accessible teams (ADMIN, TEAM_LEAD, EMPLOYEE)
+    Uses the request cache when loaded, else an EXISTS probe instead of the full list
+    """
+    if user.user_role == ROLE_ADMIN:
+        cached = getattr(user, "_org_team_ids", None)
+        if cached is not None:
+            return team_id in cached
+        probe = db.query(Team.id).filter(Team.id == team_id, Team.org_id == user.org_id)
+    else:
+        cached = getattr(user, "_cached_teams", None)
+        if cached is not None:
+            return team_id in cached
+        if user.user_role == ROLE_TEAM_LEAD:
+            probe = db.query(Team.id).filter(
+                Team.id == team_id,
+                Team.team_lead_id == user.id,
+                Team.is_active == True
+            )
+        else:
+            probe = db.query(UserTeam.team_id).filter(
+                UserTeam.user_id == user.id,
+                UserTeam.team_id == team_id,
+                UserTeam.is_active == True
+            )
+    return db.query(probe.exists()).scalar()
+
+
 class QueryBuilder:
     """Centralized query builder for common filtering patterns"""
     
@@ -73,52 +156,28 @@ class QueryBuilder:
             team_id: Optional specific team_id filter
             
         Returns:
-            Filtered query
+            Filtered query (an empty-result stand-in that sends no SQL when
+            the user has no access)
         """
         if current_user.user_role == ROLE_SUPERADMIN:
             if team_id:
                 query = query.filter(model_team_field == team_id)
+        elif team_id:
+            # A single team only needs an access check, not the full team list
+            if _can_access_team(current_user, db, team_id):
+                query = query.filter(model_team_field == team_id)
+            else:
+                query = _EMPTY_QUERY  # No access
         elif current_user.user_role == ROLE_ADMIN:
             # Admins see teams in their org only
-            org_teams = db.query(Team.id).filter(Team.org_id == current_user.org_id).all()
-            org_team_ids = [t.id for t in org_teams]
-            if team_id:
-                if team_id in org_team_ids:
-                    query = query.filter(model_team_field == team_id)
-                else:
-                    query = query.filter(False)  # No access
-            else:
-                query = query.filter(model_team_field.in_(org_team_ids))
-        elif current_user.user_role == ROLE_TEAM_LEAD:
-            # Team leads see accessible teams only
-            accessible_teams = get_user_teams(current_user, db)
+            query = query.filter(model_team_field.in_(_get_cached_org_team_ids(current_user, db)))
+        else:  # TEAM_LEAD, EMPLOYEE
+            # Team leads see the teams they lead, employees the teams they belong to
+            accessible_teams = _get_cached_user_teams(current_user, db)
             if accessible_teams:
-                if team_id:
-                    if team_id in accessible_teams:
-                        query = query.filter(model_team_field == team_id)
-                    else:
-                        query = query.filter(False)  # No access
-                else:
-                    query = query.filter(model_team_field.in_(accessible_teams))
+                query = query.filter(model_team_field.in_(accessible_teams))
             else:
-                query = query.filter(False)  # No accessible teams
-        else:  # EMPLOYEE
-            # Employees see their teams only
-            user_teams = db.query(UserTeam.team_id).filter(
-                UserTeam.user_id == current_user.id,
-                UserTeam.is_active == True
-            ).all()
-            user_team_ids = [t.team_id for t in user_teams]
-            if user_team_ids:
-                if team_id:
-                    if team_id in user_team_ids:
-                        query = query.filter(model_team_field == team_id)
-                    else:
-                        query = query.filter(False)  # No access
-                else:
-                    query = query.filter(model_team_field.in_(user_team_ids))
-            else:
-                query = query.filter(False)  # No teams
+                query = _EMPTY_QUERY  # No accessible teams
         
         return query
     
@@ -186,21 +245,50 @@ class QueryBuilder:
         query: Query,
         skip: int = 0,
         limit: int = 100
-    ) -> tuple[Query, int]:
+    ) -> tuple[List[Any], int]:
         """
-        Apply pagination to query and return total count.
+        Fetch one page of the query together with the total count.
+        The total comes from a COUNT(*) OVER() window column, so the page and
+        the total share one query and one scan. DISTINCT and GROUP BY queries
+        keep a separate count, since the window is evaluated before DISTINCT.
         
         Args:
-            query: SQLAlchemy query object
+            query: SQLAlchemy query object (ordering applied by the caller)
             skip: Number of records to skip
             limit: Number of records to return
             
         Returns:
-            Tuple of (paginated_query, total_count)
+            Tuple of (page_rows, total_count)
         """
-        total = query.count()
-        query = query.offset(skip).limit(limit)
-        return query, total
+        if isinstance(query, _EmptyQuery):
+            return [], 0
+        
+        if query._distinct or query._group_by_clauses:
+            total = query.count()
+            return query.offset(skip).limit(limit).all(), total
+        
+        # A lone mapped entity comes back as the object itself; anything else as rows
+        descriptions = query.column_descriptions
+        single_entity = len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+        rows = query.add_columns(func.count().over().label("_total")).offset(skip).limit(limit).all()
+        
+        if rows:
+            total = rows[0][-1]
+        elif skip > 0:
+            # Page past the end returns no rows to carry the total
+            total = query.count()
+        else:
+            total = 0
+        
+        # Strip the window column back off the rows, keeping row.<label> access
+        if single_entity:
+            items = [row[0] for row in rows]
+        elif rows:
+            page_row = namedtuple("Row", rows[0]._fields[:-1], rename=True)
+            items = [page_row._make(row[:-1]) for row in rows]
+        else:
+            items = []
+        return items, total
     
     @staticmethod
     def build_user_list_filter(
@@ -220,7 +308,8 @@ class QueryBuilder:
             team_id: Optional team filter
             
         Returns:
-            Base query ready for additional filters
+            Base query ready for additional filters (an empty-result stand-in
+            that sends no SQL when no users are visible)
         """
         query = db.query(User)
         
@@ -230,27 +319,26 @@ class QueryBuilder:
         elif current_user.user_role == ROLE_ADMIN:
             query = query.filter(User.org_id == current_user.org_id)
         elif current_user.user_role == ROLE_TEAM_LEAD:
-            # Get users in accessible teams
-            accessible_teams = get_user_teams(current_user, db)
-            if not accessible_teams:
-                return query.filter(False)  # No users visible
-            
-            team_user_ids = db.query(UserTeam.user_id).filter(
-                UserTeam.team_id.in_(accessible_teams),
-                UserTeam.is_active == True
-            ).distinct().all()
-            user_ids = [u.user_id for u in team_user_ids]
-            
-            if team_id and team_id in accessible_teams:
-                # Specific team filter
-                specific_team_members = db.query(UserTeam.user_id).filter(
+            if team_id:
+                # Specific team filter: members of that team only
+                if not _can_access_team(current_user, db, team_id):
+                    return _EMPTY_QUERY  # No access to this team
+                
+                team_members = db.query(UserTeam.user_id).filter(
                     UserTeam.team_id == team_id,
                     UserTeam.is_active == True
                 ).all()
-                user_ids = [u.user_id for u in specific_team_members]
-            elif team_id:
-                return query.filter(False)  # No access to this team
+            else:
+                # Get users in accessible teams
+                accessible_teams = _get_cached_user_teams(current_user, db)
+                if not accessible_teams:
+                    return _EMPTY_QUERY  # No users visible
+                
+                team_members = db.query(UserTeam.user_id).filter(
+                    UserTeam.team_id.in_(accessible_teams),
+                    UserTeam.is_active == True
+                ).distinct().all()
             
-            query = query.filter(User.id.in_(user_ids))
+            query = query.filter(User.id.in_([u.user_id for u in team_members]))
         
         return query
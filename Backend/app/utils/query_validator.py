@@ -6,7 +6,63 @@ Prevents invalid inputs and improves query security.
 from fastapi import HTTPException, status
 from typing import Optional, Any, List
 from datetime import date, datetime
+from functools import lru_cache
+import numpy as np
 import re
+import string
+
+
+# Character sets of the email check, as ^[local]+@[domain]+\.[letters]{2,}$
+_EMAIL_LOCAL_CHARS = string.ascii_letters + string.digits + "._%+-"
+_EMAIL_DOMAIN_CHARS = string.ascii_letters + string.digits + ".-"
+
+# Phone separators, deleted before checking the rest is digits
+_PHONE_SEPARATORS = str.maketrans("", "", " -()")
+
+# ID lists longer than this are range-checked as one NumPy array
+VECTORIZE_IDS_THRESHOLD = 32
+
+# Validation patterns, compiled once at import
+_PHONE_STRIP_RE = re.compile(r'[^\d+]')
+_SEARCH_STRIP_RE = re.compile(r'[^a-zA-Z0-9\s\-_@.]')
+
+
+def _is_valid_email(value: str) -> bool:
+    """
+    Check ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$ with string scans
+    (str.strip with a character set leaves "" only if every character is in it)
+    """
+    if value.endswith("\n"):
+        value = value[:-1]  # $ also matched before a trailing newline
+    local, at, domain = value.partition("@")
+    if not local or not at or local.strip(_EMAIL_LOCAL_CHARS):
+        return False
+    # The TLD has no dots, so it follows the last one
+    head, dot, tld = domain.rpartition(".")
+    return (
+        bool(head) and len(tld) >= 2
+        and not tld.strip(string.ascii_letters)
+        and not head.strip(_EMAIL_DOMAIN_CHARS)
+    )
+
+
+def _is_valid_phone(value: str) -> bool:
+    """Check ^[+]?[\d\s\-()]{10,}$ with string scans"""
+    rest = value[1:] if value.startswith("+") else value
+    if len(rest) < 10:
+        return False
+    digits = rest.translate(_PHONE_SEPARATORS)
+    # Fast path for plain digits; other whitespace (tabs, etc.) is checked per character
+    return (
+        not digits or digits.isdecimal()
+        or all(ch.isdecimal() or ch.isspace() for ch in digits)
+    )
+
+
+@lru_cache(maxsize=64)
+def _compile_allowed(pattern: str) -> "re.Pattern[str]":
+    """Compile a caller's allowed_chars pattern once"""
+    return re.compile(pattern)
 
 
 class QueryValidator:
@@ -36,16 +92,27 @@ class QueryValidator:
                 detail=f"{field_name} is required"
             )
         
-        try:
+        # Path/query params usually arrive as int already; decimal strings
+        # always convert, so neither needs the try/except
+        if type(value) is int:
+            if value > 0:
+                return value
+        elif type(value) is str and value.isdecimal():
             id_value = int(value)
-            if id_value <= 0:
-                raise ValueError()
-            return id_value
-        except (ValueError, TypeError):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"{field_name} must be a positive integer, got: {value}"
-            )
+            if id_value > 0:
+                return id_value
+        else:
+            try:
+                id_value = int(value)
+                if id_value > 0:
+                    return id_value
+            except (ValueError, TypeError):
+                pass
+        
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{field_name} must be a positive integer, got: {value}"
+        )
     
     @staticmethod
     def validate_date(value: Any, field_name: str = "date", allow_none: bool = False) -> Optional[date]:
@@ -208,7 +275,7 @@ class QueryValidator:
             )
         
         if allowed_chars:
-            if not re.match(allowed_chars, str_value):
+            if not _compile_allowed(allowed_chars).match(str_value):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"{field_name} contains invalid characters"
@@ -239,8 +306,7 @@ class QueryValidator:
                 detail="Email is required"
             )
         
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, value):
+        if not _is_valid_email(value):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid email format: {value}"
@@ -343,15 +409,14 @@ class QueryValidator:
             )
         
         # Allow digits, spaces, hyphens, parentheses, plus sign
-        phone_pattern = r'^[+]?[\d\s\-()]{10,}$'
-        if not re.match(phone_pattern, value):
+        if not _is_valid_phone(value):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid phone number format"
             )
         
         # Remove non-digit characters (except +)
-        cleaned = re.sub(r'[^\d+]', '', value)
+        cleaned = _PHONE_STRIP_RE.sub('', value)
         return cleaned
     
     @staticmethod
@@ -382,18 +447,40 @@ class QueryValidator:
                 detail=f"{field_name} cannot be empty"
             )
         
+        if isinstance(ids, (list, tuple)) and len(ids) > VECTORIZE_IDS_THRESHOLD:
+            # An integer dtype means every item was an int that fits in int64;
+            # anything else (strings, floats, huge ints) takes the loop below
+            try:
+                arr = np.asarray(ids)
+            except (OverflowError, ValueError, TypeError):
+                arr = None
+            if arr is not None and arr.ndim == 1 and arr.dtype.kind in "iu":
+                invalid = np.flatnonzero(arr <= 0)
+                if invalid.size:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"{field_name} must contain only positive integers, got: {ids[invalid[0]]}"
+                    )
+                return arr.tolist()
+        
         validated_ids = []
+        append = validated_ids.append
         for item in ids:
-            try:
+            if type(item) is int:
+                id_value = item
+            elif type(item) is str and item.isdecimal():
                 id_value = int(item)
-                if id_value <= 0:
-                    raise ValueError()
-                validated_ids.append(id_value)
-            except (ValueError, TypeError):
+            else:
+                try:
+                    id_value = int(item)
+                except (ValueError, TypeError):
+                    id_value = 0
+            if id_value <= 0:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"{field_name} must contain only positive integers, got: {item}"
                 )
+            append(id_value)
         
         return validated_ids
     
@@ -425,6 +512,6 @@ class QueryValidator:
         
         # Remove potentially dangerous characters but allow common search chars
         # Allow: alphanumeric, spaces, hyphens, underscores, @ (for email)
-        sanitized = re.sub(r'[^a-zA-Z0-9\s\-_@.]', '', sanitized)
+        sanitized = _SEARCH_STRIP_RE.sub('', sanitized)
         
         return sanitized
@@ -3,12 +3,70 @@ Reference Data Cache
 Caches frequently accessed reference data (order statuses, transaction types, etc).
 Eliminates repeated reference data lookups across endpoints.
 """
+import time
+from sqlalchemy import select, literal, union_all
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from app.models.reference import OrderStatusType, TransactionType, ProcessType, Division
 from app.services.cache_service import cache
 
 
+# Seconds a cached reference table stays valid
+REFERENCE_TABLE_TTL = 3600
+
+# Process-local copy of the reference tables in front of Redis, so warm lookups
+# skip the network round trip: {cache_key: (expires_at, table)}
+LOCAL_TABLE_TTL = 60
+_local_tables: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Cached reference tables: (ref_type, model)
+REFERENCE_TABLES = (
+    ("order_statuses", OrderStatusType),
+    ("transaction_types", TransactionType),
+    ("process_types", ProcessType),
+    ("divisions", Division),
+)
+
+
+def _table_key(ref_type: str) -> str:
+    """Get the cache key of a reference table"""
+    return cache._build_key(cache.PREFIX_REFERENCE, ref_type, "table")
+
+
+def _store_table(ref_type: str, rows: List[Any], now: float) -> Dict[str, Any]:
+    """Build a reference table from its (id, name) rows and cache it in Redis and locally"""
+    table = {
+        "by_name": {row.name: row.id for row in rows},
+        "list": [{"id": row.id, "name": row.name} for row in rows],
+    }
+    cache_key = _table_key(ref_type)
+    # Tagged in the reference index sets, so reference invalidation deletes it directly
+    cache.set(cache_key, table, REFERENCE_TABLE_TTL, cache.index_keys(cache.PREFIX_REFERENCE, ref_type))
+    _local_tables[cache_key] = (now + LOCAL_TABLE_TTL, table)
+    return table
+
+
+def _get_table(model: Any, ref_type: str, db: Session) -> Dict[str, Any]:
+    """
+    Get a whole reference table as {"by_name": {name: id}, "list": [{id, name}]}
+    One cache key per table serves both the full list and the by-name lookups;
+    a miss loads the table once. A local copy is checked before Redis.
+    """
+    cache_key = _table_key(ref_type)
+    now = time.monotonic()
+    
+    entry = _local_tables.get(cache_key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    
+    cached_table = cache.get(cache_key)
+    if cached_table is not None:
+        _local_tables[cache_key] = (now + LOCAL_TABLE_TTL, cached_table)
+        return cached_table
+    
+    return _store_table(ref_type, db.query(model.id, model.name).all(), now)
+
+
 class ReferenceDataCache:
     """Centralized reference data caching"""
     
@@ -26,24 +84,7 @@ class ReferenceDataCache:
         Returns:
             Order status ID or None
         """
-        cache_key = f"order_status_id:{name}"
-        
-        # Try cache first
-        cached_id = cache.get(cache_key)
-        if cached_id is not None:
-            return cached_id
-        
-        # Query database
-        status = db.query(OrderStatusType).filter(
-            OrderStatusType.name == name
-        ).first()
-        
-        if status:
-            # Cache for 1 hour
-            cache.set(cache_key, status.id, ttl=3600)
-            return status.id
-        
-        return None
+        return _get_table(OrderStatusType, "order_statuses", db)["by_name"].get(name)
     
     @staticmethod
     def get_all_order_statuses(db: Session) -> List[Dict[str, Any]]:
@@ -56,20 +97,7 @@ class ReferenceDataCache:
         Returns:
             List of status dicts with id and name
         """
-        cache_key = "all_order_statuses"
-        
-        # Try cache first
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
-        # Query database
-        statuses = db.query(OrderStatusType).all()
-        result = [{"id": s.id, "name": s.name} for s in statuses]
-        
-        # Cache for 1 hour
-        cache.set(cache_key, result, ttl=3600)
-        return result
+        return _get_table(OrderStatusType, "order_statuses", db)["list"]
     
     @staticmethod
     def get_transaction_type_id_by_name(name: str, db: Session) -> Optional[int]:
@@ -83,21 +111,7 @@ class ReferenceDataCache:
         Returns:
             Transaction type ID or None
         """
-        cache_key = f"transaction_type_id:{name}"
-        
-        cached_id = cache.get(cache_key)
-        if cached_id is not None:
-            return cached_id
-        
-        t_type = db.query(TransactionType).filter(
-            TransactionType.name == name
-        ).first()
-        
-        if t_type:
-            cache.set(cache_key, t_type.id, ttl=3600)
-            return t_type.id
-        
-        return None
+        return _get_table(TransactionType, "transaction_types", db)["by_name"].get(name)
     
     @staticmethod
     def get_all_transaction_types(db: Session) -> List[Dict[str, Any]]:
@@ -110,17 +124,7 @@ class ReferenceDataCache:
         Returns:
             List of transaction type dicts
         """
-        cache_key = "all_transaction_types"
-        
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
-        types = db.query(TransactionType).all()
-        result = [{"id": t.id, "name": t.name} for t in types]
-        
-        cache.set(cache_key, result, ttl=3600)
-        return result
+        return _get_table(TransactionType, "transaction_types", db)["list"]
     
     @staticmethod
     def get_all_process_types(db: Session) -> List[Dict[str, Any]]:
@@ -133,17 +137,7 @@ class ReferenceDataCache:
         Returns:
             List of process type dicts
         """
-        cache_key = "all_process_types"
-        
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
-        types = db.query(ProcessType).all()
-        result = [{"id": t.id, "name": t.name} for t in types]
-        
-        cache.set(cache_key, result, ttl=3600)
-        return result
+        return _get_table(ProcessType, "process_types", db)["list"]
     
     @staticmethod
     def get_all_divisions(db: Session) -> List[Dict[str, Any]]:
@@ -156,31 +150,17 @@ class ReferenceDataCache:
         Returns:
             List of division dicts
         """
-        cache_key = "all_divisions"
-        
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
-        divisions = db.query(Division).all()
-        result = [{"id": d.id, "name": d.name} for d in divisions]
-        
-        cache.set(cache_key, result, ttl=3600)
-        return result
+        return _get_table(Division, "divisions", db)["list"]
     
     @staticmethod
     def invalidate_all_reference_caches() -> None:
         """
         Invalidate all reference data caches.
         Call this when reference data is updated.
+        Other processes keep their local copies for up to LOCAL_TABLE_TTL.
         """
-        cache.delete_pattern("order_status_id:*")
-        cache.delete_pattern("process_type_id:*")
-        cache.delete_pattern("transaction_type_id:*")
-        cache.delete("all_order_statuses")
-        cache.delete("all_transaction_types")
-        cache.delete("all_process_types")
-        cache.delete("all_divisions")
+        _local_tables.clear()
+        cache.invalidate_reference_cache()
     
     @staticmethod
     def warm_up_cache(db: Session) -> None:
@@ -191,12 +171,18 @@ class ReferenceDataCache:
         Args:
             db: Database session
         """
-        # Pre-cache all reference data
-        ReferenceDataCache.get_all_order_statuses(db)
-        ReferenceDataCache.get_all_transaction_types(db)
-        ReferenceDataCache.get_all_process_types(db)
-        ReferenceDataCache.get_all_divisions(db)
-        
-        # Pre-cache commonly used status IDs
-        for status_name in ["Completed", "On Hold", "BP-RTI", "Pending Billing"]:
-            ReferenceDataCache.get_order_status_id_by_name(status_name, db)
+        # Load all reference tables in one query, tagged by table
+        rows = db.execute(union_all(*(
+            select(literal(ref_type).label("ref_type"), model.id, model.name)
+            for ref_type, model in REFERENCE_TABLES
+        ))).all()
+        
+        rows_by_type: Dict[str, List[Any]] = {ref_type: [] for ref_type, _ in REFERENCE_TABLES}
+        for row in rows:
+            rows_by_type[row.ref_type].append(row)
+        
+        # Status IDs (e.g. "Completed") come from the order_statuses table's by_name,
+        # so no per-name lookups are needed
+        now = time.monotonic()
+        for ref_type, table_rows in rows_by_type.items():
+            _store_table(ref_type, table_rows, now)
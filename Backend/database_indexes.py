@@ -43,6 +43,21 @@ CREATE INDEX IF NOT EXISTS idx_order_step2_user_id ON "order"(step2_user_id);
 CREATE INDEX IF NOT EXISTS idx_order_entry_date ON "order"(entry_date);
 CREATE INDEX IF NOT EXISTS idx_order_billing_status ON "order"(billing_status);
 
+-- Partial order indexes over live (not soft-deleted) rows for metrics scans.
+-- CONCURRENTLY avoids locking writes; run these outside a transaction block.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_step1_user_end_live ON orders(step1_user_id, step1_end_time) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_step2_user_end_live ON orders(step2_user_id, step2_end_time) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_team_entry_status_live ON orders(team_id, entry_date, order_status_id) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_step1_team_date_live ON orders(step1_user_id, team_id, entry_date) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_step2_team_date_live ON orders(step2_user_id, team_id, entry_date) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_team_date_users_live ON orders(team_id, entry_date, step1_user_id, step2_user_id) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_quality_audits_org_team_date_live ON quality_audits(org_id, team_id, audit_date DESC) INCLUDE (examiner_id) WHERE deleted_at IS NULL;
+-- Superseded by the partial indexes above
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_step1_user_end;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_step2_user_end;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_team_entry_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_team_status_date;
+
 -- UserTeam indexes  
 CREATE INDEX IF NOT EXISTS idx_user_team_team_id_active ON user_team(team_id, is_active);
 CREATE INDEX IF NOT EXISTS idx_user_team_user_id_active ON user_team(user_id, is_active);
@@ -81,6 +96,124 @@ CREATE INDEX IF NOT EXISTS idx_fa_name_active ON fa_name(is_active);
 CREATE INDEX IF NOT EXISTS idx_team_fa_name_team_id ON team_fa_name(team_id);
 """
 
+# === DENORMALIZED COUNTER COLUMNS ===
+# Columns maintained by application listeners; add and backfill them on existing databases:
+
+SQL_COUNTER_COLUMNS = """
+-- Team.active_employee_count (maintained from user_teams writes)
+ALTER TABLE teams ADD COLUMN IF NOT EXISTS active_employee_count INTEGER NOT NULL DEFAULT 0;
+UPDATE teams SET active_employee_count = (
+    SELECT COUNT(*) FROM user_teams
+    WHERE user_teams.team_id = teams.id AND user_teams.is_active = TRUE
+);
+
+-- Per-order productivity credit (maintained from order and team writes)
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS completion_type SMALLINT NOT NULL DEFAULT 0;
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS step1_score_value NUMERIC(4, 2) NOT NULL DEFAULT 0;
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS step2_score_value NUMERIC(4, 2) NOT NULL DEFAULT 0;
+-- Backfill (same rules as app.services.order_score_service.rebuild_order_scores;
+-- unset or zero team multipliers fall back to 0.5 / 0.5 / 1.0)
+UPDATE orders SET completion_type = CASE
+    WHEN step1_user_id IS NULL AND step2_user_id IS NULL THEN 0
+    WHEN step1_user_id = step2_user_id THEN 3
+    WHEN step2_user_id IS NULL THEN 1
+    WHEN step1_user_id IS NULL THEN 2
+    ELSE 4
+END;
+UPDATE orders SET
+    step1_score_value = CASE
+        WHEN orders.completion_type = 0 THEN 0
+        WHEN orders.completion_type = 3 THEN COALESCE(NULLIF(teams.single_seat_score, 0), 1.0)
+        WHEN orders.step1_user_id IS NOT NULL THEN COALESCE(NULLIF(teams.step1_score, 0), 0.5)
+        ELSE 0
+    END,
+    step2_score_value = CASE
+        WHEN orders.completion_type IN (0, 3) THEN 0
+        WHEN orders.step2_user_id IS NOT NULL THEN COALESCE(NULLIF(teams.step2_score, 0), 0.5)
+        ELSE 0
+    END
+FROM teams
+WHERE teams.id = orders.team_id;
+CREATE INDEX IF NOT EXISTS idx_orders_team_date_completion ON orders(team_id, entry_date, completion_type);
+
+-- employee_weekly_scores (maintained from order and team writes) is created by create_all
+-- (run init_db.py first); backfill from the credit columns above
+-- (same rules as app.services.weekly_score_service.rebuild_employee_weekly_scores)
+ALTER TABLE employee_weekly_scores ADD COLUMN IF NOT EXISTS step1_only_score NUMERIC(12, 2) NOT NULL DEFAULT 0;
+ALTER TABLE employee_weekly_scores ADD COLUMN IF NOT EXISTS step2_only_score NUMERIC(12, 2) NOT NULL DEFAULT 0;
+ALTER TABLE employee_weekly_scores ADD COLUMN IF NOT EXISTS single_seat_score NUMERIC(12, 2) NOT NULL DEFAULT 0;
+DELETE FROM employee_weekly_scores;
+INSERT INTO employee_weekly_scores
+    (user_id, team_id, week_start_date, step1_only, step2_only, single_seat,
+     step1_only_score, step2_only_score, single_seat_score, total_score, modified_at)
+SELECT user_id, team_id, week_start_date,
+    SUM(step1_only), SUM(step2_only), SUM(single_seat),
+    SUM(step1_only_score), SUM(step2_only_score), SUM(single_seat_score), SUM(score),
+    NOW() AT TIME ZONE 'UTC'
+FROM (
+    SELECT step1_user_id AS user_id, team_id,
+        entry_date - EXTRACT(DOW FROM entry_date)::INTEGER AS week_start_date,
+        CASE WHEN completion_type = 3 THEN 0 ELSE 1 END AS step1_only,
+        0 AS step2_only,
+        CASE WHEN completion_type = 3 THEN 1 ELSE 0 END AS single_seat,
+        CASE WHEN completion_type = 3 THEN 0 ELSE step1_score_value END AS step1_only_score,
+        0 AS step2_only_score,
+        CASE WHEN completion_type = 3 THEN step1_score_value ELSE 0 END AS single_seat_score,
+        step1_score_value AS score
+    FROM orders
+    WHERE step1_user_id IS NOT NULL AND deleted_at IS NULL
+    UNION ALL
+    SELECT step2_user_id, team_id,
+        entry_date - EXTRACT(DOW FROM entry_date)::INTEGER,
+        0, 1, 0, 0, step2_score_value, 0, step2_score_value
+    FROM orders
+    WHERE step2_user_id IS NOT NULL AND completion_type <> 3 AND deleted_at IS NULL
+) AS credits
+GROUP BY user_id, team_id, week_start_date;
+
+-- employee_daily_order_stats (maintained from order writes) is created by create_all
+-- (run init_db.py first); backfill it over the whole order history with
+--   SELECT MIN(LEAST(step1_end_time, step2_end_time))::date,
+--          MAX(GREATEST(step1_end_time, step2_end_time))::date FROM orders;
+--   app.services.order_stats_service.rebuild_employee_daily_order_stats_range(db, first_day, last_day)
+"""
+
+# === GENERATED COLUMNS ===
+# Columns computed by PostgreSQL (see app.models.quality_audit); convert the
+# previously application-written columns on existing databases:
+
+SQL_GENERATED_COLUMNS = """
+-- QualityAudit OFE count and quality percentages (dropping a column also drops its range check)
+ALTER TABLE quality_audits
+    DROP COLUMN ofe_count,
+    DROP COLUMN fb_quality,
+    DROP COLUMN ofe_quality,
+    DROP COLUMN cce_quality;
+ALTER TABLE quality_audits
+    ADD COLUMN ofe_count INTEGER NOT NULL GENERATED ALWAYS AS (total_files_reviewed * ofe) STORED,
+    ADD COLUMN fb_quality NUMERIC(5, 4) NOT NULL GENERATED ALWAYS AS (
+        CASE WHEN total_files_reviewed <= 0 THEN 0
+        WHEN files_with_error = 0 THEN 1
+        WHEN files_with_error >= total_files_reviewed THEN 0
+        ELSE 1 - files_with_error::numeric / (total_files_reviewed) END
+    ) STORED,
+    ADD COLUMN ofe_quality NUMERIC(5, 4) NOT NULL GENERATED ALWAYS AS (
+        CASE WHEN total_files_reviewed * ofe <= 0 THEN 0
+        WHEN total_errors = 0 THEN 1
+        WHEN total_errors >= total_files_reviewed * ofe THEN 0
+        ELSE 1 - total_errors::numeric / (total_files_reviewed * ofe) END
+    ) STORED,
+    ADD COLUMN cce_quality NUMERIC(5, 4) NOT NULL GENERATED ALWAYS AS (
+        CASE WHEN total_files_reviewed <= 0 THEN 0
+        WHEN files_with_cce_error = 0 THEN 1
+        WHEN files_with_cce_error >= total_files_reviewed THEN 0
+        ELSE 1 - files_with_cce_error::numeric / (total_files_reviewed) END
+    ) STORED,
+    ADD CONSTRAINT check_fb_quality_range CHECK (fb_quality >= 0 AND fb_quality <= 1),
+    ADD CONSTRAINT check_ofe_quality_range CHECK (ofe_quality >= 0 AND ofe_quality <= 1),
+    ADD CONSTRAINT check_cce_quality_range CHECK (cce_quality >= 0 AND cce_quality <= 1);
+"""
+
 # === ANALYZE INDEXES ===
 # After creating indexes, run ANALYZE to update PostgreSQL statistics:
 # ANALYZE;
@@ -27,7 +27,7 @@ from app.models.user import User
 from app.models.organization import Organization
 from app.models.team import Team
 from app.models.order import Order
-from app.models.metrics import EmployeePerformanceMetrics, TeamPerformanceMetrics
+from app.models.metrics import EmployeePerformanceMetrics, TeamPerformanceMetrics, EmployeeWeeklyScore, EmployeeDailyOrderStats
 from app.models.quality_audit import QualityAudit
 from app.models.billing import BillingReport, BillingDetail
 from app.models.employee_weekly_target import EmployeeWeeklyTarget
@@ -37,6 +37,7 @@ from app.models.user_team import UserTeam
 from app.models.team_user_alias import TeamUserAlias
 from app.models.audit_log import AttendanceAuditLog
 from app.core.security import get_password_hash
+from app.services.team_stats_service import rebuild_active_employee_counts
 
 def create_session():
     """Create database session"""
@@ -137,6 +138,8 @@ def migrate_to_production(dry_run=False):
             'Team User Aliases': count_records(db, TeamUserAlias),
             'Employee Metrics': count_records(db, EmployeePerformanceMetrics),
             'Team Metrics': count_records(db, TeamPerformanceMetrics),
+            'Weekly Scores': count_records(db, EmployeeWeeklyScore),
+            'Daily Order Stats': count_records(db, EmployeeDailyOrderStats),
             'Quality Audits': count_records(db, QualityAudit),
             'Billing Reports': count_records(db, BillingReport),
             'Billing Details': count_records(db, BillingDetail),
@@ -161,6 +164,8 @@ def migrate_to_production(dry_run=False):
             print("\n✗ All Metrics and Performance Data")
             print(f"  - {counts['Employee Metrics']} employee metrics")
             print(f"  - {counts['Team Metrics']} team metrics")
+            print(f"  - {counts['Weekly Scores']} weekly scores")
+            print(f"  - {counts['Daily Order Stats']} daily order stats")
             print("\n✗ All Quality Audits")
             print(f"  - {counts['Quality Audits']} quality audits")
             print("\n✗ All Billing Data")
@@ -200,9 +205,14 @@ def migrate_to_production(dry_run=False):
         print("\n📊 Deleting Metrics...")
         db.query(EmployeePerformanceMetrics).delete()
         db.query(TeamPerformanceMetrics).delete()
+        # Bulk order deletes skip the summary listeners; clear the rows directly
+        db.query(EmployeeWeeklyScore).delete()
+        db.query(EmployeeDailyOrderStats).delete()
         db.commit()
         print(f"  ✓ Deleted {counts['Employee Metrics']} employee metrics")
         print(f"  ✓ Deleted {counts['Team Metrics']} team metrics")
+        print(f"  ✓ Deleted {counts['Weekly Scores']} weekly scores")
+        print(f"  ✓ Deleted {counts['Daily Order Stats']} daily order stats")
         
         # Step 2.3: Delete quality audits
         print("\n🎯 Deleting Quality Audits...")
@@ -233,6 +243,8 @@ def migrate_to_production(dry_run=False):
         db.query(TeamUserAlias).delete()
         db.query(UserTeam).delete()
         db.commit()
+        # Bulk membership deletes skip the team stats listeners; reset the counts
+        rebuild_active_employee_counts(db)
         print(f"  ✓ Deleted {counts['User-Team Associations']} user-team associations")
         print(f"  ✓ Deleted {counts['Team User Aliases']} team user aliases")
         